@@ -1,57 +1,275 @@
 import os
-import shutil
-from typing import List
+import re
+from email.utils import formatdate
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from fastapi import APIRouter, Request, Form, UploadFile, File
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Request, Form, HTTPException, Query
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, metrics, model_bytes, process_rss_bytes
 from app.services.site_service import SiteService
 from app.services.worker_service import WorkerService
 from app.services.safety_service import SafetyService
 from app.services.yolo_ppe_service import YoloPPEService
+from app.services.result_cache import ResultCache
+from app.services.artifact_store import ArtifactStore
+from app.services.upload_service import StoredUpload, UploadService, UploadError
+from app.storage import create_storage
+from app.services.job_service import JobService, JobQueueFull
+from app.services.frame_sampler import create_sampler
+from app.models.job_model import VideoJob
+from app.models.stream_model import CameraStream
+from app.models.page_model import Page
+from app.models.site_model import Site
+from app.models.worker_model import Worker
+from app.models.inspection_model import SafetyInspection
+from app.services.fragment_cache import FragmentCache
+from app.services.stream_monitor import StreamMonitor, check_stream_url
+from app.services.model_registry import registry as model_registry
 
 router = APIRouter()
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
 
-site_service = SiteService()
-worker_service = WorkerService()
-safety_service = SafetyService()
-yolo_service = YoloPPEService()
+storage = create_storage(settings.STORAGE_BACKEND, settings.SQLITE_PATH)
+site_service = SiteService(storage)
+worker_service = WorkerService(storage)
+safety_service = SafetyService(storage)
+artifact_store = ArtifactStore(
+    os.path.join(BASE_DIR, "..", "uploads"),  # YoloPPEService.upload_dir
+    settings.ARTIFACT_INDEX_PATH,
+    max_bytes=settings.ARTIFACT_MAX_BYTES,
+    max_age_s=settings.ARTIFACT_MAX_AGE_DAYS * 86400,
+    sweep_interval_s=settings.ARTIFACT_SWEEP_INTERVAL_S,
+    thumb_width=settings.ARTIFACT_THUMB_WIDTH,
+)
+result_cache = None
+if settings.RESULT_CACHE_ENABLED:
+    result_cache = ResultCache(
+        settings.RESULT_CACHE_DIR,
+        overlay_dir=artifact_store.root,
+        max_memory_entries=settings.RESULT_CACHE_MEMORY_ENTRIES,
+        max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+        store=artifact_store,
+    )
+yolo_service = YoloPPEService(cache=result_cache, artifacts=artifact_store)   # modeller ilk kullanımda yüklenir
+yolo_service.set_base_idle_timeout(settings.BASE_MODEL_IDLE_UNLOAD_S)
+upload_service = UploadService(
+    settings.UPLOAD_DIR,
+    max_bytes={"image": settings.MAX_IMAGE_UPLOAD_BYTES, "video": settings.MAX_VIDEO_UPLOAD_BYTES},
+    memory_max_bytes={"image": settings.IMAGE_IN_MEMORY_MAX_BYTES},
+)
+job_service = JobService(
+    max_workers=settings.VIDEO_JOB_WORKERS,
+    max_pending=settings.VIDEO_JOB_MAX_PENDING,
+)
+stream_monitor = StreamMonitor(
+    yolo_service,
+    site_service,
+    safety_service,
+    workers=settings.STREAM_WORKERS,
+    batch_size=settings.STREAM_BATCH_SIZE,
+    max_fps=settings.STREAM_MAX_FPS,
+    window_s=settings.STREAM_WINDOW_S,
+    min_persons=settings.STREAM_MIN_PERSONS,
+    risk_threshold=settings.STREAM_RISK_THRESHOLD,
+    cooldown_s=settings.STREAM_ALERT_COOLDOWN_S,
+)
+fragment_cache = FragmentCache(settings.FRAGMENT_CACHE_TTL_S, settings.FRAGMENT_CACHE_ENTRIES)
+
+
+# ---------- METRİKLER ----------
+def _queue_depths():
+    jobs = job_service.counts()
+    depths = {"video_jobs_queued": jobs["queued"], "video_jobs_running": jobs["running"], **yolo_service.queue_depths()}
+    return {(name,): n for name, n in depths.items()}
+
+
+def _memory():
+    out = {(f"model:{os.path.basename(k)}",): model_bytes(m) for k, m in model_registry.loaded().items()}
+    rss = process_rss_bytes()
+    if rss is not None:
+        out[("process_rss",)] = rss
+    return out
+
+
+if metrics.enabled:
+    metrics.gauge("ppe_queue_depth", "Kuyrukta / işlemde bekleyen iş sayısı.", ["queue"], _queue_depths)
+    metrics.gauge("ppe_memory_bytes", "Yüklü model ağırlıkları ve süreç belleği (bayt).", ["what"], _memory)
+    metrics.gauge(
+        "ppe_streams", "İzlenen canlı kamera akışı sayısı.", [], lambda: {(): len(stream_monitor.list_streams())}
+    )
+
+
+def _render(name: str, context: dict, status_code: int = 200) -> HTMLResponse:
+    # Jinja2 render'ı TemplateResponse kurulurken yapılır
+    with metrics.stage("template_render"):
+        return templates.TemplateResponse(name, context, status_code=status_code)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrikler kapalı (METRICS_ENABLED=1)")
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+
+# ---------- SAYFALAMA ----------
+# Listeler keyset (cursor = son kaydın id'si) ile sayfalanır: derin sayfalar da
+# ilk sayfa kadar ucuz. Denetimler en yeniden eskiye, diğerleri id sırasıyla.
+PAGE_LIMIT = Query(settings.PAGE_SIZE, ge=1, le=settings.PAGE_MAX)
+
+Fetch = Callable[[int, Optional[int]], List[Any]]
+
+
+def _paginate(fetch: Fetch, limit: int, cursor: Optional[int]) -> Tuple[List[Any], Optional[int]]:
+    # bir fazlası istenir; gelirse sonraki sayfa var
+    items = fetch(limit + 1, cursor)
+    next_cursor = items[limit - 1].id if len(items) > limit else None
+    return items[:limit], next_cursor
+
+
+def _sites_fetch() -> Fetch:
+    return lambda n, cursor: site_service.list_sites(limit=n, after_id=cursor)
+
+
+def _workers_fetch(site_id: Optional[int]) -> Fetch:
+    return lambda n, cursor: worker_service.list_workers(limit=n, after_id=cursor, site_id=site_id)
+
+
+def _inspections_fetch(site_id: Optional[int], risk_level: Optional[str]) -> Fetch:
+    return lambda n, cursor: safety_service.list_inspections(
+        limit=n, before_id=cursor, site_id=site_id, risk_level=risk_level, descending=True
+    )
+
+
+# ---------- HTML PARÇALARI ----------
+def _data_version() -> Tuple[int, int, int]:
+    # herhangi bir yazma (video işi / kamera alarmı dahil) tüm parçaları geçersiz kılar
+    return site_service.version, worker_service.version, safety_service.version
+
+
+def _render_fragment(name: str, context: Dict[str, Any]) -> str:
+    with metrics.stage("template_render"):
+        return templates.get_template(name).render(context)
+
+
+def _fragment_response(key: Tuple[Any, ...], render: Callable[[], Tuple[str, Optional[int]]]) -> HTMLResponse:
+    html, next_cursor = fragment_cache.get_or_render(key, _data_version(), render)
+    headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else None
+    return HTMLResponse(html, headers=headers)
+
+
+@router.get("/fragments/site-risks", response_class=HTMLResponse)
+async def site_risk_rows(cursor: Optional[int] = None, limit: int = PAGE_LIMIT):
+    def render():
+        sites, next_cursor = _paginate(_sites_fetch(), limit, cursor)
+        rows = safety_service.risk_by_site(sites)  # Şantiyelere göre risk analizi
+        return _render_fragment("fragments/site_risk_rows.html", {"site_risks": rows}), next_cursor
+
+    return _fragment_response(("site-risks", cursor, limit), render)
+
+
+@router.get("/fragments/sites", response_class=HTMLResponse)
+async def site_rows(cursor: Optional[int] = None, limit: int = PAGE_LIMIT):
+    def render():
+        sites, next_cursor = _paginate(_sites_fetch(), limit, cursor)
+        return _render_fragment("fragments/site_rows.html", {"sites": sites}), next_cursor
+
+    return _fragment_response(("sites", cursor, limit), render)
+
+
+@router.get("/fragments/workers", response_class=HTMLResponse)
+async def worker_rows(cursor: Optional[int] = None, limit: int = PAGE_LIMIT, site_id: Optional[int] = None):
+    def render():
+        workers, next_cursor = _paginate(_workers_fetch(site_id), limit, cursor)
+        sites = site_service.get_sites(w.site_id for w in workers)
+        return _render_fragment("fragments/worker_rows.html", {"workers": workers, "sites": sites}), next_cursor
+
+    return _fragment_response(("workers", cursor, limit, site_id), render)
+
+
+@router.get("/fragments/inspections", response_class=HTMLResponse)
+async def inspection_rows(
+    cursor: Optional[int] = None,
+    limit: int = PAGE_LIMIT,
+    site_id: Optional[int] = None,
+    risk_level: Optional[str] = None,
+):
+    def render():
+        inspections, next_cursor = _paginate(_inspections_fetch(site_id, risk_level), limit, cursor)
+        sites = site_service.get_sites(i.site_id for i in inspections)
+        html = _render_fragment("fragments/inspection_rows.html", {"inspections": inspections, "sites": sites})
+        return html, next_cursor
+
+    return _fragment_response(("inspections", cursor, limit, site_id, risk_level), render)
+
+
+# ---------- JSON API ----------
+@router.get("/api/sites", response_model=Page[Site])
+async def api_sites(cursor: Optional[int] = None, limit: int = PAGE_LIMIT):
+    items, next_cursor = _paginate(_sites_fetch(), limit, cursor)
+    total = site_service.count_sites() if cursor is None else None
+    return Page[Site](items=items, next_cursor=next_cursor, total=total)
+
+
+@router.get("/api/workers", response_model=Page[Worker])
+async def api_workers(cursor: Optional[int] = None, limit: int = PAGE_LIMIT, site_id: Optional[int] = None):
+    items, next_cursor = _paginate(_workers_fetch(site_id), limit, cursor)
+    total = worker_service.count_workers(site_id=site_id) if cursor is None else None
+    return Page[Worker](items=items, next_cursor=next_cursor, total=total)
+
+
+@router.get("/api/inspections", response_model=Page[SafetyInspection])
+async def api_inspections(
+    cursor: Optional[int] = None,
+    limit: int = PAGE_LIMIT,
+    site_id: Optional[int] = None,
+    risk_level: Optional[str] = None,
+):
+    items, next_cursor = _paginate(_inspections_fetch(site_id, risk_level), limit, cursor)
+    total = safety_service.count_inspections(site_id=site_id, risk_level=risk_level) if cursor is None else None
+    return Page[SafetyInspection](items=items, next_cursor=next_cursor, total=total)
+
+
+@router.get("/api/risk/summary")
+async def api_risk_summary():
+    return safety_service.summarize_risk()
+
+
+@router.get("/api/risk/sites", response_model=Page[Dict[str, Any]])
+async def api_site_risks(cursor: Optional[int] = None, limit: int = PAGE_LIMIT):
+    sites, next_cursor = _paginate(_sites_fetch(), limit, cursor)
+    total = site_service.count_sites() if cursor is None else None
+    return Page[Dict[str, Any]](items=safety_service.risk_by_site(sites), next_cursor=next_cursor, total=total)
 
 
 # ---------- DASHBOARD ----------
 @router.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
-    sites = site_service.list_sites()
-    workers = worker_service.list_workers()
-    inspections = safety_service.list_inspections()
-    risk_summary = safety_service.summarize_risk()
-    site_risks = safety_service.risk_by_site(sites)  # Şantiyelere göre risk analizi
-
-    return templates.TemplateResponse(
-        "dashboard.html",
-        {
-            "request": request,
-            "sites": sites,
-            "workers": workers,
-            "inspections": inspections,
+    # sayaç kartları cache'ten; şantiye risk tablosu sayfa açılınca parça parça yüklenir
+    def render():
+        risk_summary = safety_service.summarize_risk()
+        context = {
+            "site_count": site_service.count_sites(),
+            "worker_count": worker_service.count_workers(),
+            "inspection_count": risk_summary["total"],
             "risk_summary": risk_summary,
-            "site_risks": site_risks,
-        },
-    )
+        }
+        return _render_fragment("fragments/dashboard_stats.html", context), None
+
+    stats_html, _ = fragment_cache.get_or_render(("dashboard-stats",), _data_version(), render)
+    return _render("dashboard.html", {"request": request, "stats_html": stats_html})
 
 
 # ---------- SITES ----------
 @router.get("/sites", response_class=HTMLResponse)
 async def sites_page(request: Request):
-    return templates.TemplateResponse(
-        "sites.html",
-        {"request": request, "sites": site_service.list_sites()},
-    )
+    return _render("sites.html", {"request": request})
 
 
 @router.post("/sites", response_class=HTMLResponse)
@@ -68,18 +286,18 @@ async def create_site(
         status=status,
         supervisor=supervisor or None,
     )
-    return await sites_page(request)
+    # Post/Redirect/Get: yenileme formu tekrar göndermez, liste zaten parça parça yüklenir
+    return RedirectResponse("/sites", status_code=303)
 
 
 # ---------- WORKERS ----------
 @router.get("/workers", response_class=HTMLResponse)
 async def workers_page(request: Request):
-    return templates.TemplateResponse(
+    return _render(
         "workers.html",
         {
             "request": request,
-            "workers": worker_service.list_workers(),
-            "sites": site_service.list_sites(),
+            "sites": site_service.list_sites(),   # form seçimi için
         },
     )
 
@@ -98,18 +316,16 @@ async def create_worker(
         site_id=site_id,
         ppe_status=ppe_status,
     )
-    return await workers_page(request)
+    return RedirectResponse("/workers", status_code=303)
 
 
 # ---------- SAFETY: GET ----------
 @router.get("/safety", response_class=HTMLResponse)
 async def safety_page(request: Request):
-    inspections = safety_service.list_inspections()
-    return templates.TemplateResponse(
+    return _render(
         "safety.html",
         {
             "request": request,
-            "inspections": inspections,
             "sites": site_service.list_sites(),
             "last_image_detections_ft": None,
             "last_image_detections_base": None,
@@ -123,25 +339,45 @@ async def safety_page(request: Request):
     )
 
 
+# ---------- SAFETY: YÜKLEME ----------
+def _form_value(fields: dict, name: str, cast=str, default=None):
+    value = fields.get(name, default)
+    if value is None:
+        raise HTTPException(status_code=422, detail=f"Eksik form alanı: {name}")
+    try:
+        return cast(value)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Geçersiz form alanı: {name}")
+
+
+async def _ingest(request: Request, kind: str):
+    try:
+        return await upload_service.ingest(request, kind)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
 # ---------- SAFETY: FOTOĞRAF ----------
+def _compare_upload(upload: StoredUpload) -> Dict[str, Any]:
+    # bellekteki baytların decode'u da threadpool'da (event loop'ta değil)
+    return yolo_service.analyze_image_compare(upload.path, content_hash=upload.sha256, image=upload.decode_image())
+
+
 @router.post("/safety/image", response_class=HTMLResponse)
-async def safety_image(
-    request: Request,
-    site_id: int = Form(...),
-    inspector: str = Form(...),
-    risk_level: str = Form(...),
-    notes: str = Form(""),
-    file: UploadFile = File(...),
-):
-    site = site_service.get_site(site_id)
-    image_filename = file.filename
-    save_path = os.path.join(settings.UPLOAD_DIR, image_filename)
+async def safety_image(request: Request):
+    # Form alanları + dosya tek geçişte akıtılarak okunur (bkz. UploadService)
+    fields, upload = await _ingest(request, "image")
+    site_id = _form_value(fields, "site_id", int)
+    inspector = _form_value(fields, "inspector")
+    risk_level = _form_value(fields, "risk_level")
+    notes = _form_value(fields, "notes", default="")
 
-    with open(save_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    site = site_service.get_site(site_id)
+    image_filename = upload.original_name
 
     # ---- KARŞILAŞTIRMA: fine-tuned vs pretrained ----
-    compare = yolo_service.analyze_image_compare(save_path)
+    # decode + inference event loop'u bloklamasın; eşzamanlı istekler broker'da birleşir
+    compare = await run_in_threadpool(_compare_upload, upload)
     ft_detections = compare["fine_tuned"]["detections"]
     base_detections = compare["pretrained"]["detections"]
     ft_counts = compare["fine_tuned"]["counts"]
@@ -154,21 +390,22 @@ async def safety_image(
     # Denetim kaydı için sadece fine-tuned sınıfları
     detected_ppe_classes = sorted(list(set(d["class_name"] for d in ft_detections)))
 
-    safety_service.create_inspection(
+    inspection = safety_service.create_inspection(
         site=site,
         inspector=inspector,
         risk_level=risk_level,
         notes=notes,
         file_name=image_filename,
         detected_ppe=detected_ppe_classes,
+        thumbnail=compare["fine_tuned"].get("thumbnail"),
     )
+    # denetim listesi bu thumbnail'ı gösterir; cache tahliyesi / kota silmesin
+    artifact_store.pin(f"inspection:{inspection.id}", [inspection.thumbnail])
 
-    inspections = safety_service.list_inspections()
-    return templates.TemplateResponse(
+    return _render(
         "safety.html",
         {
             "request": request,
-            "inspections": inspections,
             "sites": site_service.list_sites(),
             "last_image_detections_ft": ft_detections,
             "last_image_detections_base": base_detections,
@@ -183,49 +420,206 @@ async def safety_image(
 
 # ---------- SAFETY: VIDEO ----------
 @router.post("/safety/video", response_class=HTMLResponse)
-async def safety_video(
-    request: Request,
-    site_id: int = Form(...),
-    inspector: str = Form(...),
-    notes: str = Form(""),
-    file: UploadFile = File(...),
-):
-    site = site_service.get_site(site_id)
-    video_filename = file.filename
-    save_path = os.path.join(settings.UPLOAD_DIR, video_filename)
-
-    with open(save_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+async def safety_video(request: Request):
+    fields, upload = await _ingest(request, "video")
+    site_id = _form_value(fields, "site_id", int)
+    inspector = _form_value(fields, "inspector")
+    notes = _form_value(fields, "notes", default="")
 
-    summary = yolo_service.analyze_video(save_path, frame_stride=15)
-    risk_level = summary["risk_level"]
-
-
-    video_overlay = summary.get("video_overlay")
-
-    safety_service.create_inspection(
-        site=site,
-        inspector=inspector,
-        risk_level=risk_level,
-        notes=notes,
-        file_name=video_filename,  # orijinal video adı log’da dursun
-        detected_ppe=[],
-    )
-
-    inspections = safety_service.list_inspections()
-    return templates.TemplateResponse(
+    site = site_service.get_site(site_id)
+    video_filename = upload.original_name
+    save_path = upload.path
+
+    # Analiz arka planda; denetim kaydı iş bitince oluşturulur
+    def run(progress, should_cancel):
+        summary = yolo_service.analyze_video(
+            save_path,
+            frame_stride=settings.VIDEO_FRAME_STRIDE,
+            progress=progress,
+            should_cancel=should_cancel,
+            content_hash=upload.sha256,
+            sampler=create_sampler(
+                settings.VIDEO_SAMPLING,
+                stride=settings.VIDEO_FRAME_STRIDE,
+                threshold=settings.VIDEO_MOTION_THRESHOLD,
+                min_gap=settings.VIDEO_MOTION_MIN_GAP,
+                max_gap=settings.VIDEO_MOTION_MAX_GAP,
+            ),
+        )
+        safety_service.create_inspection(
+            site=site,
+            inspector=inspector,
+            risk_level=summary["risk_level"],
+            notes=notes,
+            file_name=video_filename,  # orijinal video adı log’da dursun
+            detected_ppe=[],
+        )
+        return summary
+
+    video_job = None
+    video_error = None
+    status_code = 200
+    try:
+        video_job = job_service.submit(
+            run,
+            site_id=site_id,
+            inspector=inspector,
+            notes=notes,
+            file_name=video_filename,
+            upload_path=save_path,
+        )
+    except JobQueueFull as e:
+        video_error = str(e)
+        status_code = 429
+        os.remove(save_path)     # analiz edilmeyecek
+
+    return _render(
         "safety.html",
         {
             "request": request,
-            "inspections": inspections,
             "sites": site_service.list_sites(),
             "last_image_detections_ft": None,
             "last_image_detections_base": None,
             "last_image_counts_ft": None,
             "last_image_counts_base": None,
-            "last_video_summary": summary,
+            "last_video_summary": None,
             "ft_overlay": None,
             "base_overlay": None,
-            "video_overlay": summary["video_overlay"],  
+            "video_overlay": None,
+            "video_job": video_job,
+            "video_error": video_error,
         },
-    )
\ No newline at end of file
+        status_code=status_code,
+    )
+
+
+@router.get("/safety/video/jobs/{job_id}", response_model=VideoJob)
+async def video_job_status(job_id: str):
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return job
+
+
+@router.post("/safety/video/jobs/{job_id}/cancel", response_model=VideoJob)
+async def cancel_video_job(job_id: str):
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    if not job_service.cancel_job(job_id):
+        raise HTTPException(status_code=409, detail="İş zaten tamamlandı")
+    return job
+
+
+# ---------- SAFETY: CANLI KAMERA ----------
+@router.get("/safety/streams", response_model=List[CameraStream])
+async def list_streams():
+    return stream_monitor.list_streams()
+
+
+@router.post("/safety/streams", response_model=CameraStream)
+async def add_stream(
+    site_id: int = Form(...),
+    url: str = Form(...),
+    name: str = Form(""),
+):
+    try:
+        url = check_stream_url(url, settings.STREAM_URL_SCHEMES.split(","), settings.STREAM_ALLOWED_HOSTS.split(","))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if site_service.get_site(site_id) is None:
+        raise HTTPException(status_code=404, detail="Şantiye bulunamadı")
+    return stream_monitor.add_stream(site_id, url, name=name or None)
+
+
+@router.delete("/safety/streams/{stream_id}")
+async def remove_stream(stream_id: str):
+    if not stream_monitor.remove_stream(stream_id):
+        raise HTTPException(status_code=404, detail="Akış bulunamadı")
+    return {"removed": stream_id}
+
+
+@router.get("/safety/cache/stats")
+async def result_cache_stats():
+    if result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.stats()}
+
+
+# ---------- ÇIKTI DOSYALARI (overlay / thumbnail / video) ----------
+_MEDIA_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png", ".webp": "image/webp", ".mp4": "video/mp4"}
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+_CHUNK = 256 * 1024
+
+
+def _byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Tek aralıklı "Range: bytes=a-b" başlığı -> (başlangıç, bitiş dahil); tam dosya için None."""
+    m = _RANGE_RE.match(header.strip()) if header else None
+    if m is None or (not m.group(1) and not m.group(2)):
+        return None     # çoklu / bozuk aralık: tüm dosya gönderilir (RFC 9110 buna izin verir)
+    if not m.group(1):
+        start, end = max(size - int(m.group(2)), 0), size - 1      # "bytes=-500": son 500 bayt
+    else:
+        start = int(m.group(1))
+        end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        left = end - start + 1
+        while left > 0:
+            chunk = f.read(min(_CHUNK, left))
+            if not chunk:
+                break
+            left -= len(chunk)
+            yield chunk
+
+
+@router.api_route("/uploads/{name:path}", methods=["GET", "HEAD"])
+async def artifact(name: str, request: Request):
+    """
+    ArtifactStore dosyaları. Videolar Range isteklerini destekler (tarayıcıda
+    ileri sarma / segment oynatma baştan indirmeden); ETag ile koşullu istekler
+    304 döner. İçerik hash'iyle adlandırılan görseller hiç değişmediği için
+    "immutable" cache'lenir.
+    """
+    path = artifact_store.path(name)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Dosya bulunamadı")
+    st = os.stat(path)
+    artifact_store.touch(name)
+
+    ext = os.path.splitext(path)[1].lower()
+    etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": (
+            f"public, max-age={settings.ARTIFACT_HTTP_MAX_AGE_S}"
+            if ext == ".mp4"      # segment modunda son parça yazılırken büyüyebilir
+            else "public, max-age=31536000, immutable"
+        ),
+    }
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    media_type = _MEDIA_TYPES.get(ext, "application/octet-stream")
+    if_range = request.headers.get("if-range")
+    byte_range = _byte_range(request.headers.get("range"), st.st_size) if if_range in (None, etag) else None
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, headers=headers, stat_result=st)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(_read_range(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+
+@router.get("/safety/artifacts/stats")
+async def artifact_stats():
+    return artifact_store.stats()
@@ -8,6 +8,139 @@ class Settings:
     PROJECT_NAME: str = "PPE Safety System"
     UPLOAD_DIR: str = os.path.join(BASE_DIR, "uploads")
 
+    # Yükleme sınırları (byte)
+    MAX_IMAGE_UPLOAD_BYTES: int = int(os.getenv("MAX_IMAGE_UPLOAD_BYTES", str(25 * 1024 ** 2)))
+    MAX_VIDEO_UPLOAD_BYTES: int = int(os.getenv("MAX_VIDEO_UPLOAD_BYTES", str(1024 ** 3)))
+    # Bu boyuta kadar görseller diskten tekrar okunmadan bellekten decode edilir
+    IMAGE_IN_MEMORY_MAX_BYTES: int = int(os.getenv("IMAGE_IN_MEMORY_MAX_BYTES", str(8 * 1024 ** 2)))
+
+    # Kalıcılık: "memory" (eski davranış) veya "sqlite" (yerel dosya)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "sqlite")
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", os.path.join(BASE_DIR, "data", "ppe_safety.db"))
+
+    # Listeler (denetim geçmişi, şantiyeler, çalışanlar) sayfa sayfa; JSON API'de en büyük sayfa
+    PAGE_SIZE: int = int(os.getenv("PAGE_SIZE", "50"))
+    PAGE_MAX: int = int(os.getenv("PAGE_MAX", "500"))
+    # Render edilmiş panel parçaları bu süre kadar (ya da ilk yazmaya kadar) cache'lenir
+    FRAGMENT_CACHE_TTL_S: float = float(os.getenv("FRAGMENT_CACHE_TTL_S", "10"))
+    FRAGMENT_CACHE_ENTRIES: int = int(os.getenv("FRAGMENT_CACHE_ENTRIES", "256"))
+
+    # Model yükleme: açılışta arka planda ön yükleme, pretrained model boşta kalınca atılır
+    MODEL_WARMUP_ON_STARTUP: bool = os.getenv("MODEL_WARMUP_ON_STARTUP", "1") == "1"
+    # Yüklemeden sonra bu boyutlardaki boş görsellerle birer tahmin (ilk istek graf
+    # kurulumu / bellek ayırma / fuse maliyetini ödemesin); "GxY" virgülle ayrılmış
+    MODEL_WARMUP_INFERENCE: bool = os.getenv("MODEL_WARMUP_INFERENCE", "1") == "1"
+    MODEL_WARMUP_SHAPES: str = os.getenv("MODEL_WARMUP_SHAPES", "1920x1080,1280x960,640x640")
+    BASE_MODEL_IDLE_UNLOAD_S: float = float(os.getenv("BASE_MODEL_IDLE_UNLOAD_S", "900"))
+
+    # Thread sayıları (bkz. app/core/tuning): fiziksel çekirdekler web worker'ları ve
+    # inference süreçleri arasında bölünür. WEB_CONCURRENCY uvicorn / gunicorn'un
+    # --workers varsayılanıyla aynı değişken; 0 verilen thread sayıları hesaplanır.
+    THREAD_AUTOTUNE: bool = os.getenv("THREAD_AUTOTUNE", "1") == "1"
+    WEB_WORKERS: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    TORCH_THREADS: int = int(os.getenv("TORCH_THREADS", "0"))
+    TORCH_INTEROP_THREADS: int = int(os.getenv("TORCH_INTEROP_THREADS", "0"))
+
+    # Inference backend: "torch" (ultralytics) veya "onnx" (ONNX Runtime, CPU için)
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "torch")
+    ONNX_CACHE_DIR: str = os.getenv("ONNX_CACHE_DIR", os.path.join(BASE_DIR, "cache", "onnx"))
+    ONNX_IMGSZ: int = int(os.getenv("ONNX_IMGSZ", "640"))
+    # Virgülle ayrılmış sıra; kurulu olmayan provider'lar atlanır
+    # (onnxruntime-openvino kuruluysa "OpenVINOExecutionProvider,CPUExecutionProvider")
+    ONNX_PROVIDERS: str = os.getenv("ONNX_PROVIDERS", "CPUExecutionProvider")
+    ONNX_THREADS: int = int(os.getenv("ONNX_THREADS", "0"))   # 0: THREAD_AUTOTUNE planı (kapalıysa ORT varsayılanı)
+    # Eşzamanlı fotoğraf isteklerini tek batch'te toplama (bekleme ms / en büyük batch)
+    INFERENCE_BATCHING: bool = os.getenv("INFERENCE_BATCHING", "1") == "1"
+    INFERENCE_BATCH_WAIT_MS: float = float(os.getenv("INFERENCE_BATCH_WAIT_MS", "4"))
+    INFERENCE_BATCH_MAX: int = int(os.getenv("INFERENCE_BATCH_MAX", "8"))
+    # Çok süreçli inference havuzu (0: kapalı, modeller web sürecinde koşar).
+    # Her süreç iki modelin birer kopyasını tutar; frame'ler paylaşımlı bellekle geçer.
+    INFERENCE_POOL_PROCESSES: int = int(os.getenv("INFERENCE_POOL_PROCESSES", "0"))
+    INFERENCE_POOL_THREADS: int = int(os.getenv("INFERENCE_POOL_THREADS", "1"))   # süreç başına intra-op, 0: otomatik
+    # halkada aynı anda duran görev (video batch'i) sayısı, 0: süreç sayısı; slot ~6 MB (/dev/shm)
+    INFERENCE_POOL_DEPTH: int = int(os.getenv("INFERENCE_POOL_DEPTH", "0"))
+    INFERENCE_POOL_SLOTS: int = int(os.getenv("INFERENCE_POOL_SLOTS", "0"))       # 0: 8 * derinlik
+    INFERENCE_POOL_SLOT_BYTES: int = int(os.getenv("INFERENCE_POOL_SLOT_BYTES", str(1920 * 1080 * 3)))
+    # Büyük fotoğraflarda (drone / geniş açı) Person bölgelerinde karolu ikinci tarama
+    IMAGE_TILING: bool = os.getenv("IMAGE_TILING", "0") == "1"
+    IMAGE_TILING_MIN_SIDE: int = int(os.getenv("IMAGE_TILING_MIN_SIDE", "1600"))   # bu uzun kenarın altında karo yok
+    IMAGE_TILING_OVERLAP: float = float(os.getenv("IMAGE_TILING_OVERLAP", "0.2"))
+    # İki aşamalı tespit: base model küçültülmüş frame'de kişileri bulur, fine-tuned
+    # model sadece (pay bırakılmış) kişi kırpıntılarında koşar; kişi yoksa hiç koşmaz
+    INFERENCE_CASCADE: bool = os.getenv("INFERENCE_CASCADE", "0") == "1"
+    CASCADE_PERSON_SIDE: int = int(os.getenv("CASCADE_PERSON_SIDE", "640"))
+    CASCADE_CROP_IMGSZ: int = int(os.getenv("CASCADE_CROP_IMGSZ", "320"))
+    CASCADE_CROP_PAD: float = float(os.getenv("CASCADE_CROP_PAD", "0.2"))
+    # Fine-tuned model hassasiyeti: "fp32", "int8-dynamic", "int8-static"
+    # (INT8 varyantlar best.pt'nin ONNX export'undan üretilir ve ONNX Runtime ile koşar)
+    FT_MODEL_PRECISION: str = os.getenv("FT_MODEL_PRECISION", "fp32")
+    # int8-static için kalibrasyon görselleri (sahadan birkaç yüz temsilî fotoğraf yeterli)
+    QUANT_CALIB_DIR: str = os.getenv("QUANT_CALIB_DIR", os.path.join(BASE_DIR, "..", "calibration"))
+    QUANT_CALIB_IMAGES: int = int(os.getenv("QUANT_CALIB_IMAGES", "100"))
+
+    # Arka plan video analizi
+    VIDEO_JOB_WORKERS: int = int(os.getenv("VIDEO_JOB_WORKERS", "2"))
+    VIDEO_JOB_MAX_PENDING: int = int(os.getenv("VIDEO_JOB_MAX_PENDING", "8"))
+    VIDEO_FRAME_STRIDE: int = 15
+    # "fixed": her VIDEO_FRAME_STRIDE frame'de bir, "motion": sahne hareketine göre örnekleme
+    # (isteğe bağlı; motion seçilince parçalı analiz devreye girmez)
+    VIDEO_SAMPLING: str = os.getenv("VIDEO_SAMPLING", "fixed")
+    VIDEO_MOTION_THRESHOLD: float = float(os.getenv("VIDEO_MOTION_THRESHOLD", "0.01"))
+    VIDEO_MOTION_MIN_GAP: int = int(os.getenv("VIDEO_MOTION_MIN_GAP", "3"))
+    VIDEO_MOTION_MAX_GAP: int = int(os.getenv("VIDEO_MOTION_MAX_GAP", "45"))
+    # Overlay videosu: "none" (sadece metrikler), "full", "downscaled", "highlights", "segments"
+    VIDEO_OUTPUT_MODE: str = os.getenv("VIDEO_OUTPUT_MODE", "full")
+    VIDEO_OUTPUT_MAX_WIDTH: int = int(os.getenv("VIDEO_OUTPUT_MAX_WIDTH", "960"))
+    VIDEO_HIGHLIGHT_FPS: float = float(os.getenv("VIDEO_HIGHLIGHT_FPS", "4"))
+    VIDEO_SEGMENT_S: float = float(os.getenv("VIDEO_SEGMENT_S", "10"))
+    # OpenCV derlemesi destekliyorsa "avc1" (H.264) tarayıcıda doğrudan oynar ve daha küçüktür
+    VIDEO_OUTPUT_FOURCC: str = os.getenv("VIDEO_OUTPUT_FOURCC", "mp4v")
+    # Uzun kayıtlarda parçalı analiz: video keyframe hizalı parçalara bölünüp bu kadar
+    # süreçte paralel işlenir (0: kapalı). Sadece VIDEO_SAMPLING=fixed ile devreye girer;
+    # parçalar en az VIDEO_CHUNK_MIN_S saniye, overlay parça başına ayrı dosya olur.
+    VIDEO_CHUNK_PROCESSES: int = int(os.getenv("VIDEO_CHUNK_PROCESSES", "0"))
+    VIDEO_CHUNK_THREADS: int = int(os.getenv("VIDEO_CHUNK_THREADS", "1"))   # süreç başına intra-op, 0: otomatik
+    VIDEO_CHUNK_MIN_S: float = float(os.getenv("VIDEO_CHUNK_MIN_S", "20"))
+
+    # Canlı kamera izleme
+    # Açılışta eklenecek kaynaklar: "site_id|url|ad;site_id|url|ad" (ad isteğe bağlı)
+    STREAM_SOURCES: str = os.getenv("STREAM_SOURCES", "")
+    # API'den eklenen akışlar: izin verilen şemalar ve (boş değilse) sadece bu host'lar.
+    # Yerel dosya / cihaz sadece STREAM_SOURCES ile (sunucuyu yöneten) eklenebilir.
+    STREAM_URL_SCHEMES: str = os.getenv("STREAM_URL_SCHEMES", "rtsp,rtsps,http,https")
+    STREAM_ALLOWED_HOSTS: str = os.getenv("STREAM_ALLOWED_HOSTS", "")
+    STREAM_WORKERS: int = int(os.getenv("STREAM_WORKERS", "1"))
+    STREAM_BATCH_SIZE: int = int(os.getenv("STREAM_BATCH_SIZE", "4"))
+    STREAM_MAX_FPS: float = float(os.getenv("STREAM_MAX_FPS", "2"))      # kamera başına analiz hızı
+    STREAM_WINDOW_S: float = float(os.getenv("STREAM_WINDOW_S", "60"))
+    STREAM_MIN_PERSONS: int = int(os.getenv("STREAM_MIN_PERSONS", "5"))
+    STREAM_RISK_THRESHOLD: str = os.getenv("STREAM_RISK_THRESHOLD", "high")
+    STREAM_ALERT_COOLDOWN_S: float = float(os.getenv("STREAM_ALERT_COOLDOWN_S", "300"))
+
+    # Tespit sonucu cache'i (içerik hash'i + model ağırlıkları)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "1") == "1"
+    RESULT_CACHE_DIR: str = os.path.join(BASE_DIR, "cache", "results")
+    RESULT_CACHE_MEMORY_ENTRIES: int = int(os.getenv("RESULT_CACHE_MEMORY_ENTRIES", "256"))
+    RESULT_CACHE_MAX_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+    # Overlay / thumbnail / video deposu (uploads/ab/cd/...); kotalar arka planda uygulanır, 0 = sınırsız
+    ARTIFACT_INDEX_PATH: str = os.getenv("ARTIFACT_INDEX_PATH", os.path.join(BASE_DIR, "data", "artifacts.db"))
+    ARTIFACT_MAX_BYTES: int = int(os.getenv("ARTIFACT_MAX_BYTES", str(20 * 1024 ** 3)))
+    ARTIFACT_MAX_AGE_DAYS: float = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "30"))
+    ARTIFACT_SWEEP_INTERVAL_S: float = float(os.getenv("ARTIFACT_SWEEP_INTERVAL_S", "60"))
+    ARTIFACT_THUMB_WIDTH: int = int(os.getenv("ARTIFACT_THUMB_WIDTH", "320"))
+    # Tarayıcı cache süresi; içerik hash'li görseller zaten "immutable" işaretlenir
+    ARTIFACT_HTTP_MAX_AGE_S: int = int(os.getenv("ARTIFACT_HTTP_MAX_AGE_S", "86400"))
+
+    # Prometheus metrikleri (/metrics); kapalıyken ölçüm kodu neredeyse maliyetsiz
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "0") == "1"
+    # Bu süreyi (ms) aşan isteklerin örneklemeli profili (flame graph için
+    # "collapsed stack" formatında) PROFILE_DIR'e yazılır; 0 = kapalı
+    PROFILE_SLOW_REQUEST_MS: float = float(os.getenv("PROFILE_SLOW_REQUEST_MS", "0"))
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", os.path.join(BASE_DIR, "data", "profiles"))
+    PROFILE_KEEP: int = int(os.getenv("PROFILE_KEEP", "50"))
+
     def __init__(self) -> None:
        
         os.makedirs(self.UPLOAD_DIR, exist_ok=True)
@@ -0,0 +1,325 @@
+import bisect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+
+# Aşama süreleri için (saniye) kovalar: JPEG encode ~ms, tam video analizi ~dakika
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ---------- metrik tipleri ----------
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, v in items:
+            lines.append(f"{self.name}{_label_str(self.labelnames, labels)} {_fmt(v)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # etiket -> [kova sayıları (kümülatif değil) + Inf, toplam, adet]
+        self._series: Dict[Labels, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str, count: int = 1) -> None:
+        """`count` aynı değerli gözlem (batch'te görsel başına süre gibi) tek çağrıda."""
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][i] += count
+            s[1] += value * count
+            s[2] += count
+
+    def snapshot(self, *labels: str) -> Optional[Dict[str, float]]:
+        s = self._series.get(labels)
+        if s is None:
+            return None
+        return {"count": s[2], "sum": s[1]}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._series.items())
+        for labels, (counts, total, n) in items:
+            cum = 0
+            for le, c in zip(self.buckets + (float("inf"),), counts):
+                cum += c
+                le_label = 'le="%s"' % _fmt(le)
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, labels, le_label)} {cum}")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, labels)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, labels)} {n}")
+        return lines
+
+
+class GaugeCallback:
+    """Değeri sadece /metrics okunurken hesaplanan gauge: fn() -> {etiketler: değer}."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], fn: Callable[[], Dict[Labels, float]]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            values = self.fn()
+        except Exception as e:  # scrape bir servis hatası yüzünden düşmesin
+            print(f"[Metrics] {self.name} okunamadı:", e)
+            return []
+        for labels, v in sorted(values.items()):
+            lines.append(f"{self.name}{_label_str(self.labelnames, labels)} {_fmt(v)}")
+        return lines
+
+
+class _StageTimer:
+    __slots__ = ("hist", "labels", "t0")
+
+    def __init__(self, hist: Histogram, labels: Labels) -> None:
+        self.hist = hist
+        self.labels = labels
+
+    def __enter__(self) -> "_StageTimer":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.hist.observe(time.perf_counter() - self.t0, *self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+# ---------- kayıt ----------
+class Metrics:
+    """
+    Prometheus metin formatında (text exposition 0.0.4) metrik kaydı; dış
+    bağımlılık yok. Kapalıyken (`enabled=False`) `stage()` paylaşılan boş bir
+    context döndürür ve `observe_results()` hemen döner; sıcak yoldaki maliyet
+    bir attribute okuması kadardır.
+
+    Sabit metrikler:
+      - ppe_stage_seconds{stage}: upload_write, decode, overlay_plot,
+        jpeg_encode, video_encode, template_render, ...
+      - ppe_model_seconds{model, phase}: görsel başına preprocess / inference /
+        postprocess (ultralytics `Results.speed`, ONNX ve havuz da aynı alanı doldurur)
+      - ppe_model_images_total{model}
+      - ppe_http_requests_total{method, route, status}, ppe_http_request_seconds{route}
+    Kuyruk derinlikleri ve bellek gibi anlık değerler `gauge()` ile kaydedilen
+    fonksiyonlardan okunur.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._collectors: Dict[str, Any] = {}
+
+        self.stages = self.histogram("ppe_stage_seconds", "İstek / analiz aşaması süresi (saniye).", ["stage"])
+        self.model_seconds = self.histogram(
+            "ppe_model_seconds", "Model çağrısında görsel başına aşama süresi (saniye).", ["model", "phase"]
+        )
+        self.model_images = self.counter("ppe_model_images_total", "Modelden geçen görsel sayısı.", ["model"])
+        self.requests = self.counter("ppe_http_requests_total", "HTTP istek sayısı.", ["method", "route", "status"])
+        self.request_seconds = self.histogram("ppe_http_request_seconds", "HTTP istek süresi (saniye).", ["route"])
+
+    def _register(self, collector: Any) -> Any:
+        with self._lock:
+            existing = self._collectors.get(collector.name)
+            if existing is not None and not isinstance(collector, GaugeCallback):
+                return existing
+            self._collectors[collector.name] = collector
+        return collector
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str], fn: Callable[[], Dict[Labels, float]]) -> None:
+        """Aynı isimle tekrar kaydedilirse fonksiyon değiştirilir."""
+        self._register(GaugeCallback(name, help, labelnames, fn))
+
+    # ---------- sıcak yol ----------
+    def stage(self, name: str) -> Any:
+        """`with metrics.stage("decode"): ...` -> ppe_stage_seconds{stage="decode"}."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self.stages, (name,))
+
+    def observe_stage(self, name: str, seconds: float) -> None:
+        if self.enabled:
+            self.stages.observe(seconds, name)
+
+    def observe_results(self, model: str, results: Iterable[Any]) -> Any:
+        """
+        Model çıktısındaki `speed` (ms, batch'te görsel başına ortalama) alanlarını
+        kaydeder ve `results`'ı olduğu gibi döndürür. Aynı speed nesnesini paylaşan
+        sonuçlar (ONNX / havuz batch'i) tek seferde, görsel sayısı kadar gözlem olarak yazılır.
+        """
+        if not self.enabled:
+            return results
+        batches: Dict[int, List[Any]] = {}
+        for r in results:
+            speed = getattr(r, "speed", None)
+            if speed:
+                entry = batches.setdefault(id(speed), [speed, 0])
+                entry[1] += 1
+        for speed, n in batches.values():
+            for phase in ("preprocess", "inference", "postprocess"):
+                ms = speed.get(phase)
+                if ms is not None:
+                    self.model_seconds.observe(ms / 1000.0, model, phase, count=n)
+            self.model_images.inc(model, amount=n)
+        return results
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors.values())
+        lines: List[str] = []
+        for c in collectors:
+            lines.extend(c.render())
+        return "\n".join(lines) + "\n"
+
+
+# ---------- süreç / model belleği ----------
+def process_rss_bytes() -> Optional[int]:
+    """Bu sürecin yerleşik belleği (Linux /proc; başka platformlarda None)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def model_bytes(model: Any) -> int:
+    """Torch modelinde parametre + buffer baytları, ONNX'te model dosyası boyutu."""
+    onnx_path = getattr(model, "onnx_path", None)
+    if onnx_path is not None:
+        return os.path.getsize(onnx_path) if os.path.exists(onnx_path) else 0
+    net = getattr(model, "model", None)
+    if net is None or not hasattr(net, "parameters"):
+        return 0
+    total = sum(p.numel() * p.element_size() for p in net.parameters())
+    return total + sum(b.numel() * b.element_size() for b in net.buffers())
+
+
+# ---------- HTTP ----------
+class MetricsMiddleware:
+    """
+    Saf ASGI middleware: istek sayısı / süresi (route şablonuyla, ör.
+    "/safety/video/jobs/{job_id}") ve isteğe bağlı yavaş istek profili.
+    Metrikler ve profil kapalıysa main.py bunu hiç eklemez.
+    """
+
+    def __init__(self, app: Any, registry: "Metrics", profiler: Any = None) -> None:
+        self.app = app
+        self.registry = registry
+        self.profiler = profiler
+        self._routes: Dict[int, str] = {}
+
+    def _route(self, scope: Dict[str, Any]) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        label = self._routes.get(id(endpoint))
+        if label is None:
+            label = "unmatched"
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint or getattr(route, "app", None) is endpoint:
+                    label = route.path
+                    break
+            self._routes[id(endpoint)] = label
+        return label
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = self.profiler.begin() if self.profiler is not None else None
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - t0
+            route = self._route(scope)
+            if self.registry.enabled:
+                self.registry.requests.inc(scope["method"], route, str(status[0]))
+                self.registry.request_seconds.observe(elapsed, route)
+            if started is not None:
+                self.profiler.end(started, f"{scope['method']} {route}")
+
+
+metrics = Metrics(enabled=settings.METRICS_ENABLED)
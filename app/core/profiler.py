@@ -0,0 +1,131 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter as _Counter, deque
+from typing import Deque, List, Optional, Tuple
+
+
+# Boşta bekleyen thread'lerin yığınları (kuyruk / koşul / select beklemesi) profili kirletmesin
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("connection.py", "_poll"),
+    ("thread.py", "_worker"),
+}
+
+
+def _collapse(frame) -> Optional[str]:
+    """Python frame'inden "kök;...;yaprak" satırı (flamegraph.pl / speedscope collapsed formatı)."""
+    leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+    if leaf in _IDLE_LEAVES:
+        return None
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SlowRequestProfiler:
+    """
+    Yavaş istekler için örneklemeli profiler. En az bir istek sürerken bir
+    arka plan thread'i `interval_s` aralıklarla tüm thread'lerin Python
+    yığınlarını (sys._current_frames) örnekler. Eşiği (`threshold_s`) aşan
+    bir istek bittiğinde, o isteğin süresi boyunca toplanan örnekler
+    `out_dir` altına collapsed stack dosyası olarak yazılır:
+
+        flamegraph.pl slow_....folded > slow.svg   (ya da speedscope.app)
+
+    İstekler thread havuzunda koştuğu için örnekler isteğe değil zaman
+    aralığına göre seçilir; aynı anda koşan başka işler de dosyada görünür.
+    İstek yokken sampler uyur, profil kapalıyken (threshold 0) hiç kurulmaz.
+    """
+
+    def __init__(
+        self,
+        threshold_s: float,
+        out_dir: str,
+        interval_s: float = 0.005,
+        keep: int = 50,
+        max_samples: int = 200_000,
+    ) -> None:
+        self.threshold_s = threshold_s
+        self.out_dir = out_dir
+        self.interval_s = interval_s
+        self.keep = keep
+
+        self._samples: Deque[Tuple[float, str]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._wake = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self.dumps = 0
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sample_loop, name="slow-request-profiler", daemon=True)
+            self._thread.start()
+
+    def begin(self) -> float:
+        with self._lock:
+            self._active += 1
+            self._ensure_thread()
+            self._wake.notify()
+        return time.monotonic()
+
+    def end(self, started: float, label: str) -> Optional[str]:
+        """İstek bitti; eşik aşıldıysa profil dosyasının yolunu döndürür."""
+        now = time.monotonic()
+        with self._lock:
+            self._active -= 1
+            window = [s for t, s in self._samples if started <= t <= now] if now - started >= self.threshold_s else None
+            if self._active == 0:
+                self._samples.clear()
+        if window is None:
+            return None
+        return self._dump(window, label, now - started)
+
+    def _sample_loop(self) -> None:
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                while self._active == 0:
+                    self._wake.wait()
+            now = time.monotonic()
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                stack = _collapse(frame) if ident != me else None
+                if stack is not None:
+                    stacks.append(stack)
+            with self._lock:
+                self._samples.extend((now, s) for s in stacks)
+            time.sleep(self.interval_s)
+
+    def _dump(self, stacks: List[str], label: str, seconds: float) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_")[:60] or "request"
+        name = f"slow_{time.strftime('%Y%m%d-%H%M%S')}_{int(seconds * 1000)}ms_{safe}.folded"
+        path = os.path.join(self.out_dir, name)
+        with open(path, "w") as f:
+            for stack, n in sorted(_Counter(stacks).items()):
+                f.write(f"{stack} {n}\n")
+        self.dumps += 1
+        print(f"[Profiler] {label} {seconds * 1000:.0f} ms sürdü, profil: {path}")
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        files = sorted(
+            (os.path.join(self.out_dir, f) for f in os.listdir(self.out_dir) if f.endswith(".folded")),
+            key=os.path.getmtime,
+        )
+        for path in files[: max(0, len(files) - self.keep)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,172 @@
+import math
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Set
+
+
+_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# configure_threads() sonucu; torch ilk model yüklenirken import edildiğinde uygulanır
+_plan: Optional[Dict[str, int]] = None
+_torch_applied = False
+_lock = threading.Lock()
+
+
+# ---------- CPU topolojisi ----------
+def _cgroup_cpu_limit() -> Optional[float]:
+    """Konteyner CPU kotası (çekirdek cinsinden); cgroup v2 cpu.max, yoksa v1 cfs_quota."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def cpu_topology() -> Dict[str, int]:
+    """
+    Bu sürecin kullanabileceği CPU'lar:
+      - logical : makinedeki mantıksal CPU sayısı
+      - usable  : affinity maskesi ve cgroup kotasıyla sınırlı mantıksal CPU
+      - physical: usable içindeki fiziksel çekirdek (hyper-thread kardeşleri tek sayılır)
+    GEMM ağırlıklı inference'ta hyper-thread kardeşi neredeyse hiç hız katmaz,
+    bu yüzden thread planı fiziksel çekirdek üzerinden yapılır.
+    """
+    logical = os.cpu_count() or 1
+    try:
+        cpus: List[int] = sorted(os.sched_getaffinity(0))
+    except AttributeError:      # macOS / Windows
+        cpus = list(range(logical))
+
+    cores: Set[str] = set()
+    for cpu in cpus:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list") as f:
+                cores.add(f.read().strip())
+        except OSError:
+            cores.add(str(cpu))
+
+    usable = len(cpus)
+    physical = len(cores)
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        usable = min(usable, max(1, math.ceil(limit)))
+        physical = min(physical, usable)
+    return {"logical": logical, "usable": usable, "physical": max(physical, 1)}
+
+
+# ---------- plan ----------
+def plan_threads(
+    workers: int = 1,
+    pool_processes: int = 0,
+    chunk_processes: int = 0,
+    intra_op: int = 0,
+    inter_op: int = 0,
+    topology: Optional[Dict[str, int]] = None,
+) -> Dict[str, int]:
+    """
+    Fiziksel çekirdekleri web worker'ları (uvicorn/gunicorn `workers`) ve
+    inference süreçleri arasında paylaştırır; her süreç varsayılan olarak tüm
+    çekirdeklerde thread açtığında N worker N x çekirdek thread ile yarışır.
+
+      - intra_op : web sürecindeki torch / ONNX Runtime / OpenCV thread sayısı.
+        Inference havuzu açıksa modeller orada koşar, web süreci 1 thread'le yetinir.
+      - inter_op : YOLO forward'ı sıralı bir graf; ayrı operatör paralelliği
+        sadece boşta bekleyen thread demek, 1.
+      - pool_threads / chunk_threads : havuz / parçalı video süreci başına thread.
+
+    0 verilen değerler hesaplanır, diğerleri olduğu gibi kalır.
+    """
+    topology = topology or cpu_topology()
+    cores = topology["physical"]
+    workers = max(int(workers), 1)
+
+    def share(processes: int) -> int:
+        return max(1, cores // (workers * max(processes, 1)))
+
+    return {
+        "cores": cores,
+        "workers": workers,
+        "intra_op": intra_op or (1 if pool_processes else share(1)),
+        "inter_op": inter_op or 1,
+        "pool_threads": share(pool_processes),
+        "chunk_threads": share(chunk_processes),
+    }
+
+
+# ---------- uygulama ----------
+def apply_torch_threads() -> None:
+    """
+    Planı torch'a uygular (bir kez). torch ağır import olduğu için burada
+    import edilmez: model_registry ilk modeli yüklerken çağırır. Inter-op
+    havuzu ilk paralel işten sonra değiştirilemez; o durumda atlanır.
+    """
+    global _torch_applied
+    if _plan is None or _torch_applied or "torch" not in sys.modules:
+        return
+    with _lock:
+        if _torch_applied:
+            return
+        import torch
+
+        torch.set_num_threads(_plan["intra_op"])
+        try:
+            torch.set_num_interop_threads(_plan["inter_op"])
+        except RuntimeError:
+            pass
+        _torch_applied = True
+
+
+def configure_threads() -> Optional[Dict[str, int]]:
+    """
+    settings'e göre thread planını çıkarır ve uygular (uygulama açılışında,
+    torch import edilmeden önce): OpenMP / MKL ortam değişkenleri, OpenCV,
+    0 bırakılmış ONNX_THREADS / INFERENCE_POOL_THREADS / VIDEO_CHUNK_THREADS.
+    Ortamda OMP_NUM_THREADS zaten verilmişse web süreci için o kullanılır.
+    THREAD_AUTOTUNE=0 ise hiçbir şeye dokunulmaz.
+    """
+    global _plan
+    from app.core.config import settings
+
+    if not settings.THREAD_AUTOTUNE:
+        return None
+
+    import cv2
+
+    intra = settings.TORCH_THREADS or int(os.environ.get("OMP_NUM_THREADS") or 0)
+    plan = plan_threads(
+        workers=settings.WEB_WORKERS,
+        pool_processes=settings.INFERENCE_POOL_PROCESSES,
+        chunk_processes=settings.VIDEO_CHUNK_PROCESSES,
+        intra_op=intra,
+        inter_op=settings.TORCH_INTEROP_THREADS,
+    )
+    for var in _ENV_VARS:
+        os.environ.setdefault(var, str(plan["intra_op"]))
+    cv2.setNumThreads(plan["intra_op"])
+    if not settings.ONNX_THREADS:
+        settings.ONNX_THREADS = plan["intra_op"]
+    if not settings.INFERENCE_POOL_THREADS:
+        settings.INFERENCE_POOL_THREADS = plan["pool_threads"]
+    if not settings.VIDEO_CHUNK_THREADS:
+        settings.VIDEO_CHUNK_THREADS = plan["chunk_threads"]
+
+    _plan = plan
+    apply_torch_threads()       # torch zaten yüklüyse (testler, benchmark) hemen
+    print(
+        f"[Tuning] {plan['cores']} çekirdek / {plan['workers']} worker: "
+        f"intra-op {plan['intra_op']}, inter-op {plan['inter_op']}, "
+        f"havuz süreci başına {settings.INFERENCE_POOL_THREADS}"
+    )
+    return plan
@@ -2,11 +2,19 @@ import os
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from app.api.routes import router as ui_router
+from app.api.routes import router as ui_router, yolo_service, job_service, stream_monitor, artifact_store, safety_service
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.profiler import SlowRequestProfiler
+from app.core.tuning import configure_threads
+from app.services.model_registry import registry as model_registry
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# torch henüz import edilmedi (modeller lazy); OpenMP / MKL thread sayısı ancak şimdi sabitlenebilir
+thread_plan = configure_threads()
+
 app = FastAPI(title="PPE Safety System")
 
 
@@ -16,8 +24,68 @@ app.mount(
     name="static",
 )
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# /uploads artık routes.py'de (ArtifactStore: Range, ETag, erişim kaydı)
 
 
 # Tüm route'lar
 app.include_router(ui_router)
+
+
+# İstek sayacı / süresi ve yavaş istek profili; ikisi de kapalıysa middleware hiç eklenmez
+profiler = None
+if settings.PROFILE_SLOW_REQUEST_MS > 0:
+    profiler = SlowRequestProfiler(
+        settings.PROFILE_SLOW_REQUEST_MS / 1000.0,
+        settings.PROFILE_DIR,
+        interval_s=settings.PROFILE_SAMPLE_INTERVAL_MS / 1000.0,
+        keep=settings.PROFILE_KEEP,
+    )
+if metrics.enabled or profiler is not None:
+    app.add_middleware(MetricsMiddleware, registry=metrics, profiler=profiler)
+
+
+@app.on_event("startup")
+def _warmup_models() -> None:
+    # Ağırlıklar istekleri bekletmeden arka planda yüklenir
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        yolo_service.warmup(background=True)
+
+
+@app.on_event("startup")
+def _start_artifact_sweeper() -> None:
+    # pin'lerden önceki kurulumlarda denetim thumbnail'ları bir kez pin'lenir
+    if not artifact_store.has_pins:
+        _pin_inspection_thumbnails()
+    # yaş / boyut kotası arka planda uygulanır
+    artifact_store.start_sweeper()
+
+
+def _pin_inspection_thumbnails(page: int = 1000) -> None:
+    after_id = None
+    while True:
+        inspections = safety_service.list_inspections(limit=page, after_id=after_id)
+        for ins in inspections:
+            artifact_store.pin(f"inspection:{ins.id}", [ins.thumbnail])
+        if len(inspections) < page:
+            return
+        after_id = inspections[-1].id
+
+
+@app.on_event("startup")
+def _start_streams() -> None:
+    # STREAM_SOURCES="1|rtsp://kamera1/stream|Giriş;2|rtsp://kamera2/stream"
+    for entry in filter(None, (e.strip() for e in settings.STREAM_SOURCES.split(";"))):
+        parts = entry.split("|")
+        stream_monitor.add_stream(int(parts[0]), parts[1], name=parts[2] if len(parts) > 2 else None)
+
+
+@app.on_event("shutdown")
+def _shutdown_jobs() -> None:
+    # Isınma modelleri yüklerken süreç kapanırsa torch thread'i "terminate called" ile çöker
+    yolo_service.stop_warmup()
+    # Bekleyen video analizlerini iptal et, worker'ları kapat
+    job_service.shutdown()
+    stream_monitor.stop()
+    yolo_service.close()
+    model_registry.close()
+    artifact_store.close()
@@ -10,3 +10,4 @@ class SafetyInspection(BaseModel):
     notes: Optional[str] = None
     file_name: Optional[str] = None  
     detected_ppe: Optional[List[str]] = None
+    thumbnail: Optional[str] = None    # overlay'in küçük WebP'si (uploads/ altında göreli)
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+
+
+class VideoJob(BaseModel):
+    id: str
+    site_id: int
+    inspector: str
+    notes: Optional[str] = None
+    file_name: Optional[str] = None
+    status: str = "queued"            # queued / running / done / failed / cancelled
+    frames_done: int = 0
+    frames_total: int = 0
+    summary: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
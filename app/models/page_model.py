@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[int] = None    # sonraki sayfa için ?cursor=; None ise son sayfa
+    total: Optional[int] = None          # sadece ilk sayfada (cursor'sız istek) doldurulur
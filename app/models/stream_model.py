@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class CameraStream(BaseModel):
+    id: str
+    site_id: int
+    name: str
+    url: str
+    status: str = "starting"          # starting / running / reconnecting / finished / stopped
+    frames_read: int = 0
+    frames_analyzed: int = 0
+    frames_dropped: int = 0           # yenisi geldiği için hiç analiz edilmeyen frame'ler
+    latency_p50_ms: Optional[float] = None
+    latency_p99_ms: Optional[float] = None
+    helmet_ratio: Optional[float] = None   # şantiyenin kayan penceresi
+    vest_ratio: Optional[float] = None
+    risk_level: Optional[str] = None
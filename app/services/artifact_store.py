@@ -0,0 +1,413 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.metrics import metrics
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    name     TEXT PRIMARY KEY,
+    kind     TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS artifact_pins (
+    name  TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    PRIMARY KEY (name, owner)
+) WITHOUT ROWID;
+"""
+
+
+def _shard(key: str) -> str:
+    return f"{key[:2]}/{key[2:4]}"
+
+
+class ArtifactStore:
+    """
+    Overlay görselleri, thumbnail'lar ve overlay videoları için dosya deposu
+    (/uploads altında servis edilen her şey).
+
+    - Dosyalar `root/ab/cd/...` şeklinde hash'li alt klasörlere dağıtılır;
+      tek klasörde yüz binlerce dosya birikmez.
+    - Overlay görselleri JPEG içeriğinin hash'iyle adlandırılır: aynı overlay
+      ikinci kez diske yazılmaz (dedup). Thumbnail'lar (WebP) istek yolunu
+      bekletmemek için arka plandaki tek thread'de üretilir.
+    - Her dosyanın boyutu, oluşturulma ve son erişim zamanı küçük bir SQLite
+      indeksinde tutulur; bellekte LRU sırasında bir kopyası vardır.
+    - Arka plan temizleyicisi (`start_sweeper`) `max_age_s`'den eski dosyaları
+      ve toplam boyut `max_bytes`'ı aşınca en uzun süredir erişilmeyenleri siler.
+      Son `grace_s` saniyede üretilen dosyalara dokunulmaz (sayfa henüz açılıyor).
+    - Kalıcı kayıtların (ör. denetim thumbnail'ı) gösterdiği dosyalar `pin` ile
+      işaretlenir; temizleyici ve `discard` (ResultCache) bunları silmez. İçerik
+      adresli isimler paylaşıldığı için silme kararı dosya bazında verilir.
+
+    İsimler her zaman `root`'a göre göreli ve "/" ayraçlıdır (URL'de aynen kullanılır).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        index_path: str,
+        max_bytes: int = 0,
+        max_age_s: float = 0,
+        sweep_interval_s: float = 60.0,
+        grace_s: float = 300.0,
+        thumb_width: int = 320,
+        jpeg_quality: int = 90,
+    ) -> None:
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.sweep_interval_s = sweep_interval_s
+        self.grace_s = grace_s
+        self.thumb_width = thumb_width
+        self.jpeg_quality = jpeg_quality
+        os.makedirs(self.root, exist_ok=True)
+
+        if index_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(index_path, check_same_thread=False)
+        with self._db_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+        self._lock = threading.Lock()
+        # name -> [size, created, accessed], en eski erişim başta
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._bytes = 0
+        self._dirty: Dict[str, float] = {}    # indekse henüz yazılmamış erişim zamanları
+        self._pins: Dict[str, Set[str]] = {}   # dosya -> onu gösteren kalıcı kayıtlar
+
+        self.dedup_hits = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._thumbs = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-thumb")
+        self._pending_thumbs: Set[str] = set()
+
+        self._load_index()
+
+    # ---------- indeks ----------
+    def _load_index(self) -> None:
+        with self._db_lock:
+            rows = self._conn.execute("SELECT name, size, created, accessed FROM artifacts ORDER BY accessed").fetchall()
+        if not rows:
+            rows = self._adopt_existing()
+        for name, size, created, accessed in rows:
+            self._entries[name] = [size, created, accessed]
+            self._bytes += size
+        with self._db_lock:
+            pins = self._conn.execute("SELECT name, owner FROM artifact_pins").fetchall()
+        for name, owner in pins:
+            self._pins.setdefault(name, set()).add(owner)
+
+    def _adopt_existing(self) -> List[Tuple[str, int, float, float]]:
+        """
+        İndeks boşsa (ilk kurulum / eski sürüm) kök altındaki dosyalar mtime
+        ile kaydedilir; eski düz `uploads/` klasörü de kotaya dahil olur.
+        """
+        rows = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for fname in filenames:
+                if fname.startswith(".") or fname.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, fname)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                rows.append((name, st.st_size, st.st_mtime, st.st_mtime))
+        if rows:
+            rows.sort(key=lambda r: r[3])
+            with self._db_lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?)",
+                    ((n, self._kind(n), s, c, a) for n, s, c, a in rows),
+                )
+                self._conn.commit()
+            print(f"[ArtifactStore] Mevcut {len(rows)} dosya indekse eklendi")
+        return rows
+
+    @staticmethod
+    def _kind(name: str) -> str:
+        if name.endswith(".webp"):
+            return "thumb"
+        return "video" if name.endswith(".mp4") else "image"
+
+    def _register(self, name: str, kind: str, size: int) -> None:
+        now = time.time()
+        with self._lock:
+            old = self._entries.pop(name, None)
+            if old is not None:
+                self._bytes -= old[0]
+            self._entries[name] = [size, now, now]
+            self._bytes += size
+            self._dirty.pop(name, None)
+        with self._db_lock:
+            self._conn.execute("INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?)", (name, kind, size, now, now))
+            self._conn.commit()
+
+    # ---------- yollar ----------
+    def path(self, name: str) -> Optional[str]:
+        """Göreli ismin mutlak yolu; kök dışına çıkan isimler için None."""
+        path = os.path.abspath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep):
+            return None
+        return path
+
+    def reserve(self, stem: str) -> str:
+        """Video gibi sonradan yazılacak çıktılar için benzersiz, shard'lı taban isim (uzantısız)."""
+        key = uuid.uuid4().hex
+        os.makedirs(os.path.join(self.root, _shard(key)), exist_ok=True)
+        return f"{_shard(key)}/{stem}_{key}"
+
+    def _write_bytes(self, name: str, data: bytes) -> None:
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # aynı overlay'i aynı anda yazan iki istek birbirinin yarım dosyasını görmesin
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _present(self, name: str) -> bool:
+        # indekste olsa bile dosya elle / ResultCache tarafından silinmiş olabilir
+        return name in self._entries and os.path.exists(os.path.join(self.root, name))
+
+    # ---------- yazma ----------
+    def put_image(self, image: np.ndarray, prefix: str, thumbnail: bool = False) -> Tuple[str, Optional[str]]:
+        """
+        Overlay görselini JPEG olarak kaydeder; (isim, thumbnail ismi) döner.
+        İsim encode edilmiş baytların hash'idir (JPEG encode deterministik);
+        aynı içerik zaten varsa dosya tekrar yazılmaz. Thumbnail ismi hemen
+        döner, dosyanın kendisi birkaç ms sonra hazır olur.
+        """
+        with metrics.stage("jpeg_encode"):
+            ok, buf = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise RuntimeError("Overlay görseli encode edilemedi")
+        data = buf.tobytes()
+        key = hashlib.sha256(data).hexdigest()
+        stem = f"{_shard(key)}/{prefix}_{key[:32]}"
+        name = stem + ".jpg"
+        thumb = stem + "_t.webp" if thumbnail else None
+
+        if self._present(name):
+            self.touch(name)
+            self.dedup_hits += 1
+        else:
+            self._write_bytes(name, data)
+            self._register(name, "image", len(data))
+
+        if thumb is not None and not self._present(thumb):
+            with self._lock:
+                schedule = thumb not in self._pending_thumbs
+                self._pending_thumbs.add(thumb)
+            if schedule:
+                self._thumbs.submit(self._write_thumbnail, image, thumb)
+        return name, thumb
+
+    def _write_thumbnail(self, image: np.ndarray, name: str) -> None:
+        try:
+            with metrics.stage("thumbnail"):
+                h, w = image.shape[:2]
+                if w > self.thumb_width:
+                    size = (self.thumb_width, max(int(h * self.thumb_width / w), 1))
+                    image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+                ok, buf = cv2.imencode(".webp", image, [cv2.IMWRITE_WEBP_QUALITY, 70])
+            if ok:      # thumbnail olmadan da liste çalışır
+                self._write_bytes(name, buf.tobytes())
+                self._register(name, "thumb", len(buf))
+        finally:
+            with self._lock:
+                self._pending_thumbs.discard(name)
+
+    def flush_thumbnails(self) -> None:
+        """Kuyruktaki thumbnail'ların yazılmasını bekler (testler / kapanış)."""
+        self._thumbs.submit(lambda: None).result()
+
+    def add(self, name: str, kind: Optional[str] = None) -> None:
+        """Dışarıda yazılmış (ör. VideoWriter) bir dosyayı kotaya dahil eder."""
+        try:
+            size = os.path.getsize(os.path.join(self.root, name))
+        except OSError:
+            return
+        self._register(name, kind or self._kind(name), size)
+
+    def touch(self, name: str) -> None:
+        """Erişim kaydı (LRU); indekse bir sonraki temizlikte toplu yazılır."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return
+            entry[2] = now
+            self._entries.move_to_end(name)
+            self._dirty[name] = now
+
+    # ---------- referanslar ----------
+    def pin(self, owner: str, names: Iterable[Optional[str]]) -> None:
+        """`owner` (ör. "inspection:12") bu dosyaları gösteriyor; silinmezler."""
+        names = [n for n in names if n]
+        if not names:
+            return
+        with self._lock:
+            for name in names:
+                self._pins.setdefault(name, set()).add(owner)
+        with self._db_lock:
+            self._conn.executemany("INSERT OR IGNORE INTO artifact_pins VALUES (?, ?)", ((n, owner) for n in names))
+            self._conn.commit()
+
+    def is_pinned(self, name: str) -> bool:
+        return name in self._pins
+
+    @property
+    def has_pins(self) -> bool:
+        return bool(self._pins)
+
+    # ---------- silme ----------
+    def _delete_file(self, name: str) -> None:
+        path = os.path.join(self.root, name)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        # segment / parça klasörleri (ab/cd/video_result_x/part_000/seg_0000.mp4)
+        # boşaldıysa onlar da gider; shard klasörleri kalır
+        for _ in range(name.count("/") - 2):
+            path = os.path.dirname(path)
+            try:
+                os.rmdir(path)
+            except OSError:
+                break
+
+    def _forget(self, names: List[str]) -> None:
+        with self._db_lock:
+            self._conn.executemany("DELETE FROM artifacts WHERE name = ?", ((n,) for n in names))
+            self._conn.commit()
+
+    def remove(self, name: str) -> None:
+        """Dosyayı koşulsuz siler (pin'leriyle birlikte)."""
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._bytes -= entry[0]
+            self._dirty.pop(name, None)
+            pinned = self._pins.pop(name, None)
+        self._delete_file(name)
+        if entry is not None:
+            self._forget([name])
+        if pinned:
+            with self._db_lock:
+                self._conn.execute("DELETE FROM artifact_pins WHERE name = ?", (name,))
+                self._conn.commit()
+
+    def discard(self, name: str) -> bool:
+        """Pin'lenmemişse siler (kullanan son cache kaydı gidince); silindiyse True."""
+        if self.is_pinned(name):
+            return False
+        self.remove(name)
+        return True
+
+    def sweep(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Yaş ve boyut kotasını uygular, birikmiş erişim zamanlarını indekse yazar."""
+        now = time.time() if now is None else now
+        victims: List[Tuple[str, int]] = []
+        with self._lock:
+            if self.max_age_s > 0:
+                cutoff = now - self.max_age_s
+                for name, (size, created, _) in list(self._entries.items()):
+                    if created < cutoff and name not in self._pins:
+                        victims.append((name, size))
+                        del self._entries[name]
+                        self._bytes -= size
+            if self.max_bytes > 0 and self._bytes > self.max_bytes:
+                # hemen tekrar dolmasın diye kotanın %90'ına kadar boşaltılır
+                target = int(self.max_bytes * 0.9)
+                for name, (size, created, accessed) in list(self._entries.items()):
+                    if self._bytes <= target:
+                        break
+                    if now - accessed < self.grace_s:
+                        break       # LRU sırası: bundan sonrakiler de yeni
+                    if name in self._pins:
+                        continue
+                    victims.append((name, size))
+                    del self._entries[name]
+                    self._bytes -= size
+            for name, _ in victims:
+                self._dirty.pop(name, None)
+            dirty, self._dirty = self._dirty, {}
+
+        for name, _ in victims:
+            self._delete_file(name)
+        if victims:
+            self._forget([n for n, _ in victims])
+        if dirty:
+            with self._db_lock:
+                self._conn.executemany("UPDATE artifacts SET accessed = ? WHERE name = ?", ((t, n) for n, t in dirty.items()))
+                self._conn.commit()
+
+        freed = sum(s for _, s in victims)
+        self.evictions += len(victims)
+        self.evicted_bytes += freed
+        if victims:
+            print(f"[ArtifactStore] {len(victims)} dosya silindi ({freed / 1024 ** 2:.1f} MB)")
+        return {"evicted": len(victims), "freed_bytes": freed}
+
+    # ---------- arka plan temizleyici ----------
+    def start_sweeper(self) -> None:
+        if self._sweeper is not None or self.sweep_interval_s <= 0:
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="artifact-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._stop.set()
+        self._sweeper.join(timeout=5)
+        self._sweeper = None
+        self.sweep()    # son erişim zamanları kaybolmasın
+
+    def close(self) -> None:
+        self.stop_sweeper()
+        self._thumbs.shutdown(wait=True)
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self.sweep_interval_s):
+            try:
+                self.sweep()
+            except Exception as e:  # temizlik hatası servisi durdurmamalı
+                print("[ArtifactStore] Temizlik başarısız:", e)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "pinned": len(self._pins),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "dedup_hits": self.dedup_hits,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+            }
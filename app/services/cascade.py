@@ -0,0 +1,99 @@
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.services.tiling import Tile, offset_and_nms
+
+
+def crop_regions(persons: np.ndarray, w: int, h: int, pad: float = 0.2) -> List[Tile]:
+    """
+    Kişi kutularını her yönde `pad` oranında büyütür (kask başın üstünde, yelek
+    kenarda kalabilir) ve çakışan kırpıntıları birleştirir; kalabalık sahnede
+    aynı bölge defalarca taranmaz.
+    """
+    boxes = []
+    for x1, y1, x2, y2 in np.asarray(persons, dtype=np.float32).reshape(-1, 4).tolist():
+        pw, ph = (x2 - x1) * pad, (y2 - y1) * pad
+        boxes.append([max(int(x1 - pw), 0), max(int(y1 - ph), 0), min(int(x2 + pw), w), min(int(y2 + ph), h)])
+
+    merged = True
+    while merged and len(boxes) > 1:
+        merged = False
+        out: List[List[int]] = []
+        for b in boxes:
+            for o in out:
+                if b[0] < o[2] and b[2] > o[0] and b[1] < o[3] and b[3] > o[1]:
+                    o[:] = [min(o[0], b[0]), min(o[1], b[1]), max(o[2], b[2]), max(o[3], b[3])]
+                    merged = True
+                    break
+            else:
+                out.append(b)
+        boxes = out
+    return [tuple(b) for b in boxes if b[2] > b[0] and b[3] > b[1]]
+
+
+def full_frame_pixels(w: int, h: int, imgsz: int = 640, stride: int = 32) -> int:
+    """Tam frame geçişinin model girişi (dikdörtgen letterbox) piksel sayısı."""
+    r = imgsz / max(w, h)
+    return imgsz * int(np.ceil(min(w, h) * r / stride) * stride)
+
+
+def cascade_detect(
+    images: List[np.ndarray],
+    detect_persons: Callable[[List[np.ndarray]], List[np.ndarray]],
+    detect_ppe: Callable[[List[np.ndarray], Optional[int]], List[np.ndarray]],
+    person_cls: Optional[int],
+    person_side: int = 640,
+    crop_size: int = 320,
+    full_size: int = 640,
+    pad: float = 0.2,
+) -> Tuple[List[np.ndarray], List[np.ndarray], int]:
+    """
+    İki aşamalı tespit:
+      1. `detect_persons` (ucuz base model) uzun kenarı `person_side` olacak
+         şekilde küçültülmüş frame'lerde çalışır.
+      2. `detect_ppe(images, imgsz)` (fine-tuned model) sadece kişi
+         kırpıntılarında (`crop_size` girişle), tüm frame'lerin kırpıntıları tek
+         batch'te; kutular frame koordinatına taşınır.
+    Hiç kişi yoksa ikinci aşama hiç çağrılmaz. Kalabalık bir frame'de
+    kırpıntıların toplam girişi tam frame geçişinden büyükse o frame için
+    fine-tuned model tam frame'de (`full_size`) koşar; cascade tam geçişten pahalı olmaz.
+    Dönen: (aşama 1 satırları, aşama 2 satırları) frame başına (N,6) ve kırpıntı sayısı.
+    """
+    small, scales = [], []
+    for img in images:
+        s = min(person_side / max(img.shape[:2]), 1.0)
+        small.append(cv2.resize(img, None, fx=s, fy=s, interpolation=cv2.INTER_AREA) if s < 1.0 else img)
+        scales.append(s)
+
+    stage1 = []
+    for rows, s in zip(detect_persons(small), scales):
+        rows = rows.reshape(-1, 6).copy()
+        rows[:, :4] /= s
+        stage1.append(rows)
+
+    crops, owners, full = [], [], []
+    for i, (img, rows) in enumerate(zip(images, stage1)):
+        h, w = img.shape[:2]
+        persons = rows[rows[:, 5] == person_cls, :4] if person_cls is not None else rows[:0, :4]
+        regions = crop_regions(persons, w, h, pad)
+        if len(regions) * crop_size * crop_size >= full_frame_pixels(w, h, full_size):
+            full.append(i)
+            continue
+        for t in regions:
+            crops.append(t)
+            owners.append(i)
+
+    empty = np.zeros((0, 6), dtype=np.float32)
+    stage2 = [empty for _ in images]
+    if full:
+        for i, rows in zip(full, detect_ppe([images[i] for i in full], None)):
+            stage2[i] = rows.reshape(-1, 6)
+    if crops:
+        results = detect_ppe([images[i][y1:y2, x1:x2] for i, (x1, y1, x2, y2) in zip(owners, crops)], crop_size)
+        for i in sorted(set(owners)):
+            h, w = images[i].shape[:2]
+            parts = [(t, r) for t, r, o in zip(crops, results, owners) if o == i]
+            stage2[i] = offset_and_nms(parts, w, h)
+    return stage1, stage2, len(crops)
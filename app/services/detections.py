@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+
+def result_arrays(result) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ultralytics sonucundan (cls, conf, xyxy) dizilerini tek seferde çıkarır.
+    boxes.data = [x1, y1, x2, y2, (track_id), conf, cls] tek tensör olduğu için
+    kutu başına ayrı ayrı tensör -> Python dönüşümü yapılmaz.
+    """
+    data = result.boxes.data
+    if hasattr(data, "cpu"):
+        data = data.cpu().numpy()
+    data = np.asarray(data)
+    if data.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32), np.zeros((0, 4), dtype=np.float32)
+    return data[:, -1].astype(np.int64), data[:, -2], data[:, :4]
+
+
+def result_rows(result) -> np.ndarray:
+    """Sonucu (N,6) [x1, y1, x2, y2, conf, cls] float32 dizisine çevirir (track_id kolonu atılır)."""
+    cls, conf, xyxy = result_arrays(result)
+    return np.column_stack([xyxy, conf, cls]).astype(np.float32).reshape(-1, 6)
+
+
+def class_counts(cls: np.ndarray, class_names: Mapping[int, str]) -> Dict[str, int]:
+    """Sınıf adı -> adet; anahtarlar ilk görülme sırasında (Counter ile aynı)."""
+    if cls.size == 0:
+        return {}
+    counts = np.bincount(cls)
+    _, first = np.unique(cls, return_index=True)
+    return {class_names.get(c, str(c)): int(counts[c]) for c in cls[np.sort(first)].tolist()}
+
+
+def detection_dicts(
+    cls: np.ndarray, conf: np.ndarray, xyxy: np.ndarray, class_names: Mapping[int, str]
+) -> List[Dict[str, Any]]:
+    """Şablon / JSON için tespit listesi; diziler Python'a bir kez çevrilir."""
+    return [
+        {
+            "class_id": c,
+            "class_name": class_names.get(c, str(c)),
+            "confidence": p,
+            "bbox": b,
+        }
+        for c, p, b in zip(cls.tolist(), conf.tolist(), xyxy.tolist())
+    ]
+
+
+def parse_result(result, class_names: Mapping[int, str]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    cls, conf, xyxy = result_arrays(result)
+    return detection_dicts(cls, conf, xyxy, class_names), class_counts(cls, class_names)
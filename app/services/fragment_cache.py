@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+
+class FragmentCache:
+    """
+    Render edilmiş HTML parçaları (gösterge paneli kartları, liste sayfaları)
+    için kısa ömürlü cache. Her girdi, render edildiği andaki veri sürümüyle
+    (servislerin `version` sayaçları) saklanır; bir yazma sürümü değiştirdiği
+    anda eski girdi kullanılmaz, kayıtları doğrudan yazan video işleri ve
+    kamera alarmları da ayrıca haber vermeden cache'i geçersiz kılar.
+    `ttl_s` sonunda girdiler her halükarda yeniden render edilir.
+    """
+
+    def __init__(self, ttl_s: float = 10.0, max_entries: int = 256) -> None:
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Hashable, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key: Hashable, version: Hashable, render: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == version and now - entry[0] < self.ttl_s:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # render kilit dışında; aynı anda iki istek aynı parçayı render edebilir, sonuç aynı
+        value = render()
+        with self._lock:
+            self._entries[key] = (now, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl_s": self.ttl_s}
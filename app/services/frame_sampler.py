@@ -0,0 +1,122 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class FrameSampler(ABC):
+    """Video analizinde hangi frame'lerde dedektör çalışacağına karar verir."""
+
+    def reset(self) -> None:
+        pass
+
+    @abstractmethod
+    def should_sample(self, frame_idx: int, frame: np.ndarray) -> bool: ...
+
+    @property
+    @abstractmethod
+    def max_gap(self) -> int:
+        """İki analiz arasındaki en uzun frame aralığı (tracker bunu kullanır)."""
+
+    @property
+    @abstractmethod
+    def key(self) -> str:
+        """Sonuç cache anahtarına giren, sonucu etkileyen parametreler."""
+
+
+class FixedStrideSampler(FrameSampler):
+    """Eski davranış: her `stride` frame'den biri."""
+
+    def __init__(self, stride: int) -> None:
+        self.stride = max(int(stride), 1)
+
+    def should_sample(self, frame_idx: int, frame: np.ndarray) -> bool:
+        return frame_idx % self.stride == 0
+
+    @property
+    def max_gap(self) -> int:
+        return self.stride
+
+    @property
+    def key(self) -> str:
+        return f"stride={self.stride}"
+
+
+class MotionSampler(FrameSampler):
+    """
+    Sahne hareketine göre örnekleme.
+
+    Her frame küçültülmüş gri tonlamaya çevrilip son analiz edilen frame ile
+    karşılaştırılır; skor, `pixel_delta`'dan fazla değişen piksellerin oranıdır.
+    Skor `threshold`'u geçerse (ve son analizden bu yana en az `min_gap` frame
+    geçtiyse) ya da `max_gap` frame boyunca analiz yapılmadıysa dedektör çalışır.
+    Sabit CCTV sahnelerinde inference sayısı düşer, hızlı sahnelerde sıklaşır.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.01,
+        min_gap: int = 3,
+        max_gap: int = 45,
+        pixel_delta: int = 25,
+        width: int = 160,
+    ) -> None:
+        self.threshold = threshold
+        self.min_gap = max(int(min_gap), 1)
+        self._max_gap = max(int(max_gap), self.min_gap)
+        self.pixel_delta = pixel_delta
+        self.width = width
+        self.reset()
+
+    def reset(self) -> None:
+        self._ref: Optional[np.ndarray] = None
+        self._last_idx = 0
+        self.last_score = 0.0
+
+    def _small_gray(self, frame: np.ndarray) -> np.ndarray:
+        h, w = frame.shape[:2]
+        size = (self.width, max(int(round(h * self.width / w)), 1))
+        gray = cv2.cvtColor(cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        # sensör gürültüsü / sıkıştırma artefaktları hareket sayılmasın
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def should_sample(self, frame_idx: int, frame: np.ndarray) -> bool:
+        gap = frame_idx - self._last_idx
+        if self._ref is not None and gap < self.min_gap:
+            return False
+
+        small = self._small_gray(frame)
+        if self._ref is None:
+            self.last_score = 1.0
+        else:
+            self.last_score = float(np.count_nonzero(cv2.absdiff(small, self._ref) > self.pixel_delta)) / small.size
+
+        if self._ref is None or self.last_score >= self.threshold or gap >= self._max_gap:
+            self._ref = small
+            self._last_idx = frame_idx
+            return True
+        return False
+
+    @property
+    def max_gap(self) -> int:
+        return self._max_gap
+
+    @property
+    def key(self) -> str:
+        return f"motion={self.threshold},{self.min_gap},{self._max_gap},{self.pixel_delta},{self.width}"
+
+
+def create_sampler(
+    mode: str,
+    stride: int = 15,
+    threshold: float = 0.01,
+    min_gap: int = 3,
+    max_gap: int = 45,
+) -> FrameSampler:
+    """Ayarlardan sampler üretir; sampler durum tuttuğu için her video için yenisi."""
+    if mode == "fixed":
+        return FixedStrideSampler(stride)
+    if mode == "motion":
+        return MotionSampler(threshold=threshold, min_gap=min_gap, max_gap=max_gap)
+    raise ValueError(f"Bilinmeyen video örnekleme modu: {mode}")
@@ -0,0 +1,140 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from app.core.metrics import metrics
+
+_SENTINEL = object()
+
+
+class BatchingBroker:
+    """
+    Eşzamanlı isteklerden gelen tekil görselleri toplayıp tek batch'li model
+    çağrısında işleyen aracı.
+
+    İlk istek geldikten sonra en fazla `max_wait_ms` kadar (ya da `max_batch`
+    görsel birikene kadar) beklenir, batch tek forward pass ile çalıştırılır
+    ve her çağırana kendi sonucu Future üzerinden döner. O an sistemdeki (decode
+    edilmekte olanlar dahil) tüm istekler zaten batch'teyse beklenmez; tek
+    istemcili yükte ek gecikme olmaz.
+
+    Broker modele tek erişen değildir: video işleri, stream izleme ve cascade
+    aynı model nesnesini başka thread'lerden çağırır. `get_model` bu yüzden
+    çıplak modeli değil, model başına kilitli çağrıyı vermelidir (bkz.
+    YoloPPEService._predict); broker thread'i batch'ini o kilitle çalıştırır.
+
+    Model gibi çağrılabilir: `broker(image_or_path)` -> [Results].
+    """
+
+    def __init__(
+        self,
+        get_model: Callable[[], Any],
+        max_batch: int = 8,
+        max_wait_ms: float = 4.0,
+        name: str = "model",
+    ) -> None:
+        self._get_model = get_model
+        self.max_batch = max(int(max_batch), 1)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._in_flight = 0   # submit edilmiş, sonucu henüz verilmemiş görseller
+
+        # gözlem için: toplam batch sayısı ve işlenen görsel sayısı
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._loop, name=f"batch-{self.name}", daemon=True)
+                    self._thread.start()
+
+    def submit(self, image: Union[str, np.ndarray]) -> "Future[Any]":
+        if self._closed:
+            raise RuntimeError("Broker kapatıldı")
+        self._track(1)
+        if isinstance(image, str):
+            # decode çağıranın thread'inde; broker thread'i sadece inference yapar
+            path = image
+            with metrics.stage("decode"):
+                image = cv2.imread(path)
+            if image is None:
+                self._track(-1)
+                raise RuntimeError(f"Görsel okunamadı: {path}")
+        self._ensure_thread()
+        future: "Future[Any]" = Future()
+        self._queue.put((image, future))
+        return future
+
+    def __call__(self, source: Any, **_: Any) -> List[Any]:
+        items = source if isinstance(source, (list, tuple)) else [source]
+        futures = [self.submit(item) for item in items]
+        return [f.result() for f in futures]
+
+    @property
+    def pending(self) -> int:
+        """Submit edilmiş, sonucu henüz dönmemiş görsel sayısı (kuyruk + çalışan batch)."""
+        return self._in_flight
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            self._in_flight += delta
+
+    def _collect(self, first: Tuple[np.ndarray, Future]) -> List[Tuple[np.ndarray, Future]]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            if self._in_flight <= len(batch) and self._queue.empty():
+                break   # bekleyecek başka istek yok
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _SENTINEL:
+                self._queue.put(_SENTINEL)
+                break
+            batch.append(item)
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _SENTINEL:
+                return
+            batch = self._collect(first)
+            # iptal edilmiş (çağıranı vazgeçmiş) istekler batch'e girmez
+            cancelled = len(batch)
+            batch = [(img, f) for img, f in batch if f.set_running_or_notify_cancel()]
+            self._track(len(batch) - cancelled)
+            if not batch:
+                continue
+            try:
+                results = self._get_model()([img for img, _ in batch], verbose=False)
+            except BaseException as e:
+                self._track(-len(batch))
+                for _, f in batch:
+                    f.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            self._track(-len(batch))
+            for (_, f), res in zip(batch, results):
+                f.set_result(res)
+
+    def close(self) -> None:
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_SENTINEL)
+            self._thread.join(timeout=5)
@@ -0,0 +1,384 @@
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+# ---------- paylaşımlı bellek halkası ----------
+class FrameRing:
+    """
+    Sabit boyutlu slot'lara bölünmüş tek bir SharedMemory bloğu.
+    Ana süreç frame'i boş bir slot'a kopyalar, worker süreci aynı belleği
+    kopyasız NumPy görünümü olarak okur; kuyruktan sadece (slot, shape, dtype)
+    geçer. Slot'lar sonuç gelince serbest bırakılır; boş slot yoksa gönderen
+    bekler (backpressure).
+    """
+
+    def __init__(self, slots: int, slot_bytes: int) -> None:
+        self.slots = max(int(slots), 1)
+        self.slot_bytes = int(slot_bytes)
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slots * self.slot_bytes)
+        self._free = list(range(self.slots))
+        self._cond = threading.Condition()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def fits(self, frame: np.ndarray) -> bool:
+        return frame.nbytes <= self.slot_bytes
+
+    def acquire(self, n: int) -> List[int]:
+        # n slot birden alınır; parça parça alıp birbirini kilitleyen gönderenler olmaz
+        n = min(n, self.slots)
+        with self._cond:
+            while len(self._free) < n:
+                self._cond.wait()
+            taken, self._free = self._free[:n], self._free[n:]
+        return taken
+
+    @property
+    def free(self) -> int:
+        return len(self._free)
+
+    def release(self, slots: List[int]) -> None:
+        with self._cond:
+            self._free.extend(slots)
+            self._cond.notify_all()
+
+    def write(self, slot: int, frame: np.ndarray) -> Tuple[int, Tuple[int, ...], str]:
+        view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+        view[...] = frame
+        del view
+        return slot, frame.shape, frame.dtype.str
+
+    def close(self) -> None:
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# ---------- worker süreci ----------
+def _worker_main(
+    models: Dict[str, str],
+    threads: int,
+    shm_name: str,
+    slot_bytes: int,
+    tasks: "mp.Queue",
+    results: "mp.Queue",
+    loader: Optional[Callable[[str], Any]],
+) -> None:
+    # torch / OpenMP thread sayısı import'tan önce sabitlenmeli
+    if threads > 0:
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            os.environ[var] = str(threads)
+        os.environ["ONNX_THREADS"] = str(threads)
+    cv2.setNumThreads(1)
+
+    from app.services.model_registry import load_model
+
+    if threads > 0:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        loaded: Dict[str, Any] = {}
+        names: Dict[str, Dict[int, str]] = {}
+        for key, path in models.items():
+            model = (loader or load_model)(path)
+            loaded[key] = model
+            try:
+                names[key] = dict(model.model.names)
+            except AttributeError:
+                names[key] = dict(model.names)
+        results.put(("ready", os.getpid(), names))
+
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            task_id, key, frames, kwargs = task
+            # ana süreç bu worker çökerse sadece bu görevi düşürsün
+            results.put(("start", task_id, os.getpid()))
+            try:
+                # slot'lar kopyasız görünüm; inline frame'ler (slot'a sığmayanlar) olduğu gibi
+                images = [
+                    np.ndarray(f[1], dtype=f[2], buffer=shm.buf, offset=f[0] * slot_bytes) if isinstance(f, tuple) else f
+                    for f in frames
+                ]
+                out = loaded[key](images, verbose=False, **kwargs)
+                del images
+                boxes = []
+                for res in out:
+                    data = res.boxes.data
+                    boxes.append(np.asarray(data.cpu().numpy() if hasattr(data, "cpu") else data, dtype=np.float32))
+                # görsel başına preprocess / inference / postprocess ms (metrikler için)
+                speed = dict(getattr(out[0], "speed", None) or {}) if out else {}
+                results.put(("done", task_id, boxes, speed))
+            except Exception as e:
+                results.put(("error", task_id, f"{type(e).__name__}: {e}"))
+    finally:
+        shm.close()
+
+
+# ---------- ana süreç ----------
+class PoolModel:
+    """Havuzdaki bir model için model gibi çağrılabilir tutamaç: `m(frames)` -> [Results]."""
+
+    def __init__(self, pool: "InferencePool", key: str) -> None:
+        self.pool = pool
+        self.key = key
+
+    @property
+    def names(self) -> Dict[int, str]:
+        return self.pool.names(self.key)
+
+    def submit(self, source: Any, **kwargs: Any) -> "Future[List[Any]]":
+        return self.pool.submit(self.key, source, **kwargs)
+
+    def __call__(self, source: Any, **kwargs: Any) -> List[Any]:
+        return self.submit(source, **kwargs).result()
+
+
+class InferencePool:
+    """
+    Her biri modellerin birer kopyasını tutan, thread sayısı sabitlenmiş
+    inference süreçleri. GIL ve tek süreçteki PyTorch thread çekişmesi yüzünden
+    çok çekirdekli sunucuda tek uvicorn worker'ı ölçeklenmiyor; birden fazla
+    uvicorn worker'ı ise modelleri her birine kopyalıyor. Havuz ile web süreci
+    tek kalır, modeller sadece inference süreçlerinde durur.
+
+    Frame'ler FrameRing (multiprocessing.shared_memory) üzerinden geçer; pickle
+    edilen sadece slot numarası ve sonuçtaki (N,6) kutu dizileridir. Boş
+    worker sıradaki görevi alır; batch (video) tek görev olarak tek worker'a gider.
+
+    Halka `depth` görev x `batch` frame'lik yer tutar (varsayılan: worker başına
+    bir batch). Slot boyutu 1080p olduğundan her slot /dev/shm'de ~6 MB'tır;
+    yer kalmazsa gönderen bir görevin sonucu gelene kadar bekler.
+
+    Bir worker çökerse sadece o worker'ın aldığı görev hata ile döner; kuyrukta
+    bekleyen ve diğer worker'larda koşan görevler (ve slot'ları) yerinde kalır.
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, str],
+        processes: int = 2,
+        threads: int = 1,
+        slots: int = 0,
+        slot_bytes: int = 1920 * 1080 * 3,
+        loader: Optional[Callable[[str], Any]] = None,
+        depth: int = 0,
+        batch: int = 8,
+    ) -> None:
+        self.models = dict(models)
+        self.processes = max(int(processes), 1)
+        self.threads = int(threads)
+        # aynı anda halkada duran görev sayısı; video analizi de bu kadar batch'i yolda tutar
+        self.depth = max(int(depth), 0) or self.processes
+        self.slots = slots or self.depth * max(int(batch), 1)
+        self.slot_bytes = int(slot_bytes)
+        self._loader = loader
+
+        self._ctx = mp.get_context("spawn")
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._pending: Dict[int, Tuple[Future, List[np.ndarray], List[int], str]] = {}
+        self._running: Dict[int, int] = {}      # worker pid -> üzerinde çalıştığı görev
+        self._names: Dict[str, Dict[int, str]] = {}
+        self._ready = threading.Event()
+        self._started = False
+        self._closed = False
+        self._error: Optional[str] = None
+
+        self.ring: Optional[FrameRing] = None
+        self._procs: List[Any] = []
+        self._collector: Optional[threading.Thread] = None
+
+    # ---------- yaşam döngüsü ----------
+    def start(self) -> "InferencePool":
+        with self._lock:
+            if self._started:
+                return self
+            if self._closed:
+                raise RuntimeError("Inference havuzu kapatıldı")
+            self.ring = FrameRing(self.slots, self.slot_bytes)
+            self._tasks = self._ctx.Queue()
+            self._results = self._ctx.Queue()
+            for _ in range(self.processes):
+                self._spawn()
+            self._collector = threading.Thread(target=self._collect_loop, name="inference-pool", daemon=True)
+            self._collector.start()
+            self._started = True
+        print(
+            f"[InferencePool] {self.processes} süreç x {self.threads} thread, "
+            f"{self.slots} slot ({self.slots * self.slot_bytes / 1024 ** 2:.0f} MB) başlatıldı"
+        )
+        return self
+
+    def _spawn(self) -> None:
+        p = self._ctx.Process(
+            target=_worker_main,
+            args=(self.models, self.threads, self.ring.name, self.slot_bytes, self._tasks, self._results, self._loader),
+            name="inference-worker",
+            daemon=True,
+        )
+        p.start()
+        self._procs.append(p)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        self.start()
+        return self._ready.wait(timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._started
+        if not started:
+            return
+        for _ in self._procs:
+            self._tasks.put(None)
+        for p in self._procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self._results.put(None)
+        self._collector.join(timeout=5)
+        self._fail_pending(RuntimeError("Inference havuzu kapatıldı"))
+        self.ring.close()
+
+    # ---------- API ----------
+    @property
+    def pending(self) -> int:
+        """Worker'lara gönderilmiş, sonucu henüz gelmemiş görev sayısı."""
+        return len(self._pending)
+
+    def model(self, key: str) -> PoolModel:
+        return PoolModel(self, key)
+
+    def names(self, key: str) -> Dict[int, str]:
+        self.start()
+        while not self._ready.wait(0.5):
+            if self._error is not None:
+                raise RuntimeError(self._error)
+        return self._names[key]
+
+    def submit(self, key: str, source: Any, **kwargs: Any) -> "Future[List[Any]]":
+        self.start()
+        if self._error is not None:
+            raise RuntimeError(self._error)
+        kwargs.pop("verbose", None)   # worker'lar her zaman sessiz
+        items = source if isinstance(source, (list, tuple)) else [source]
+        frames = []
+        for item in items:
+            if isinstance(item, str):
+                # decode çağıranın thread'inde; overlay için orijinal dizi burada kalır
+                img = cv2.imread(item)
+                if img is None:
+                    raise RuntimeError(f"Görsel okunamadı: {item}")
+                item = img
+            frames.append(np.ascontiguousarray(item))
+
+        shared = [i for i, f in enumerate(frames) if self.ring.fits(f)]
+        slots = self.ring.acquire(len(shared)) if shared else []
+        # halka batch'ten küçükse sığmayan kısım pickle ile gider
+        payload: List[Any] = list(frames)
+        for i, slot in zip(shared, slots):
+            payload[i] = self.ring.write(slot, frames[i])
+
+        future: "Future[List[Any]]" = Future()
+        future.set_running_or_notify_cancel()
+        task_id = next(self._ids)
+        with self._lock:
+            self._pending[task_id] = (future, frames, slots, key)
+        self._tasks.put((task_id, key, payload, kwargs))
+        return future
+
+    # ---------- sonuç toplama ----------
+    def _collect_loop(self) -> None:
+        from ultralytics.engine.results import Results
+
+        while True:
+            try:
+                msg = self._results.get(timeout=1.0)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            if msg is None:
+                return
+            kind = msg[0]
+            if kind == "ready":
+                self._names = msg[2]
+                self._ready.set()
+                continue
+            if kind == "start":
+                with self._lock:
+                    self._running[msg[2]] = msg[1]
+                continue
+            with self._lock:
+                entry = self._pending.pop(msg[1], None)
+            if entry is None:
+                continue
+            future, frames, slots, key = entry
+            if slots:
+                self.ring.release(slots)
+            if kind == "error":
+                future.set_exception(RuntimeError(msg[2]))
+                continue
+            names = self._names.get(key, {})
+            out = [Results(f, path="", names=names, boxes=b) for f, b in zip(frames, msg[2])]
+            for r in out:
+                r.speed = msg[3]
+            future.set_result(out)
+
+    def _check_workers(self) -> None:
+        dead = [p for p in self._procs if not p.is_alive()]
+        if not dead or self._closed:
+            return
+        # çöken süreç hangi görevi aldıysa o kayboldu; diğerleri sağlam worker'larda
+        # koşmaya / kuyrukta beklemeye devam eder, slot'ları hâlâ okunuyor olabilir
+        error = RuntimeError("Inference süreci beklenmedik şekilde durdu")
+        for p in dead:
+            with self._lock:
+                task_id = self._running.pop(p.pid, None)
+                entry = self._pending.pop(task_id, None) if task_id is not None else None
+            if entry is not None:
+                future, _, slots, _ = entry
+                if slots:
+                    self.ring.release(slots)
+                future.set_exception(error)
+        if not self._ready.is_set():
+            # hiçbir worker modeli yükleyemedi: bekleyen görevleri alacak kimse yok
+            self._fail_pending(error)
+            # model hiç yüklenemediyse yeniden denemek aynı hatayı verir
+            self._error = "Inference süreci model yüklerken durdu"
+            print("[InferencePool]", self._error)
+            self._procs = [p for p in self._procs if p.is_alive()]
+            return
+        print(f"[InferencePool] {len(dead)} worker süreci durdu, yeniden başlatılıyor")
+        for p in dead:
+            self._procs.remove(p)
+            self._spawn()
+
+    def _fail_pending(self, error: Exception) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, _, slots, _ in pending.values():
+            if slots:
+                self.ring.release(slots)
+            future.set_exception(error)
@@ -0,0 +1,134 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.models.job_model import VideoJob
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+class AnalysisCancelled(RuntimeError):
+    """İş fonksiyonu `should_cancel()` True görünce bunu fırlatır; iş "cancelled" biter."""
+
+
+# fn(progress, should_cancel) -> summary
+JobFn = Callable[[Callable[[int, int], None], Callable[[], bool]], Dict[str, Any]]
+
+
+class JobService:
+    """
+    Uzun süren video analizlerini arka planda çalıştıran iş kuyruğu.
+    Sabit sayıda worker thread'i vardır; bekleyen + çalışan iş sayısı
+    `max_pending` ile sınırlanır, böylece yükleme patlamaları belleği tüketemez.
+    İşe verilen `upload_path` (yüklenen video) iş nasıl biterse bitsin silinir.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8, keep_finished: int = 100) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="video-job")
+        self._max_pending = max_pending
+        self._keep_finished = keep_finished
+
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, VideoJob]" = OrderedDict()
+        self._cancel: Dict[str, threading.Event] = {}
+        self._uploads: Dict[str, str] = {}
+
+    def _active_count(self) -> int:
+        return sum(1 for j in self._jobs.values() if j.status in ("queued", "running"))
+
+    def _evict_finished(self) -> None:
+        finished = [jid for jid, j in self._jobs.items() if jid not in self._cancel]
+        for jid in finished[: max(0, len(finished) - self._keep_finished)]:
+            del self._jobs[jid]
+
+    def submit(
+        self,
+        fn: JobFn,
+        site_id: int,
+        inspector: str,
+        notes: Optional[str],
+        file_name: Optional[str],
+        upload_path: Optional[str] = None,
+    ) -> VideoJob:
+        with self._lock:
+            if self._active_count() >= self._max_pending:
+                raise JobQueueFull("Çok fazla bekleyen video analizi var, lütfen sonra tekrar deneyin.")
+
+            job = VideoJob(
+                id=uuid.uuid4().hex,
+                site_id=site_id,
+                inspector=inspector,
+                notes=notes or None,
+                file_name=file_name,
+            )
+            self._jobs[job.id] = job
+            self._cancel[job.id] = threading.Event()
+            if upload_path:
+                self._uploads[job.id] = upload_path
+
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: VideoJob, fn: JobFn) -> None:
+        cancel = self._cancel[job.id]
+        if cancel.is_set():
+            self._finish(job, "cancelled")
+            return
+
+        job.status = "running"
+
+        def progress(done: int, total: int) -> None:
+            job.frames_done = done
+            job.frames_total = total
+
+        try:
+            job.summary = fn(progress, cancel.is_set)
+        except AnalysisCancelled:
+            self._finish(job, "cancelled")
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, "failed")
+        else:
+            # fn dönerken gelen iptal de iptaldir
+            self._finish(job, "cancelled" if cancel.is_set() else "done")
+
+    def _finish(self, job: VideoJob, status: str) -> None:
+        with self._lock:
+            job.status = status
+            self._cancel.pop(job.id, None)
+            upload = self._uploads.pop(job.id, None)
+            self._evict_finished()
+        if upload is not None:
+            try:
+                os.remove(upload)
+            except OSError:
+                pass
+
+    def counts(self) -> Dict[str, int]:
+        """Durum başına iş sayısı (queued / running / done / failed / cancelled)."""
+        with self._lock:
+            statuses = [j.status for j in self._jobs.values()]
+        return {s: statuses.count(s) for s in ("queued", "running", "done", "failed", "cancelled")}
+
+    def get_job(self, job_id: str) -> Optional[VideoJob]:
+        return self._jobs.get(job_id)
+
+    def cancel_job(self, job_id: str) -> bool:
+        """Kuyruktaki veya çalışan işi iptal eder. İş zaten bittiyse False döner."""
+        with self._lock:
+            event = self._cancel.get(job_id)
+            if event is None:
+                return False
+            event.set()
+            return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for event in self._cancel.values():
+                event.set()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+def load_yolo(path: str) -> Any:
+    # ultralytics (ve torch) importu pahalı; sadece ilk model yüklenirken yapılır
+    from ultralytics import YOLO
+
+    from app.core.tuning import apply_torch_threads
+
+    apply_torch_threads()
+    return YOLO(path)
+
+
+def load_onnx(path: str) -> Any:
+    # .pt bir kez ONNX'e export edilir (cache'lenir), sonra ONNX Runtime ile koşar
+    from app.core.config import settings
+    from app.services.onnx_backend import OnnxYOLO, export_onnx
+
+    onnx_path = path if path.endswith(".onnx") else export_onnx(path, settings.ONNX_CACHE_DIR, settings.ONNX_IMGSZ)
+    providers = [p.strip() for p in settings.ONNX_PROVIDERS.split(",") if p.strip()]
+    return OnnxYOLO(onnx_path, providers=providers, intra_op_threads=settings.ONNX_THREADS)
+
+
+def load_model(path: str) -> Any:
+    """settings.INFERENCE_BACKEND'e göre torch veya ONNX Runtime modeli (.onnx her zaman ONNX Runtime)."""
+    from app.core.config import settings
+
+    if settings.INFERENCE_BACKEND == "onnx" or path.endswith(".onnx"):
+        return load_onnx(path)
+    return load_yolo(path)
+
+
+class ModelRegistry:
+    """
+    Ağırlık dosyası başına tek model örneği tutan, modelleri ilk kullanımda
+    yükleyen kayıt. Aynı best.pt'yi kullanan tüm servisler aynı nesneyi paylaşır.
+    İsteğe bağlı olarak modeller arka planda önceden yüklenebilir ve seyrek
+    kullanılan modeller belirli bir süre boşta kalınca bellekten atılır.
+    """
+
+    def __init__(self, loader: Callable[[str], Any] = load_model, reap_interval: float = 30.0) -> None:
+        self._loader = loader
+        self._reap_interval = reap_interval
+
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._call_locks: Dict[str, threading.Lock] = {}
+        self._models: Dict[str, Any] = {}
+        self._last_used: Dict[str, float] = {}
+        self._idle_timeouts: Dict[str, float] = {}
+        self._reaper: Optional[threading.Thread] = None
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def key(path: str) -> str:
+        # "yolov8n.pt" gibi ultralytics'in indireceği isimler olduğu gibi kalır
+        return os.path.abspath(path) if os.path.exists(path) else path
+
+    def _path_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._path_locks.setdefault(key, threading.Lock())
+
+    def call_lock(self, path: str) -> threading.Lock:
+        """
+        Model başına çağrı kilidi. ultralytics her çağrıda argümanları paylaşılan
+        `predictor.args`'a yazar; aynı model nesnesini kullanan herkes (broker,
+        video işleri, stream izleme) bu kilitle sırayla çağırmalı.
+        """
+        key = self.key(path)
+        with self._lock:
+            return self._call_locks.setdefault(key, threading.Lock())
+
+    def get(self, path: str) -> Any:
+        key = self.key(path)
+        model = self._models.get(key)
+        if model is None:
+            with self._path_lock(key):
+                model = self._models.get(key)
+                if model is None:
+                    print("[ModelRegistry] Model yükleniyor:", key)
+                    model = self._loader(key)
+                    self._models[key] = model
+        self._last_used[key] = time.monotonic()
+        return model
+
+    def loaded(self) -> Dict[str, Any]:
+        """Şu an bellekte olan modeller (anahtar -> model)."""
+        return dict(self._models)
+
+    def is_loaded(self, path: str) -> bool:
+        return self.key(path) in self._models
+
+    def unload(self, path: str) -> bool:
+        key = self.key(path)
+        with self._path_lock(key):
+            model = self._models.pop(key, None)
+        if model is not None:
+            print("[ModelRegistry] Model bellekten atıldı:", key)
+        return model is not None
+
+    def warmup(self, paths: Iterable[str], background: bool = True) -> Optional[threading.Thread]:
+        """Modelleri önceden yükler; background=True ise istekleri bekletmeden ayrı thread'de."""
+        paths = list(paths)
+
+        def run() -> None:
+            for p in paths:
+                if self._stop.is_set():
+                    return
+                try:
+                    self.get(p)
+                except Exception as e:  # ısınma hatası ilk gerçek istekte tekrar denenir
+                    print("[ModelRegistry] Ön yükleme başarısız:", p, e)
+
+        if not background:
+            run()
+            return None
+        t = threading.Thread(target=run, name="model-warmup", daemon=True)
+        self._warmup_thread = t
+        t.start()
+        return t
+
+    # ---------- boşta kalan modeller ----------
+    def set_idle_timeout(self, path: str, seconds: Optional[float]) -> None:
+        """`seconds` boyunca kullanılmayan model bellekten atılır (None/0 = hiç)."""
+        key = self.key(path)
+        with self._lock:
+            if seconds:
+                self._idle_timeouts[key] = seconds
+            else:
+                self._idle_timeouts.pop(key, None)
+            if self._idle_timeouts and self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop, name="model-reaper", daemon=True)
+                self._reaper.start()
+
+    def reap_idle(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            timeouts = dict(self._idle_timeouts)
+        for key, timeout in timeouts.items():
+            if key in self._models and now - self._last_used.get(key, now) > timeout:
+                self.unload(key)
+
+    def _reap_loop(self) -> None:
+        while not self._stop.wait(self._reap_interval):
+            self.reap_idle()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Ön yükleme ve reaper thread'lerini durdurup bekler. Süreç, torch yüklemenin
+        ortasındaki bir daemon thread'le kapanırsa "terminate called without an
+        active exception" ile çöker; o an yüklenen model bitene kadar beklenir.
+        """
+        self._stop.set()
+        for t in (self._warmup_thread, self._reaper):
+            if t is not None and t is not threading.current_thread():
+                t.join(timeout)
+
+
+registry = ModelRegistry()
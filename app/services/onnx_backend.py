@@ -0,0 +1,205 @@
+import ast
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from app.services.result_cache import file_sha256
+
+
+def export_onnx(weights_path: str, cache_dir: str, imgsz: int = 640) -> str:
+    """
+    .pt ağırlıklarını bir kez ONNX'e çevirir ve cache'ler.
+    Dosya adı ağırlık içeriğinin hash'ini içerdiği için best.pt değişince yeniden export edilir.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(weights_path))[0]
+    digest = file_sha256(weights_path)[:16] if os.path.isfile(weights_path) else "hub"
+    target = os.path.join(cache_dir, f"{stem}-{digest}-{imgsz}.onnx")
+    if os.path.exists(target):
+        return target
+
+    from ultralytics import YOLO
+
+    print("[ONNX] Export ediliyor:", weights_path)
+    exported = YOLO(weights_path).export(format="onnx", imgsz=imgsz, dynamic=True)
+    shutil.move(exported, target)
+    return target
+
+
+def letterbox(
+    image: np.ndarray,
+    size: int,
+    stride: int = 32,
+    auto: bool = False,
+) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """
+    En-boy oranını koruyarak `size`x`size`'a sığdırır, kenarları 114 gri ile doldurur.
+    auto=True: kare yerine `stride`'ın katı olan en küçük dikdörtgene (ultralytics ile aynı).
+    """
+    h, w = image.shape[:2]
+    r = min(size / h, size / w)
+    nh, nw = int(round(h * r)), int(round(w * r))
+    if (nh, nw) != (h, w):
+        image = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    dh, dw = float(size - nh), float(size - nw)
+    if auto:
+        dh, dw = dh % stride, dw % stride
+    dh, dw = dh / 2.0, dw / 2.0
+    top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+    left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+    return image, r, (left, top)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy NMS; her turda kalan kutularla IoU vektörel hesaplanır."""
+    order = scores.argsort()[::-1]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def postprocess(
+    pred: np.ndarray,
+    conf: float = 0.25,
+    iou: float = 0.7,
+    max_det: int = 300,
+    max_wh: float = 7680.0,
+) -> np.ndarray:
+    """
+    YOLOv8 ham çıktısı (4+nc, anchors) -> (N, 6) [x1, y1, x2, y2, conf, cls].
+    Sınıf bazlı NMS için kutular sınıf id'si * max_wh kadar kaydırılır.
+    """
+    pred = pred.T                                   # (anchors, 4+nc)
+    scores_all = pred[:, 4:]
+    cls = scores_all.argmax(axis=1)
+    scores = scores_all[np.arange(len(cls)), cls]
+    mask = scores > conf
+    if not mask.any():
+        return np.zeros((0, 6), dtype=np.float32)
+
+    xywh, scores, cls = pred[mask, :4], scores[mask], cls[mask]
+    xyxy = np.empty_like(xywh)
+    xyxy[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+    xyxy[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+
+    keep = nms(xyxy + (cls * max_wh)[:, None], scores, iou)[:max_det]
+    return np.hstack([xyxy[keep], scores[keep, None], cls[keep, None].astype(np.float32)]).astype(np.float32)
+
+
+class OnnxYOLO:
+    """
+    ONNX Runtime ile CPU inference; ultralytics.YOLO ile aynı çağrı arayüzü.
+    `model(source)` -> Results listesi (boxes.data, plot() aynı şekilde kullanılır),
+    bu yüzden YoloPPEService'in geri kalanı backend'den habersizdir.
+    """
+
+    def __init__(
+        self,
+        onnx_path: str,
+        providers: Optional[Sequence[str]] = None,
+        intra_op_threads: int = 0,
+    ) -> None:
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            opts.intra_op_num_threads = intra_op_threads
+
+        available = ort.get_available_providers()
+        providers = [p for p in (providers or ["CPUExecutionProvider"]) if p in available] or ["CPUExecutionProvider"]
+        self.session = ort.InferenceSession(onnx_path, sess_options=opts, providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+        self.onnx_path = onnx_path
+
+        meta = self.session.get_modelmeta().custom_metadata_map
+        self.names: Dict[int, str] = ast.literal_eval(meta["names"]) if "names" in meta else {}
+        imgsz = ast.literal_eval(meta.get("imgsz", "[640, 640]"))
+        self.imgsz = int(imgsz[0] if isinstance(imgsz, (list, tuple)) else imgsz)
+        self.stride = int(meta.get("stride", "32"))
+        # dynamic=True ile export edilen modeller kare olmayan girdi kabul eder
+        self.dynamic = not all(isinstance(d, int) for d in self.session.get_inputs()[0].shape[2:])
+
+    @staticmethod
+    def _load(item: Union[str, np.ndarray]) -> Tuple[np.ndarray, str]:
+        if isinstance(item, str):
+            img = cv2.imread(item)
+            if img is None:
+                raise RuntimeError(f"Görsel okunamadı: {item}")
+            return img, item
+        return item, "image0.jpg"
+
+    def preprocess(
+        self, images: List[np.ndarray], imgsz: Optional[int] = None
+    ) -> Tuple[np.ndarray, List[Tuple[float, Tuple[float, float]]]]:
+        # batch'teki tüm görseller aynı boyuttaysa dikdörtgen letterbox (daha az piksel)
+        auto = self.dynamic and len({img.shape for img in images}) == 1
+        # farklı giriş boyutu sadece dynamic export'ta mümkün
+        size = imgsz if imgsz and self.dynamic else self.imgsz
+        batch = None
+        meta = []
+        for i, img in enumerate(images):
+            boxed, r, pad = letterbox(img, size, self.stride, auto)
+            if batch is None:
+                batch = np.empty((len(images), 3) + boxed.shape[:2], dtype=np.float32)
+            # BGR HWC uint8 -> RGB CHW float [0, 1]
+            batch[i] = boxed[:, :, ::-1].transpose(2, 0, 1) * (1.0 / 255.0)
+            meta.append((r, pad))
+        return batch, meta
+
+    def __call__(
+        self,
+        source: Any,
+        conf: float = 0.25,
+        iou: float = 0.7,
+        max_det: int = 300,
+        imgsz: Optional[int] = None,
+        **_: Any,
+    ) -> List[Any]:
+        from ultralytics.engine.results import Results
+
+        t0 = time.perf_counter()
+        items = source if isinstance(source, (list, tuple)) else [source]
+        loaded = [self._load(it) for it in items]
+        images = [img for img, _ in loaded]
+
+        batch, meta = self.preprocess(images, imgsz)
+        t1 = time.perf_counter()
+        preds = self.session.run(None, {self.input_name: batch})[0]
+        t2 = time.perf_counter()
+
+        results = []
+        for (img, path), pred, (r, (px, py)) in zip(loaded, preds, meta):
+            det = postprocess(pred, conf=conf, iou=iou, max_det=max_det)
+            if len(det):
+                # letterbox koordinatlarından orijinal görüntüye
+                det[:, [0, 2]] = ((det[:, [0, 2]] - px) / r).clip(0, img.shape[1])
+                det[:, [1, 3]] = ((det[:, [1, 3]] - py) / r).clip(0, img.shape[0])
+            results.append(Results(img, path=path, names=self.names, boxes=det))
+
+        # ultralytics ile aynı: görsel başına ortalama ms, batch'teki tüm sonuçlarda aynı nesne
+        n = len(results) or 1
+        speed = {
+            "preprocess": (t1 - t0) * 1000.0 / n,
+            "inference": (t2 - t1) * 1000.0 / n,
+            "postprocess": (time.perf_counter() - t2) * 1000.0 / n,
+        }
+        for res in results:
+            res.speed = speed
+        return results
@@ -0,0 +1,136 @@
+import glob
+import os
+from typing import Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+from app.services.onnx_backend import export_onnx, letterbox
+
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def list_images(folder: str, limit: Optional[int] = None) -> List[str]:
+    paths = sorted(
+        p for p in glob.glob(os.path.join(folder, "**", "*"), recursive=True)
+        if p.lower().endswith(IMAGE_EXTS)
+    )
+    return paths[:limit] if limit else paths
+
+
+class ImageFolderReader:
+    """
+    onnxruntime CalibrationDataReader arayüzü: klasördeki görselleri inference ile
+    aynı letterbox ön işlemesinden geçirip tek tek verir (kare girdi, batch=1).
+    """
+
+    def __init__(self, folder: str, input_name: str, imgsz: int = 640, limit: int = 100) -> None:
+        self.paths = list_images(folder, limit)
+        if not self.paths:
+            raise RuntimeError(f"Kalibrasyon klasöründe görsel yok: {folder}")
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._it: Optional[Iterator[str]] = None
+
+    def _tensor(self, path: str) -> Optional[np.ndarray]:
+        img = cv2.imread(path)
+        if img is None:
+            return None
+        boxed, _, _ = letterbox(img, self.imgsz)
+        return (boxed[:, :, ::-1].transpose(2, 0, 1)[None] * (1.0 / 255.0)).astype(np.float32)
+
+    def get_next(self) -> Optional[dict]:
+        if self._it is None:
+            self._it = iter(self.paths)
+        for path in self._it:
+            tensor = self._tensor(path)
+            if tensor is not None:
+                return {self.input_name: tensor}
+        return None
+
+    def rewind(self) -> None:
+        self._it = None
+
+
+def quantize_onnx(
+    fp32_path: str,
+    mode: str = "dynamic",
+    calib_dir: Optional[str] = None,
+    calib_images: int = 100,
+    imgsz: int = 640,
+) -> str:
+    """
+    FP32 ONNX modelinden INT8 varyantı üretir (varsa cache'ten döner).
+
+    - "dynamic": sadece ağırlıklar INT8, aktivasyon ölçekleri çalışma anında;
+      kalibrasyon gerekmez.
+    - "static": ağırlık + aktivasyon INT8 (QDQ), ölçekler `calib_dir`
+      görselleriyle MinMax kalibrasyonundan.
+    """
+    if mode not in ("dynamic", "static"):
+        raise ValueError(f"Bilinmeyen quantization modu: {mode}")
+    target = fp32_path[: -len(".onnx")] + f"-int8-{mode}.onnx"
+    if os.path.exists(target):
+        return target
+
+    from onnxruntime.quantization import (
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quant_pre_process,
+        quantize_dynamic,
+        quantize_static,
+    )
+
+    print(f"[Quantization] INT8 ({mode}) üretiliyor:", fp32_path)
+    prepped = target + ".prep.onnx"
+    tmp = target + ".tmp"
+    try:
+        quant_pre_process(fp32_path, prepped, skip_symbolic_shape=True)
+        if mode == "dynamic":
+            quantize_dynamic(prepped, tmp, weight_type=QuantType.QUInt8, op_types_to_quantize=["Conv"])
+        else:
+            if not calib_dir:
+                raise ValueError("static quantization için kalibrasyon klasörü gerekli")
+            import onnx
+
+            input_name = onnx.load(prepped, load_external_data=False).graph.input[0].name
+            reader = ImageFolderReader(calib_dir, input_name, imgsz, calib_images)
+            quantize_static(
+                prepped,
+                tmp,
+                reader,
+                quant_format=QuantFormat.QDQ,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+                per_channel=True,
+                calibrate_method=CalibrationMethod.MinMax,
+                op_types_to_quantize=["Conv", "Mul", "Add"],
+            )
+        os.replace(tmp, target)
+    finally:
+        for p in (prepped, tmp):
+            if os.path.exists(p):
+                os.remove(p)
+    return target
+
+
+def precision_variant(
+    weights_path: str,
+    precision: str,
+    cache_dir: str,
+    imgsz: int = 640,
+    calib_dir: Optional[str] = None,
+    calib_images: int = 100,
+) -> str:
+    """
+    "fp32" -> ağırlık dosyasının kendisi; "int8-dynamic" / "int8-static" -> .pt'nin
+    ONNX export'undan üretilmiş INT8 model yolu (ikisi de cache'lenir).
+    """
+    if precision == "fp32":
+        return weights_path
+    if not precision.startswith("int8-"):
+        raise ValueError(f"Bilinmeyen model hassasiyeti: {precision}")
+    fp32_path = weights_path if weights_path.endswith(".onnx") else export_onnx(weights_path, cache_dir, imgsz)
+    return quantize_onnx(fp32_path, precision[len("int8-"):], calib_dir, calib_images, imgsz)
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from app.services.artifact_store import ArtifactStore
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def weights_identity(path: str) -> str:
+    """Model ağırlık dosyasının içerik hash'i; dosya yoksa (ör. indirilecek isim) adın kendisi."""
+    if os.path.isfile(path):
+        return file_sha256(path)
+    return hashlib.sha256(path.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Yükleme içeriğinin hash'i + model ağırlık kimliğiyle anahtarlanan tespit sonucu cache'i.
+
+    - Bellek katmanı: son `max_memory_entries` sonuç (LRU).
+    - Disk katmanı: `cache_dir` altında anahtar başına bir JSON dosyası.
+      Toplam boyut (JSON + sonuçtaki overlay dosyaları) `max_bytes`'ı aşınca
+      en eski kullanılan kayıtlar silinir.
+    Overlay isimleri içerik adreslidir; aynı dosyayı birden fazla kayıt (ve
+    denetimler) gösterebilir. Kayıt giderken dosyası sadece başka bir cache
+    kaydı kullanmıyorsa silinir; `store` verilmişse ArtifactStore.discard ile,
+    yani kalıcı bir kaydın pin'lediği dosyaya dokunulmaz.
+    Overlay'i depo kotası yüzünden silinmiş kayıt okunurken geçersiz sayılır.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        overlay_dir: str,
+        max_memory_entries: int = 256,
+        max_bytes: int = 2 * 1024 ** 3,
+        store: Optional["ArtifactStore"] = None,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.overlay_dir = overlay_dir
+        self.store = store
+        self.max_memory_entries = max_memory_entries
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # disk indeksi: key -> kayıt boyutu (byte), LRU sırasında
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._names: Dict[str, List[str]] = {}   # key -> kaydın gösterdiği dosyalar
+        self._refs: Dict[str, int] = {}          # dosya -> onu gösteren kayıt sayısı
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        self._load_index()
+
+    # ---------- anahtar ----------
+    @staticmethod
+    def make_key(content_hash: str, kind: str, *parts: Any) -> str:
+        raw = "|".join([content_hash, kind] + [str(p) for p in parts])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ---------- disk yardımcıları ----------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    @staticmethod
+    def _overlays(value: Dict[str, Any]) -> Iterable[str]:
+        """Sonuç içindeki overlay dosya adlarını (iç içe dict'lerde de) bulur."""
+        for k, v in value.items():
+            if isinstance(v, dict):
+                yield from ResultCache._overlays(v)
+            elif k in ("overlay_image", "video_overlay", "thumbnail") and v:
+                yield v
+            elif k == "video_segments" and v:
+                yield from v
+
+    def _entry_size(self, key: str, value: Dict[str, Any]) -> int:
+        size = os.path.getsize(self._path(key))
+        for name in self._overlays(value):
+            p = os.path.join(self.overlay_dir, name)
+            if os.path.exists(p):
+                size += os.path.getsize(p)
+        return size
+
+    def _load_index(self) -> None:
+        entries = []
+        for sub in os.listdir(self.cache_dir):
+            sub_dir = os.path.join(self.cache_dir, sub)
+            if not os.path.isdir(sub_dir):
+                continue
+            for fname in os.listdir(sub_dir):
+                if not fname.endswith(".json"):
+                    continue
+                key = fname[:-5]
+                try:
+                    with open(os.path.join(sub_dir, fname), "r", encoding="utf-8") as f:
+                        value = json.load(f)
+                    mtime = os.path.getmtime(os.path.join(sub_dir, fname))
+                    entries.append((mtime, key, self._entry_size(key, value), list(self._overlays(value))))
+                except (OSError, ValueError):
+                    continue
+
+        for _, key, size, names in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+            self._link(key, names)
+        self._evict_disk()
+
+    def _link(self, key: str, names: List[str]) -> None:
+        self._names[key] = names
+        for name in names:
+            self._refs[name] = self._refs.get(name, 0) + 1
+
+    def _unlink(self, key: str) -> List[str]:
+        """Kaydın dosya referanslarını bırakır; artık hiçbir kaydın göstermediği dosyalar."""
+        orphans = []
+        for name in self._names.pop(key, ()):
+            left = self._refs.get(name, 0) - 1
+            if left > 0:
+                self._refs[name] = left
+            else:
+                self._refs.pop(name, None)
+                orphans.append(name)
+        return orphans
+
+    def _delete_files(self, names: Iterable[str]) -> None:
+        for name in names:
+            if name in self._refs:
+                continue    # aynı anahtara yazılan yeni sonuç da kullanıyor
+            if self.store is not None:
+                self.store.discard(name)
+            else:
+                try:
+                    os.remove(os.path.join(self.overlay_dir, name))
+                except OSError:
+                    pass
+
+    def _remove_disk(self, key: str) -> None:
+        size = self._disk.pop(key, 0)
+        self._disk_bytes -= size
+        self._delete_files(self._unlink(key))
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict_disk(self, keep: Optional[str] = None) -> None:
+        while self._disk and self._disk_bytes > self.max_bytes:
+            key = next(iter(self._disk))
+            if key == keep:
+                # az önce eklenen sonucun overlay'leri henüz gösterilecek
+                break
+            self._memory.pop(key, None)
+            self._remove_disk(key)
+            self.evictions += 1
+
+    def _overlays_exist(self, value: Dict[str, Any]) -> bool:
+        return all(os.path.exists(os.path.join(self.overlay_dir, n)) for n in self._overlays(value))
+
+    # ---------- API ----------
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None and self._overlays_exist(value):
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return value
+
+            if key in self._disk:
+                path = self._path(key)
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        value = json.load(f)
+                except (OSError, ValueError):
+                    value = None
+
+                if value is not None and self._overlays_exist(value):
+                    os.utime(path)
+                    self._disk.move_to_end(key)
+                    self._remember(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+                # overlay silinmiş / bozuk kayıt -> geçersiz
+                self._memory.pop(key, None)
+                self._remove_disk(key)
+
+            self.misses += 1
+            return None
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+        with self._lock:
+            orphans: List[str] = []
+            if key in self._disk:
+                self._disk_bytes -= self._disk.pop(key)
+                orphans = self._unlink(key)
+            size = self._entry_size(key, value)
+            self._disk[key] = size
+            self._disk_bytes += size
+            self._link(key, list(self._overlays(value)))
+            self._delete_files(orphans)
+            self._remember(key, value)
+            self._evict_disk(keep=key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
@@ -1,15 +1,73 @@
-from typing import List
+import threading
+from typing import Any, Dict, Iterable, List, Optional
 from app.models.inspection_model import SafetyInspection
 from app.models.site_model import Site
+from app.storage import MemoryStorage, StorageBackend
 
 
-class SafetyService:
+RISK_WEIGHTS = {"low": 1, "medium": 2, "high": 3}
+
+
+class _RiskAggregate:
+    __slots__ = ("total", "low", "medium", "high", "score_sum")
+
     def __init__(self) -> None:
-        self._inspections: List[SafetyInspection] = []
-        self._next_id: int = 1
+        self.total = 0
+        self.low = 0
+        self.medium = 0
+        self.high = 0
+        self.score_sum = 0
+
+    def add(self, risk_level: str, n: int = 1) -> None:
+        self.total += n
+        if risk_level in RISK_WEIGHTS:
+            setattr(self, risk_level, getattr(self, risk_level) + n)
+        self.score_sum += RISK_WEIGHTS.get(risk_level, 0) * n
 
-    def list_inspections(self) -> List[SafetyInspection]:
-        return self._inspections
+
+class SafetyService:
+    """
+    Denetim kayıtları + risk özetleri.
+    Genel ve şantiye bazlı risk sayaçları bellekte tutulur; açılışta storage'dan
+    bir kez kurulur, sonra her yeni denetimde O(1) güncellenir. (Aynı veritabanına
+    yazan başka süreçlerin kayıtları yeniden başlatılana kadar sayaçlara yansımaz.)
+    `version` her yazmada artar; render edilmiş parçaların cache'i buna bakar.
+    """
+
+    def __init__(self, storage: Optional[StorageBackend] = None) -> None:
+        self._storage = storage if storage is not None else MemoryStorage()
+
+        self._agg_lock = threading.Lock()
+        self._global = _RiskAggregate()
+        self._by_site: Dict[int, _RiskAggregate] = {}
+        self.version = 0
+        self._load_aggregates()
+
+    def list_inspections(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        site_id: Optional[int] = None,
+        risk_level: Optional[str] = None,
+        before_id: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[SafetyInspection]:
+        return self._storage.list_inspections(
+            limit=limit,
+            offset=offset,
+            after_id=after_id,
+            site_id=site_id,
+            risk_level=risk_level,
+            before_id=before_id,
+            descending=descending,
+        )
+
+    def count_inspections(self, site_id: Optional[int] = None, risk_level: Optional[str] = None) -> int:
+        return self._storage.count_inspections(site_id=site_id, risk_level=risk_level)
+
+    def get_inspection(self, inspection_id: int) -> Optional[SafetyInspection]:
+        return self._storage.get_inspection(inspection_id)
 
     def create_inspection(
         self,
@@ -19,42 +77,63 @@ class SafetyService:
         notes: str,
         file_name: str,
         detected_ppe: List[str],
+        thumbnail: Optional[str] = None,
     ) -> SafetyInspection:
-        inspection = SafetyInspection(
-            id=self._next_id,
-            site_id=site.id,
-            inspector=inspector,
-            risk_level=risk_level,
-            notes=notes or None,
-            file_name=file_name,
-            detected_ppe=detected_ppe or [],
+        inspection = self._storage.insert_inspection(
+            {
+                "site_id": site.id,
+                "inspector": inspector,
+                "risk_level": risk_level,
+                "notes": notes or None,
+                "file_name": file_name,
+                "detected_ppe": detected_ppe or [],
+                "thumbnail": thumbnail,
+            }
         )
-        self._inspections.append(inspection)
-        self._next_id += 1
+        with self._agg_lock:
+            self._add_to_aggregates(inspection.site_id, inspection.risk_level)
+            self.version += 1
         return inspection
 
+    def bulk_create_inspections(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """site_id, inspector, risk_level, notes, file_name, detected_ppe alanlı kayıtları toplu ekler."""
+        rows = list(rows)
+        n = self._storage.bulk_insert_inspections(rows)
+        with self._agg_lock:
+            for row in rows:
+                self._add_to_aggregates(row["site_id"], row["risk_level"])
+            self.version += 1
+        return n
+
+    # ---------- risk özetleri (artımlı) ----------
+    def _load_aggregates(self) -> None:
+        for (site_id, risk_level), n in self._storage.risk_counts().items():
+            self._add_to_aggregates(site_id, risk_level, n)
+
+    def _add_to_aggregates(self, site_id: int, risk_level: str, n: int = 1) -> None:
+        for agg in (self._global, self._by_site.setdefault(site_id, _RiskAggregate())):
+            agg.add(risk_level, n)
+
     def summarize_risk(self) -> dict:
-        total = len(self._inspections)
-        low = len([i for i in self._inspections if i.risk_level == "low"])
-        med = len([i for i in self._inspections if i.risk_level == "medium"])
-        high = len([i for i in self._inspections if i.risk_level == "high"])
+        agg = self._global
         return {
-            "total": total,
-            "low": low,
-            "medium": med,
-            "high": high,
+            "total": agg.total,
+            "low": agg.low,
+            "medium": agg.medium,
+            "high": agg.high,
         }
+
     def risk_by_site(self, sites: List[Site]) -> List[dict]:
         """
         Her şantiye için ortalama risk puanı ve etiket üretir.
         low=1, medium=2, high=3 ağırlıklarıyla hesaplar.
+        Sayaçlar create_inspection'da güncellenir; şantiye başına O(1).
         """
-        weights = {"low": 1, "medium": 2, "high": 3}
         result = []
 
         for site in sites:
-            site_ins = [i for i in self._inspections if i.site_id == site.id]
-            if not site_ins:
+            agg = self._by_site.get(site.id)
+            if agg is None or agg.total == 0:
                 result.append(
                     {
                         "site_id": site.id,
@@ -69,13 +148,7 @@ class SafetyService:
                 )
                 continue
 
-            total = len(site_ins)
-            low = len([i for i in site_ins if i.risk_level == "low"])
-            med = len([i for i in site_ins if i.risk_level == "medium"])
-            high = len([i for i in site_ins if i.risk_level == "high"])
-
-            total_score = sum(weights.get(i.risk_level, 0) for i in site_ins)
-            avg = total_score / float(total)
+            avg = agg.score_sum / float(agg.total)
 
             if avg < 1.5:
                 label = "Düşük risk"
@@ -88,13 +161,13 @@ class SafetyService:
                 {
                     "site_id": site.id,
                     "site_name": site.name,
-                    "total": total,
-                    "low": low,
-                    "medium": med,
-                    "high": high,
+                    "total": agg.total,
+                    "low": agg.low,
+                    "medium": agg.medium,
+                    "high": agg.high,
                     "score": round(avg, 2),
                     "label": label,
                 }
             )
 
-        return result
\ No newline at end of file
+        return result
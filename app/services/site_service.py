@@ -1,28 +1,44 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from app.models.site_model import Site
+from app.storage import MemoryStorage, StorageBackend
 
 
 class SiteService:
-    def __init__(self) -> None:
-        self._sites: List[Site] = []
-        self._next_id: int = 1
-
-        # örnekseed
-        self.create_site(
-            name="Merkez Şantiye",
-            location="İstanbul / Kağıthane",
-            status="active",
-            supervisor="Murat Demir",
-        )
+    def __init__(self, storage: Optional[StorageBackend] = None) -> None:
+        self._storage = storage if storage is not None else MemoryStorage()
+        self.version = 0   # her yazmada artar (parça cache'i için)
+
+        # örnekseed (kalıcı backend'de sadece ilk açılışta)
+        if self._storage.count_sites() == 0:
+            self.create_site(
+                name="Merkez Şantiye",
+                location="İstanbul / Kağıthane",
+                status="active",
+                supervisor="Murat Demir",
+            )
 
-    def list_sites(self) -> List[Site]:
-        return self._sites
+    def list_sites(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+    ) -> List[Site]:
+        return self._storage.list_sites(limit=limit, offset=offset, after_id=after_id)
+
+    def count_sites(self) -> int:
+        return self._storage.count_sites()
 
     def get_site(self, site_id: int) -> Optional[Site]:
-        for s in self._sites:
-            if s.id == site_id:
-                return s
-        return None
+        return self._storage.get_site(site_id)
+
+    def get_sites(self, site_ids: Iterable[Optional[int]]) -> Dict[int, Site]:
+        """Sayfadaki kayıtların şantiyeleri (tüm listeyi çekmeden)."""
+        out = {}
+        for site_id in set(site_ids):
+            site = self._storage.get_site(site_id) if site_id is not None else None
+            if site is not None:
+                out[site_id] = site
+        return out
 
     def create_site(
         self,
@@ -31,13 +47,13 @@ class SiteService:
         status: str,
         supervisor: Optional[str],
     ) -> Site:
-        site = Site(
-            id=self._next_id,
-            name=name,
-            location=location,
-            status=status,
-            supervisor=supervisor,
+        site = self._storage.insert_site(
+            {
+                "name": name,
+                "location": location,
+                "status": status,
+                "supervisor": supervisor,
+            }
         )
-        self._sites.append(site)
-        self._next_id += 1
+        self.version += 1
         return site
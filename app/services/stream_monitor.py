@@ -0,0 +1,391 @@
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import cv2
+import numpy as np
+
+from app.models.stream_model import CameraStream
+from app.services.tracker import assign_ppe
+
+
+RISK_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+def check_stream_url(url: str, schemes: Iterable[str], hosts: Iterable[str] = ()) -> str:
+    """
+    İstemciden gelen kamera adresini doğrular: şeması `schemes` içinde ve host'u
+    (`hosts` boş değilse) listede olmalı. Yerel dosya, cihaz indeksi ve
+    file:// gibi adresler reddedilir; OpenCV bunları sunucu üzerinde açardı.
+    Geçersizse ValueError.
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    allowed = {s.strip().lower() for s in schemes if s.strip()}
+    if parts.scheme.lower() not in allowed:
+        raise ValueError(f"Desteklenmeyen akış adresi; izin verilen şemalar: {', '.join(sorted(allowed))}")
+    host = (parts.hostname or "").lower()
+    if not host:
+        raise ValueError("Akış adresinde host yok")
+    allowed_hosts = {h.strip().lower() for h in hosts if h.strip()}
+    if allowed_hosts and host not in allowed_hosts:
+        raise ValueError(f"Bu host'tan akış eklenemez: {host}")
+    return url
+
+
+class ComplianceWindow:
+    """
+    Bir şantiyenin son `window_s` saniyesindeki kişi / kasklı / yelekli gözlem
+    toplamları. Toplamlar ekleme ve süresi dolan gözlem çıkarılırken güncellenir.
+    """
+
+    def __init__(self, window_s: float = 60.0) -> None:
+        self.window_s = window_s
+        self._items: Deque[Tuple[float, int, int, int]] = deque()
+        self.persons = 0
+        self.with_helmet = 0
+        self.with_vest = 0
+
+    def add(self, ts: float, persons: int, with_helmet: int, with_vest: int) -> None:
+        self._items.append((ts, persons, with_helmet, with_vest))
+        self.persons += persons
+        self.with_helmet += with_helmet
+        self.with_vest += with_vest
+        self.prune(ts)
+
+    def prune(self, now: float) -> None:
+        while self._items and now - self._items[0][0] > self.window_s:
+            _, p, h, v = self._items.popleft()
+            self.persons -= p
+            self.with_helmet -= h
+            self.with_vest -= v
+
+
+class _Stream:
+    def __init__(self, site_id: int, url: str, name: str, realtime: bool, loop: bool) -> None:
+        self.id = uuid.uuid4().hex
+        self.site_id = site_id
+        self.url = url
+        self.name = name
+        self.status = "starting"
+        self.frames_read = 0
+        self.frames_analyzed = 0
+        self.frames_dropped = 0
+        self.realtime = realtime
+        self.loop = loop
+        self.stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+        # sadece en son frame tutulur; yenisi gelince eskisi düşer
+        self.frame: Optional[np.ndarray] = None
+        self.frame_ts = 0.0
+        self.seq = 0
+        self.taken_seq = 0
+        self.in_flight = False
+        self.last_analyzed = 0.0
+        self.latencies: Deque[float] = deque(maxlen=512)
+
+
+class StreamMonitor:
+    """
+    Şantiye kameralarının (RTSP / cihaz / dosya) sürekli PPE takibi.
+
+    - Her kaynak kendi thread'inde sürekli okunur ve sadece en son frame
+      saklanır; analiz yetişemezse eski frame'ler atılır, gecikme birikmez.
+    - Tüm akışlar tek bir inference worker havuzunu paylaşır. Worker'lar
+      sıradaki akıştan başlayarak (round-robin) her akıştan en fazla bir frame
+      alır ve `batch_size`'a kadar tek model çağrısında işler; böylece hiçbir
+      kamera diğerlerini aç bırakmaz.
+    - Analiz sonuçları şantiye başına kayan uyum penceresine eklenir; pencerenin
+      risk seviyesi `risk_threshold`'a çıktığında SafetyInspection yazılır
+      (şantiye başına en fazla `cooldown_s`'de bir).
+    """
+
+    def __init__(
+        self,
+        yolo_service: Any,
+        site_service: Any,
+        safety_service: Any,
+        workers: int = 1,
+        batch_size: int = 4,
+        max_fps: float = 2.0,
+        window_s: float = 60.0,
+        min_persons: int = 5,
+        risk_threshold: str = "high",
+        cooldown_s: float = 300.0,
+        reconnect_s: float = 5.0,
+        detect: Optional[Callable[[List[np.ndarray]], List[Any]]] = None,
+    ) -> None:
+        self.yolo_service = yolo_service
+        self.site_service = site_service
+        self.safety_service = safety_service
+        self.workers = max(workers, 1)
+        self.batch_size = max(batch_size, 1)
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.window_s = window_s
+        self.min_persons = min_persons
+        if risk_threshold not in RISK_RANK:
+            raise ValueError(f"Geçersiz risk eşiği: {risk_threshold!r} ({', '.join(RISK_RANK)} olmalı)")
+        self.risk_threshold = risk_threshold
+        self.cooldown_s = cooldown_s
+        self.reconnect_s = reconnect_s
+        self._detect = detect or (lambda frames: self.yolo_service.submit_frames(frames, verbose=False).result())
+
+        self._cond = threading.Condition()
+        self._streams: Dict[str, _Stream] = {}
+        self._order: List[str] = []
+        self._rr = 0
+
+        self._windows: Dict[int, ComplianceWindow] = {}
+        self._site_level: Dict[int, Optional[str]] = {}
+        self._last_alert: Dict[int, float] = {}
+
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+
+    # ---------- akış yönetimi ----------
+    def add_stream(
+        self,
+        site_id: int,
+        url: str,
+        name: Optional[str] = None,
+        realtime: Optional[bool] = None,
+        loop: bool = False,
+    ) -> CameraStream:
+        """
+        Yeni kaynak ekler. `url` RTSP/HTTP adresi, kamera indeksi ("0") veya
+        dosya yolu olabilir; dosyalar varsayılan olarak gerçek zaman hızında oynatılır.
+        Doğrulama yapılmaz: istemciden gelen adresler önce check_stream_url'den geçmeli
+        (dosya / cihaz sadece yapılandırma, benchmark ve testler için).
+        """
+        is_file = os.path.isfile(url)
+        stream = _Stream(site_id, url, name or url, realtime=is_file if realtime is None else realtime, loop=loop)
+        with self._cond:
+            self._streams[stream.id] = stream
+            self._order.append(stream.id)
+        stream.thread = threading.Thread(target=self._read_loop, args=(stream,), name=f"stream-{stream.id[:8]}", daemon=True)
+        stream.thread.start()
+        self._ensure_workers()
+        return self._snapshot(stream)
+
+    def remove_stream(self, stream_id: str) -> bool:
+        with self._cond:
+            stream = self._streams.pop(stream_id, None)
+            if stream is None:
+                return False
+            self._order.remove(stream_id)
+        stream.stop.set()
+        stream.status = "stopped"
+        return True
+
+    def get_stream(self, stream_id: str) -> Optional[CameraStream]:
+        stream = self._streams.get(stream_id)
+        return self._snapshot(stream) if stream is not None else None
+
+    def list_streams(self) -> List[CameraStream]:
+        with self._cond:
+            streams = [self._streams[i] for i in self._order]
+        return [self._snapshot(s) for s in streams]
+
+    def _snapshot(self, stream: _Stream) -> CameraStream:
+        info = CameraStream(
+            id=stream.id,
+            site_id=stream.site_id,
+            name=stream.name,
+            url=stream.url,
+            status=stream.status,
+            frames_read=stream.frames_read,
+            frames_analyzed=stream.frames_analyzed,
+            frames_dropped=stream.frames_dropped,
+        )
+        lat = list(stream.latencies)
+        if lat:
+            info.latency_p50_ms = float(np.percentile(lat, 50) * 1000.0)
+            info.latency_p99_ms = float(np.percentile(lat, 99) * 1000.0)
+        window = self._windows.get(info.site_id)
+        if window is not None and window.persons:
+            info.helmet_ratio = window.with_helmet / window.persons
+            info.vest_ratio = window.with_vest / window.persons
+        info.risk_level = self._site_level.get(info.site_id)
+        return info
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            streams = list(self._streams.values())
+            self._cond.notify_all()
+        for s in streams:
+            s.stop.set()
+        for t in self._workers:
+            t.join(timeout=5)
+        for s in streams:
+            if s.thread is not None:
+                s.thread.join(timeout=5)
+
+    # ---------- okuma ----------
+    @staticmethod
+    def _open(url: str) -> cv2.VideoCapture:
+        cap = cv2.VideoCapture(int(url) if url.isdigit() else url)
+        # sürücü tarafında frame biriktirme (destekleyen backend'lerde)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    def _publish(self, stream: _Stream, frame: np.ndarray) -> None:
+        with self._cond:
+            if stream.seq > stream.taken_seq:
+                stream.frames_dropped += 1
+            stream.frame = frame
+            stream.frame_ts = time.monotonic()
+            stream.seq += 1
+            stream.frames_read += 1
+            self._cond.notify()
+
+    def _read_loop(self, stream: _Stream) -> None:
+        is_file = os.path.isfile(stream.url)
+        while not stream.stop.is_set() and not self._stop.is_set():
+            cap = self._open(stream.url)
+            if not cap.isOpened():
+                cap.release()
+                stream.status = "reconnecting"
+                print("[StreamMonitor] Kaynak açılamadı, tekrar denenecek:", stream.name)
+                stream.stop.wait(self.reconnect_s)
+                continue
+
+            stream.status = "running"
+            fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+            start, n = time.monotonic(), 0
+            try:
+                while not stream.stop.is_set() and not self._stop.is_set():
+                    ok, frame = cap.read()
+                    if not ok:
+                        if is_file and stream.loop:
+                            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                            start, n = time.monotonic(), 0
+                            continue
+                        break
+                    n += 1
+                    if stream.realtime:
+                        # dosyayı kamera gibi oynat: frame'i kaydedildiği anda yayınla
+                        delay = start + n / fps - time.monotonic()
+                        if delay > 0 and stream.stop.wait(delay):
+                            break
+                    self._publish(stream, frame)
+            finally:
+                cap.release()
+
+            if is_file:
+                if stream.status == "running":
+                    stream.status = "finished"
+                return
+            if not stream.stop.is_set():
+                stream.status = "reconnecting"
+                print("[StreamMonitor] Akış koptu, yeniden bağlanılıyor:", stream.name)
+                stream.stop.wait(self.reconnect_s)
+
+    # ---------- inference ----------
+    def _ensure_workers(self) -> None:
+        with self._cond:
+            while len(self._workers) < self.workers:
+                t = threading.Thread(target=self._work_loop, name=f"stream-infer-{len(self._workers)}", daemon=True)
+                self._workers.append(t)
+                t.start()
+
+    def _pick(self, now: float) -> Tuple[List[Tuple[_Stream, np.ndarray, float]], float]:
+        """Round-robin: sıradaki akıştan başlayarak her akıştan en fazla bir yeni frame (lock altında)."""
+        tasks = []
+        wait = 0.5
+        n = len(self._order)
+        for k in range(n):
+            pos = (self._rr + k) % n
+            stream = self._streams[self._order[pos]]
+            if stream.in_flight or stream.seq <= stream.taken_seq:
+                continue
+            due = stream.last_analyzed + self.min_interval - now
+            if due > 0:
+                wait = min(wait, due)
+                continue
+            stream.taken_seq = stream.seq
+            stream.in_flight = True
+            stream.last_analyzed = now
+            tasks.append((stream, stream.frame, stream.frame_ts))
+            # bir sonraki tur, son alınan akıştan sonrakiyle başlar
+            self._rr = (pos + 1) % n
+            if len(tasks) >= self.batch_size:
+                break
+        return tasks, wait
+
+    def _work_loop(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                tasks, wait = self._pick(time.monotonic())
+                if not tasks:
+                    self._cond.wait(wait)
+                    continue
+            try:
+                results = self._detect([frame for _, frame, _ in tasks])
+                now = time.monotonic()
+                for (stream, _, ts), res in zip(tasks, results):
+                    stream.latencies.append(now - ts)
+                    stream.frames_analyzed += 1
+                    self._observe(stream, res, now)
+            except Exception as e:  # tek bir hatalı frame/akış izlemeyi durdurmasın
+                print("[StreamMonitor] Analiz hatası:", e)
+            finally:
+                with self._cond:
+                    for stream, _, _ in tasks:
+                        stream.in_flight = False
+                    self._cond.notify_all()
+
+    # ---------- uyum penceresi ----------
+    def _observe(self, stream: _Stream, result: Any, now: float) -> None:
+        ppe = self.yolo_service.ppe_boxes(result)
+        persons = ppe["Person"]
+        with_helmet = int(assign_ppe(ppe["helmet"], persons).sum())
+        with_vest = int(assign_ppe(ppe["vest"], persons).sum())
+
+        site_id = stream.site_id
+        with self._cond:
+            window = self._windows.get(site_id)
+            if window is None:
+                window = self._windows[site_id] = ComplianceWindow(self.window_s)
+            window.add(now, len(persons), with_helmet, with_vest)
+            if window.persons < self.min_persons:
+                # pencerede yeterli kişi gözlemi yoksa risk değerlendirilmez
+                self._site_level[site_id] = None
+                return
+            summary = self.yolo_service.video_risk(window.persons, window.with_helmet, window.with_vest)
+            level = summary["risk_level"]
+            previous = self._site_level.get(site_id)
+            self._site_level[site_id] = level
+
+            threshold = RISK_RANK[self.risk_threshold]
+            crossed = RISK_RANK[level] >= threshold and (previous is None or RISK_RANK[previous] < threshold)
+            if not crossed or now - self._last_alert.get(site_id, -self.cooldown_s) < self.cooldown_s:
+                return
+            self._last_alert[site_id] = now
+
+        self._alert(stream, summary)
+
+    def _alert(self, stream: _Stream, summary: Dict[str, Any]) -> None:
+        site = self.site_service.get_site(stream.site_id)
+        if site is None:
+            print("[StreamMonitor] Şantiye bulunamadı, denetim yazılmadı:", stream.site_id)
+            return
+        notes = (
+            f"{stream.name}: son {int(self.window_s)} sn, {summary['total_person']} kişi gözlemi, "
+            f"kask %{summary['helmet_ratio'] * 100:.0f}, yelek %{summary['vest_ratio'] * 100:.0f}"
+        )
+        detected = [name for name, key in (("helmet", "total_with_helmet"), ("vest", "total_with_vest")) if summary[key]]
+        self.safety_service.create_inspection(
+            site=site,
+            inspector="Kamera izleme",
+            risk_level=summary["risk_level"],
+            notes=notes,
+            file_name=stream.name,
+            detected_ppe=detected,
+        )
+        print(f"[StreamMonitor] Risk eşiği aşıldı ({summary['risk_level']}):", notes)
@@ -0,0 +1,132 @@
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.onnx_backend import nms
+
+
+Tile = Tuple[int, int, int, int]   # x1, y1, x2, y2
+
+
+def tile_params(w: int, h: int, imgsz: int = 640, overlap: float = 0.2) -> Tuple[int, int]:
+    """
+    Çözünürlüğe göre (karo boyu, örtüşme px). Karo, uzun kenarın üçte biri
+    kadar; model girişinden küçük (anlamsız büyütme) ya da iki katından büyük
+    (karoda da küçültme kaybı) olmaz. 4K'da ~1280 px karo -> her karo 2x küçülür,
+    tam frame geçişindeki 6x küçülme yerine.
+    """
+    tile = int(min(max(max(w, h) // 3, imgsz), 2 * imgsz))
+    return tile, int(tile * overlap)
+
+
+def _starts(length: int, tile: int, step: int) -> List[int]:
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, step))
+    starts.append(length - tile)   # son karo kenara hizalı
+    return starts
+
+
+def tile_grid(w: int, h: int, tile: int, overlap: int) -> List[Tile]:
+    step = max(tile - overlap, 1)
+    return [
+        (x, y, min(x + tile, w), min(y + tile, h))
+        for y in _starts(h, tile, step)
+        for x in _starts(w, tile, step)
+    ]
+
+
+def tiles_for_regions(grid: List[Tile], regions: np.ndarray, margin: float = 0.15) -> List[Tile]:
+    """Sadece (kenar payıyla büyütülmüş) bölgelerle kesişen karolar."""
+    if len(regions) == 0:
+        return []
+    r = np.asarray(regions, dtype=np.float32).reshape(-1, 4)
+    mw = (r[:, 2] - r[:, 0]) * margin
+    mh = (r[:, 3] - r[:, 1]) * margin
+    x1, y1, x2, y2 = r[:, 0] - mw, r[:, 1] - mh, r[:, 2] + mw, r[:, 3] + mh
+    return [
+        t for t in grid
+        if np.any((x1 < t[2]) & (x2 > t[0]) & (y1 < t[3]) & (y2 > t[1]))
+    ]
+
+
+def _interior_edge_mask(data: np.ndarray, t: Tile, w: int, h: int, tol: float = 2.0) -> np.ndarray:
+    """Karonun görsel kenarı olmayan bir kenarına değen (kesilmiş) kutular."""
+    x1, y1, x2, y2 = t
+    cut = np.zeros(len(data), dtype=bool)
+    if x1 > 0:
+        cut |= data[:, 0] <= x1 + tol
+    if y1 > 0:
+        cut |= data[:, 1] <= y1 + tol
+    if x2 < w:
+        cut |= data[:, 2] >= x2 - tol
+    if y2 < h:
+        cut |= data[:, 3] >= y2 - tol
+    return cut
+
+
+def _to_image(t: Tile, data: np.ndarray) -> np.ndarray:
+    """Karo / kırpıntı koordinatındaki (N,6) satırları görsel koordinatına taşır."""
+    data = data.reshape(-1, 6).copy()
+    data[:, [0, 2]] += t[0]
+    data[:, [1, 3]] += t[1]
+    return data
+
+
+def _class_nms(parts: List[np.ndarray], w: int, h: int, iou: float) -> np.ndarray:
+    merged = np.concatenate(parts).astype(np.float32) if parts else np.zeros((0, 6), dtype=np.float32)
+    if len(merged) == 0:
+        return merged
+    offset = float(max(w, h) + 1)
+    keep = nms(merged[:, :4] + (merged[:, 5] * offset)[:, None], merged[:, 4], iou)
+    return merged[keep]
+
+
+def merge_detections(full: np.ndarray, tiled: List[Tuple[Tile, np.ndarray]], w: int, h: int, iou: float = 0.5) -> np.ndarray:
+    """
+    Tam frame (N,6) ve karo (karo koordinatlarında) tespitlerini birleştirir:
+    karo kutuları görsel koordinatına taşınır, karo iç kenarında kesilenler
+    atılır (örtüşme sayesinde komşu karoda tam görünürler) ve sınıf bazlı NMS.
+    """
+    parts = [full.reshape(-1, 6)]
+    for t, data in tiled:
+        data = _to_image(t, data)
+        parts.append(data[~_interior_edge_mask(data, t, w, h)])
+    return _class_nms(parts, w, h, iou)
+
+
+def offset_and_nms(tiled: List[Tuple[Tile, np.ndarray]], w: int, h: int, iou: float = 0.5) -> np.ndarray:
+    """
+    Örtüşmeyen bölgelerin (cascade kişi kırpıntıları) tespitleri: görsel
+    koordinatına taşıma + sınıf bazlı NMS. Kenar filtresi yoktur; kırpıntı
+    kenarında kesilen kutuyu tam gören komşu bir bölge olmadığından atılırsa
+    o kask / yelek tamamen kaybolurdu.
+    """
+    return _class_nms([_to_image(t, data) for t, data in tiled], w, h, iou)
+
+
+def sliced_detect(
+    image: np.ndarray,
+    full: np.ndarray,
+    detect_tiles: Callable[[List[np.ndarray]], List[np.ndarray]],
+    person_cls: Optional[int],
+    imgsz: int = 640,
+    overlap: float = 0.2,
+    min_side: int = 1600,
+) -> Tuple[np.ndarray, int]:
+    """
+    Tam frame tespitlerini (`full`, (N,6)) karo tespitleriyle zenginleştirir.
+    Karolar sadece Person kutularının çevresinden seçilir ve tek batch'te
+    `detect_tiles` ile çalışır. Dönen: (birleşik (N,6), çalıştırılan karo sayısı).
+    """
+    h, w = image.shape[:2]
+    if max(w, h) < min_side or person_cls is None:
+        return full, 0
+    persons = full[full[:, 5] == person_cls, :4]
+    tile, ov = tile_params(w, h, imgsz, overlap)
+    tiles = tiles_for_regions(tile_grid(w, h, tile, ov), persons)
+    if not tiles:
+        return full, 0
+    crops = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles]
+    results = detect_tiles(crops)
+    return merge_detections(full, list(zip(tiles, results)), w, h), len(tiles)
@@ -0,0 +1,165 @@
+from typing import Dict, List
+
+import numpy as np
+
+
+def _area(b: np.ndarray) -> np.ndarray:
+    return np.clip(b[:, 2] - b[:, 0], 0, None) * np.clip(b[:, 3] - b[:, 1], 0, None)
+
+
+def _intersection(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N,4) x (M,4) xyxy kutular için (N,M) kesişim alanı."""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    return np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    inter = _intersection(a, b)
+    union = _area(a)[:, None] + _area(b)[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def ioa_matrix(inner: np.ndarray, outer: np.ndarray) -> np.ndarray:
+    """Kesişim / inner alanı: PPE kutusunun ne kadarı kişi kutusunun içinde."""
+    inter = _intersection(inner, outer)
+    return inter / np.maximum(_area(inner)[:, None], 1e-9)
+
+
+def assign_ppe(ppe: np.ndarray, persons: np.ndarray, min_ioa: float = 0.5) -> np.ndarray:
+    """Her kişi için bool: alanının en az `min_ioa` kadarı kişinin içinde kalan bir PPE kutusu var mı."""
+    has = np.zeros(len(persons), dtype=bool)
+    if len(ppe) == 0 or len(persons) == 0:
+        return has
+    ioa = ioa_matrix(ppe, persons)
+    best = ioa.argmax(axis=1)
+    valid = ioa[np.arange(len(ppe)), best] >= min_ioa
+    has[best[valid]] = True
+    return has
+
+
+class _Track:
+    __slots__ = ("id", "box", "last_frame", "hits", "helmet_hits", "vest_hits")
+
+    def __init__(self, track_id: int, box: np.ndarray, frame_idx: int) -> None:
+        self.id = track_id
+        self.box = box
+        self.last_frame = frame_idx
+        self.hits = 0
+        self.helmet_hits = 0
+        self.vest_hits = 0
+
+
+class PersonTracker:
+    """
+    Video boyunca Person kutularına kalıcı track ID veren hafif IoU/merkez takipçisi.
+
+    Eşleştirme: önce IoU >= `iou_threshold` olan çiftler, kalanlar için kutu
+    köşegenine göre normalize merkez uzaklığı < `centroid_threshold` (yüksek
+    frame_stride'da IoU sıfıra düşse bile aynı kişi kaybolmasın diye).
+    Kask / yelek kutuları, alanlarının en az `ppe_min_ioa` kadarı içinde kalan
+    kişiye atanır; uyum her benzersiz kişi için gözlemlerinin çoğunluğuna göre verilir.
+
+    Frame'ler artan sırada gelir; `max_gap` frame'den uzun süredir görülmeyen
+    track'ler bir daha eşleşemez ve bitmişler listesine taşınır, böylece her
+    güncelleme sadece canlı track'leri tarar (uzun videoda tüm geçmişi değil).
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        centroid_threshold: float = 0.5,
+        max_gap: int = 30,
+        ppe_min_ioa: float = 0.5,
+    ) -> None:
+        self.iou_threshold = iou_threshold
+        self.centroid_threshold = centroid_threshold
+        self.max_gap = max_gap
+        self.ppe_min_ioa = ppe_min_ioa
+
+        self._tracks: List[_Track] = []      # canlı (eşleşebilir) track'ler
+        self._finished: List[_Track] = []
+        self._next_id = 1
+
+    def _match(self, tracks: List[_Track], persons: np.ndarray) -> Dict[int, int]:
+        """detection index -> track listesindeki index (greedy, skor sırasına göre)."""
+        if not tracks or len(persons) == 0:
+            return {}
+
+        boxes = np.stack([t.box for t in tracks])
+        iou = iou_matrix(boxes, persons)
+
+        c_t = (boxes[:, :2] + boxes[:, 2:]) / 2.0
+        c_d = (persons[:, :2] + persons[:, 2:]) / 2.0
+        diag = np.hypot(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+        dist = np.linalg.norm(c_t[:, None, :] - c_d[None, :, :], axis=2) / np.maximum(diag[:, None], 1e-9)
+
+        # IoU eşleşmeleri her zaman merkez eşleşmelerinden önce gelir
+        score = np.where(
+            iou >= self.iou_threshold,
+            1.0 + iou,
+            np.where(dist < self.centroid_threshold, 1.0 - dist / self.centroid_threshold, 0.0),
+        )
+
+        order = np.argsort(-score, axis=None)
+        t_used = np.zeros(len(tracks), dtype=bool)
+        d_used = np.zeros(len(persons), dtype=bool)
+        matches: Dict[int, int] = {}
+        for flat in order:
+            ti, di = np.unravel_index(flat, score.shape)
+            if score[ti, di] <= 0:
+                break
+            if t_used[ti] or d_used[di]:
+                continue
+            t_used[ti] = d_used[di] = True
+            matches[int(di)] = int(ti)
+        return matches
+
+    def update(
+        self,
+        frame_idx: int,
+        persons: np.ndarray,
+        helmets: np.ndarray,
+        vests: np.ndarray,
+    ) -> List[int]:
+        """Bir analiz frame'inin (N,4) kutularını işler, kişi başına track ID döner."""
+        persons = np.asarray(persons, dtype=np.float32).reshape(-1, 4)
+        helmets = np.asarray(helmets, dtype=np.float32).reshape(-1, 4)
+        vests = np.asarray(vests, dtype=np.float32).reshape(-1, 4)
+
+        active: List[_Track] = []
+        for t in self._tracks:
+            (active if frame_idx - t.last_frame <= self.max_gap else self._finished).append(t)
+        self._tracks = active
+        matches = self._match(active, persons)
+
+        has_helmet = assign_ppe(helmets, persons, self.ppe_min_ioa)
+        has_vest = assign_ppe(vests, persons, self.ppe_min_ioa)
+
+        ids = []
+        for di in range(len(persons)):
+            if di in matches:
+                track = active[matches[di]]
+                track.box = persons[di]
+                track.last_frame = frame_idx
+            else:
+                track = _Track(self._next_id, persons[di], frame_idx)
+                self._next_id += 1
+                self._tracks.append(track)
+
+            track.hits += 1
+            track.helmet_hits += int(has_helmet[di])
+            track.vest_hits += int(has_vest[di])
+            ids.append(track.id)
+        return ids
+
+    def summary(self, min_hits: int = 1, min_ratio: float = 0.5) -> Dict[str, int]:
+        """Benzersiz kişi sayısı ve kask / yelek ile görülen kişi sayısı."""
+        tracks = [t for t in self._finished + self._tracks if t.hits >= min_hits]
+        return {
+            "persons": len(tracks),
+            "with_helmet": sum(1 for t in tracks if t.helmet_hits / t.hits >= min_ratio),
+            "with_vest": sum(1 for t in tracks if t.vest_hits / t.hits >= min_ratio),
+        }
@@ -0,0 +1,201 @@
+import hashlib
+import os
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from app.core.metrics import metrics
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+
+class UploadError(ValueError):
+    status_code = 400
+
+
+class UploadTooLarge(UploadError):
+    status_code = 413
+
+
+class StoredUpload:
+    """Diske bir kez yazılmış yükleme; hash ve boyut aynı geçişte hesaplanır."""
+
+    def __init__(self, path: str, original_name: str, size: int, sha256: str, data: Optional[bytes]) -> None:
+        self.path = path
+        self.original_name = original_name
+        self.size = size
+        self.sha256 = sha256
+        self.data = data          # küçük görsellerde içerik bellekte de tutulur
+
+    @property
+    def stored_name(self) -> str:
+        return os.path.basename(self.path)
+
+    def decode_image(self) -> Optional[np.ndarray]:
+        """Bellekteki baytlardan decode eder; içerik bellekte değilse None (diskten okunur)."""
+        if self.data is None:
+            return None
+        with metrics.stage("decode"):
+            return cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+class UploadService:
+    """
+    multipart/form-data isteğini Starlette'in spool dosyasına uğramadan okur:
+    dosya parçası parça parça benzersiz isimli hedef dosyaya yazılır, SHA-256
+    aynı geçişte hesaplanır ve tür bazlı boyut sınırı aşıldığı anda istek kesilir.
+    Disk yazmaları event loop'u bloklamasın diye threadpool'da yapılır: parser
+    callback'leri parçaları biriktirir, her ağ parçasından sonra tek yazmada boşaltılır.
+    """
+
+    def __init__(
+        self,
+        upload_dir: str,
+        max_bytes: Dict[str, int],
+        memory_max_bytes: Dict[str, int],
+        max_field_bytes: int = 64 * 1024,
+    ) -> None:
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self.max_field_bytes = max_field_bytes
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+    async def ingest(self, request: Request, kind: str, file_field: str = "file") -> Tuple[Dict[str, str], StoredUpload]:
+        limit = self.max_bytes[kind]
+        keep_limit = self.memory_max_bytes.get(kind, 0)
+
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise UploadError("multipart/form-data bekleniyor.")
+
+        # Content-Length biliniyorsa gövdeyi hiç okumadan reddet
+        # (form alanları + multipart başlıkları için küçük bir pay bırakılır)
+        declared = request.headers.get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit + self.max_field_bytes:
+            raise UploadTooLarge(f"Dosya çok büyük (en fazla {limit / 1024 ** 2:.1f} MB).")
+
+        fields: Dict[str, str] = {}
+        state = {
+            "headers": {}, "header_field": b"", "header_value": b"",
+            "name": None, "is_file": False, "buf": None,
+        }
+        upload = {"file": None, "path": None, "name": "", "size": 0, "mem": None, "write_s": 0.0, "pending": []}
+        sha = hashlib.sha256()
+
+        def on_part_begin() -> None:
+            state["headers"] = {}
+            state["name"] = None
+            state["is_file"] = False
+            state["buf"] = bytearray()
+
+        def on_header_field(data: bytes, start: int, end: int) -> None:
+            state["header_field"] += data[start:end]
+
+        def on_header_value(data: bytes, start: int, end: int) -> None:
+            state["header_value"] += data[start:end]
+
+        def on_header_end() -> None:
+            state["headers"][state["header_field"].lower()] = state["header_value"]
+            state["header_field"] = b""
+            state["header_value"] = b""
+
+        def on_headers_finished() -> None:
+            _, disp = parse_options_header(state["headers"].get(b"content-disposition", b""))
+            name = disp.get(b"name", b"").decode("utf-8", "replace")
+            state["name"] = name
+            if name == file_field and b"filename" in disp:
+                if upload["path"] is not None:
+                    raise UploadError("Tek dosya bekleniyor.")
+                original = os.path.basename(disp[b"filename"].decode("utf-8", "replace"))
+                ext = os.path.splitext(original)[1].lower()[:10]
+                path = os.path.join(self.upload_dir, f"{uuid.uuid4().hex}{ext}")
+                upload.update(path=path, name=original)
+                upload["mem"] = bytearray() if keep_limit > 0 else None
+                state["is_file"] = True
+
+        def on_part_data(data: bytes, start: int, end: int) -> None:
+            chunk = data[start:end]
+            if state["is_file"]:
+                upload["size"] += len(chunk)
+                if upload["size"] > limit:
+                    raise UploadTooLarge(f"Dosya çok büyük (en fazla {limit / 1024 ** 2:.1f} MB).")
+                sha.update(chunk)
+                upload["pending"].append(chunk)
+                mem = upload["mem"]
+                if mem is not None:
+                    if len(mem) + len(chunk) <= keep_limit:
+                        mem += chunk
+                    else:
+                        upload["mem"] = None
+            else:
+                state["buf"] += chunk
+                if len(state["buf"]) > self.max_field_bytes:
+                    raise UploadError(f"Form alanı çok uzun: {state['name']}")
+
+        def on_part_end() -> None:
+            if not state["is_file"] and state["name"]:
+                fields[state["name"]] = state["buf"].decode("utf-8", "replace")
+
+        parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": on_part_begin,
+                "on_part_data": on_part_data,
+                "on_part_end": on_part_end,
+                "on_header_field": on_header_field,
+                "on_header_value": on_header_value,
+                "on_header_end": on_header_end,
+                "on_headers_finished": on_headers_finished,
+            },
+        )
+
+        def write_pending(data: bytes) -> None:
+            t0 = time.perf_counter()
+            if upload["file"] is None:
+                upload["file"] = open(upload["path"], "wb")
+            upload["file"].write(data)
+            upload["write_s"] += time.perf_counter() - t0
+
+        async def flush() -> None:
+            if upload["pending"]:
+                data = b"".join(upload["pending"])
+                upload["pending"].clear()
+                await run_in_threadpool(write_pending, data)
+
+        try:
+            async for chunk in request.stream():
+                parser.write(chunk)
+                await flush()
+            parser.finalize()
+            await flush()
+            if upload["file"] is None or upload["size"] == 0:
+                raise UploadError("Dosya yüklenmedi.")
+            await run_in_threadpool(upload["file"].close)
+        except BaseException:
+            # iptal sırasında da temizlenmeli; burada tekrar await edilmez
+            if upload["file"] is not None:
+                upload["file"].close()
+            if upload["path"] is not None and os.path.exists(upload["path"]):
+                os.remove(upload["path"])
+            raise
+
+        metrics.observe_stage("upload_write", upload["write_s"])
+        mem = upload["mem"]
+        stored = StoredUpload(
+            path=upload["path"],
+            original_name=upload["name"],
+            size=upload["size"],
+            sha256=sha.hexdigest(),
+            data=bytes(mem) if mem is not None else None,
+        )
+        return fields, stored
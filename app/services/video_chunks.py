@@ -0,0 +1,218 @@
+import bisect
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.services.detections import result_rows
+from app.services.video_output import BoxRenderer, OverlayWriter
+from app.services.video_pipeline import VideoPipeline
+
+
+# ---------- bölümleme ----------
+def keyframe_index(video_path: str) -> Tuple[List[int], int]:
+    """
+    Videonun keyframe indeksleri ve toplam frame sayısı. Paketler decode
+    edilmeden okunur (CAP_PROP_FORMAT=-1), 30 dakikalık kayıt bile birkaç
+    yüz ms sürer. Backend desteklemiyorsa keyframe listesi sadece [0] olur.
+    """
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        raise RuntimeError(f"Video açılamadı: {video_path}")
+    try:
+        if not cap.set(cv2.CAP_PROP_FORMAT, -1):
+            return [0], max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+        keyframes: List[int] = []
+        n = 0
+        while cap.grab():
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                keyframes.append(n)
+            n += 1
+        return keyframes or [0], n
+    finally:
+        cap.release()
+
+
+def plan_segments(
+    keyframes: List[int],
+    n_frames: int,
+    parts: int,
+    stride: int,
+    min_frames: int = 1,
+) -> List[Tuple[int, Optional[int]]]:
+    """
+    [0, n_frames) aralığını en fazla `parts` parçaya böler: her sınır ideal
+    noktaya en yakın keyframe'e, oradan bir sonraki `stride` katına kaydırılır.
+    Böylece her parçanın ilk frame'i örneklenen bir frame olur (overlay'de boşluk
+    kalmaz) ve seek en fazla stride - 1 frame fazladan decode eder. Parçalar
+    `min_frames`'ten kısa olmaz. Son parçanın sonu None (videonun sonuna kadar).
+    """
+    stride = max(int(stride), 1)
+    parts = max(1, min(parts, n_frames // max(min_frames, 1)))
+    bounds = [0]
+    for k in range(1, parts):
+        ideal = n_frames * k // parts
+        i = bisect.bisect_left(keyframes, ideal)
+        near = min(keyframes[max(i - 1, 0):i + 1] or [ideal], key=lambda f: abs(f - ideal))
+        b = -(-near // stride) * stride
+        if b - bounds[-1] >= min_frames and n_frames - b >= min_frames:
+            bounds.append(b)
+    return [(s, e) for s, e in zip(bounds, bounds[1:] + [None])]
+
+
+# ---------- worker süreci ----------
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(model_path: str, threads: int, loader: Optional[Callable[[str], Any]]) -> None:
+    # torch / OpenMP thread sayısı import'tan önce sabitlenmeli (bkz. inference_pool)
+    if threads > 0:
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            os.environ[var] = str(threads)
+        os.environ["ONNX_THREADS"] = str(threads)
+    cv2.setNumThreads(1)
+
+    from app.services.model_registry import load_model
+
+    if threads > 0:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+    model = (loader or load_model)(model_path)
+    try:
+        names = dict(model.model.names)
+    except AttributeError:
+        names = dict(model.names)
+    _WORKER["model"] = model
+    _WORKER["names"] = names
+
+
+def _analyze_segment(
+    video_path: str,
+    start: int,
+    stop: Optional[int],
+    stride: int,
+    batch_size: int,
+    upload_dir: str,
+    base_name: Optional[str],
+    output: str,
+    output_options: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    [start, stop) aralığını sıralı analizle aynı şekilde işler: her `stride`
+    frame'den biri (global frame_idx'e göre) batch halinde modele gider,
+    atlanan frame'lere son tespitin kutuları çizilir. Takip ve risk hesabı
+    burada yapılmaz; örneklenen her frame'in (N,6) kutuları ana sürece döner.
+    """
+    model, names = _WORKER["model"], _WORKER["names"]
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Video açılamadı: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    writer = None
+    if output != "none":
+        writer = OverlayWriter(upload_dir, base_name, fps, size, BoxRenderer(names), mode=output, **output_options)
+
+    detections: List[Tuple[int, np.ndarray]] = []
+    frames = 0
+    last_res = None
+    with VideoPipeline(cap, writer, start=start, stop=stop) as pipe:
+        pending: List[Tuple[np.ndarray, bool, int]] = []
+        batch: List[np.ndarray] = []
+
+        def flush() -> None:
+            nonlocal last_res
+            results = iter(model(list(batch), verbose=False) if batch else ())
+            for frame, sampled, idx in pending:
+                if sampled:
+                    res = last_res = next(results)
+                    detections.append((idx, result_rows(res)))
+                    pipe.write((frame, res, True))
+                elif last_res is not None and len(last_res.boxes):
+                    pipe.write((frame, last_res, False))
+                else:
+                    pipe.write((frame, None, False))
+            pending.clear()
+            batch.clear()
+
+        for idx, frame in pipe.frames():
+            frames += 1
+            sampled = idx % stride == 0
+            pending.append((frame, sampled, idx))
+            if sampled:
+                batch.append(frame)
+                if len(batch) >= batch_size:
+                    flush()
+        flush()
+
+    return {
+        "start": start,
+        "stop": start + frames,
+        "frames": frames,
+        "names": names,
+        "detections": detections,
+        "output": writer.summary() if writer is not None else None,
+        "files": list(writer.files) if writer is not None else [],
+    }
+
+
+# ---------- ana süreç ----------
+class ChunkedVideoAnalyzer:
+    """
+    Uzun kayıtlar için parçalı video analizi süreç havuzu. Her süreç
+    fine-tuned modelin bir kopyasını yükler (ilk kullanımda, "spawn" ile) ve
+    kendisine verilen zaman aralığına CAP_PROP_POS_FRAMES ile atlayıp onu
+    uçtan uca (decode -> inference -> overlay encode) işler. Parçaların
+    birleştirilmesi ve takip YoloPPEService'te yapılır.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        processes: int = 2,
+        threads: int = 1,
+        loader: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        self.model_path = model_path
+        self.processes = max(int(processes), 1)
+        self.threads = int(threads)
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=mp.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_path, self.threads, self._loader),
+                )
+                print(f"[ChunkedVideoAnalyzer] {self.processes} süreç x {self.threads} thread")
+            return self._executor
+
+    def submit(self, video_path: str, start: int, stop: Optional[int], **kwargs: Any) -> Future:
+        return self._get_executor().submit(_analyze_segment, video_path, start, stop, **kwargs)
+
+    def reset(self) -> None:
+        """Çöken (BrokenProcessPool) havuzu bırakır; sonraki iş yenisini başlatır."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
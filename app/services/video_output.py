@@ -0,0 +1,177 @@
+import os
+import shutil
+import time
+from typing import Any, List, Mapping, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.metrics import metrics
+from app.services.detections import result_arrays
+
+
+OUTPUT_MODES = ("none", "full", "downscaled", "highlights", "segments")
+
+# sınıf id'sine göre sabit renkler (BGR)
+PALETTE = [
+    (255, 56, 56), (56, 56, 255), (56, 200, 56), (0, 200, 255), (200, 56, 200),
+    (255, 160, 0), (0, 128, 255), (128, 0, 255), (0, 255, 200), (160, 160, 160),
+]
+
+
+# ---------- kutu çizimi ----------
+class BoxRenderer:
+    """
+    results.plot() yerine hafif kutu çizici: sadece cv2.rectangle + putText.
+    plot() her frame'de Annotator kurup görseli kopyalar; video çıktısında
+    binlerce frame için bu maliyet inference'a yaklaşıyordu.
+    """
+
+    def __init__(self, names: Mapping[int, str], line_width: Optional[int] = None) -> None:
+        self.names = dict(names)
+        self.line_width = line_width
+
+    def draw(self, frame: np.ndarray, cls: np.ndarray, conf: np.ndarray, xyxy: np.ndarray, scale: float = 1.0) -> np.ndarray:
+        """Kutuları `frame` üzerine yerinde çizer (frame'in kopyası alınmaz)."""
+        if len(cls) == 0:
+            return frame
+        h, w = frame.shape[:2]
+        lw = self.line_width or max(round((h + w) / 2 * 0.003), 2)
+        font = max(lw / 3, 0.4)
+        boxes = np.round(xyxy * scale).astype(np.int32)
+        for c, p, (x1, y1, x2, y2) in zip(cls.tolist(), conf.tolist(), boxes.tolist()):
+            color = PALETTE[c % len(PALETTE)]
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, lw, cv2.LINE_AA)
+            label = f"{self.names.get(c, str(c))} {p:.2f}"
+            (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font, max(lw - 1, 1))
+            top = y1 - th - 4 if y1 - th - 4 >= 0 else y1
+            cv2.rectangle(frame, (x1, top), (x1 + tw + 2, top + th + 4), color, -1)
+            cv2.putText(frame, label, (x1 + 1, top + th + 1), cv2.FONT_HERSHEY_SIMPLEX, font, (255, 255, 255), max(lw - 1, 1), cv2.LINE_AA)
+        return frame
+
+    def draw_result(self, frame: np.ndarray, result, scale: float = 1.0) -> np.ndarray:
+        cls, conf, xyxy = result_arrays(result)
+        return self.draw(frame, cls, conf, xyxy, scale)
+
+
+# ---------- video çıktısı ----------
+class OverlayWriter:
+    """
+    Video analizinin overlay çıktısı; VideoPipeline'ın encode thread'inde
+    cv2.VideoWriter yerine kullanılır (write / release).
+
+    `write((frame, result, analyzed))`: result son tespit (yoksa None).
+    Modlar:
+      - full: her frame tam çözünürlükte (eski davranış)
+      - downscaled: her frame genişliği en fazla `max_width` olacak şekilde küçültülür
+      - highlights: sadece analiz edilen frame'ler, `highlight_fps` hızında kısa özet
+      - segments: `segment_s` saniyelik ayrı mp4 parçaları (alt klasörde); her parça
+        yazılır yazılmaz HTTP üzerinden sırayla oynatılabilir
+    Kutu çizimi ve küçültme de bu thread'de yapılır, ana thread sadece batch toplar.
+    """
+
+    def __init__(
+        self,
+        upload_dir: str,
+        base_name: str,
+        fps: float,
+        size: Tuple[int, int],
+        renderer: BoxRenderer,
+        mode: str = "full",
+        max_width: int = 960,
+        highlight_fps: float = 4.0,
+        segment_s: float = 10.0,
+        fourcc: str = "mp4v",
+    ) -> None:
+        if mode not in OUTPUT_MODES or mode == "none":
+            raise ValueError(f"Geçersiz video çıktı modu: {mode}")
+        self.upload_dir = upload_dir
+        self.base_name = base_name
+        self.mode = mode
+        self.renderer = renderer
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+
+        w, h = size
+        self.scale = 1.0
+        if mode == "downscaled" and w > max_width:
+            self.scale = max_width / w
+        # bazı codec'ler tek boyutlarda açılmıyor
+        self.size = (int(w * self.scale) // 2 * 2, int(h * self.scale) // 2 * 2) if self.scale != 1.0 else (w, h)
+        self.fps = min(highlight_fps, fps) if mode == "highlights" else fps
+        self.segment_frames = max(int(round(segment_s * fps)), 1)
+
+        self.files: List[str] = []      # upload_dir'e göre göreli yollar
+        self.encode_seconds = 0.0       # çizim + küçültme + encode
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._frames_in_file = 0
+        if mode == "segments":
+            os.makedirs(os.path.join(upload_dir, base_name), exist_ok=True)
+        self._open()
+
+    def _open(self) -> None:
+        if self.mode == "segments":
+            name = f"{self.base_name}/seg_{len(self.files):04d}.mp4"
+        else:
+            name = f"{self.base_name}.mp4"
+        writer = cv2.VideoWriter(os.path.join(self.upload_dir, name), self.fourcc, self.fps, self.size)
+        if not writer.isOpened():
+            raise RuntimeError("VideoWriter açılamadı, codec sorunu olabilir.")
+        self._writer = writer
+        self._frames_in_file = 0
+        self.files.append(name)
+
+    def write(self, item: Tuple[np.ndarray, Any, bool]) -> None:
+        frame, result, analyzed = item
+        if self.mode == "highlights" and not analyzed:
+            return
+        t0 = time.perf_counter()
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if result is not None:
+            # kaynak frame decode kuyruğundan geliyor, başka yerde kullanılmıyor; yerinde çizilir
+            self.renderer.draw_result(frame, result, self.scale)
+        t1 = time.perf_counter()
+        if self.mode == "segments" and self._frames_in_file >= self.segment_frames:
+            self._writer.release()
+            self._open()
+        self._writer.write(frame)
+        self._frames_in_file += 1
+        t2 = time.perf_counter()
+        self.encode_seconds += t2 - t0
+        metrics.observe_stage("video_draw", t1 - t0)
+        metrics.observe_stage("video_encode", t2 - t1)
+
+    def release(self) -> None:
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    @property
+    def output_bytes(self) -> int:
+        return sum(os.path.getsize(os.path.join(self.upload_dir, f)) for f in self.files if os.path.exists(os.path.join(self.upload_dir, f)))
+
+    def discard(self) -> None:
+        """Yarım kalan çıktıyı siler (iptal / hata)."""
+        self.release()
+        if self.mode == "segments":
+            shutil.rmtree(os.path.join(self.upload_dir, self.base_name), ignore_errors=True)
+        else:
+            for f in self.files:
+                path = os.path.join(self.upload_dir, f)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def summary(self) -> dict:
+        out = {
+            "video_overlay": self.files[0] if self.mode != "segments" else None,
+            "video_output": {
+                "mode": self.mode,
+                "bytes": self.output_bytes,
+                "encode_seconds": round(self.encode_seconds, 3),
+                "size": list(self.size),
+                "fps": self.fps,
+            },
+        }
+        if self.mode == "segments":
+            out["video_segments"] = list(self.files)
+        return out
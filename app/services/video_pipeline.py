@@ -0,0 +1,145 @@
+import queue
+import threading
+from typing import Any, Iterator, Optional, Tuple
+
+import cv2
+
+from app.core.metrics import metrics
+
+_SENTINEL = object()
+
+
+class VideoPipeline:
+    """
+    Video analizini aşamalara bölen yardımcı.
+    Decode (cap.read) ve encode (writer.write) ayrı thread'lerde çalışır,
+    ana thread sadece frame toplayıp modele batch halinde verir.
+    Kuyruklar sınırlı (bounded) olduğu için bellek kullanımı sabit kalır.
+    `writer` cv2.VideoWriter ya da aynı write/release arayüzüne sahip bir
+    nesne (bkz. OverlayWriter); None ise çıktı yazılmaz.
+    `start` / `stop` verilirse sadece [start, stop) aralığı decode edilir
+    (parçalı analiz; frame_idx'ler videonun başından sayılır).
+    """
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        writer: Optional[Any],
+        queue_size: int = 64,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> None:
+        self.cap = cap
+        self.writer = writer
+        self.start = start
+        self.stop = stop
+
+        self._read_q: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._write_q: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+        self._reader = threading.Thread(target=self._read_loop, name="video-decode", daemon=True)
+        self._writer = threading.Thread(target=self._write_loop, name="video-encode", daemon=True)
+
+    # ---------- context ----------
+    def __enter__(self) -> "VideoPipeline":
+        self._reader.start()
+        if self.writer is not None:
+            self._writer.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._stop.set()
+
+        if self._writer.is_alive():
+            self._put(self._write_q, _SENTINEL)
+            self._writer.join()
+
+        self._stop.set()
+        self._reader.join()
+
+        self.cap.release()
+        if self.writer is not None:
+            self.writer.release()
+
+        if exc_type is None and self._error is not None:
+            raise self._error
+
+    # ---------- stage'ler ----------
+    def _put(self, q: "queue.Queue[Any]", item: Any) -> bool:
+        # Tüketici hata verip durduysa sonsuza kadar beklememek için timeout'lu put
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _seek(self) -> None:
+        # FFmpeg backend'inde CAP_PROP_POS_FRAMES önceki keyframe'e gidip hedefe kadar
+        # decode eder (frame'i frame'ine doğru); desteklemeyen backend'lerde atlayarak okunur
+        if self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.start) and int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) == self.start:
+            return
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        for _ in range(self.start):
+            if not self.cap.grab():
+                break
+
+    def _read_loop(self) -> None:
+        idx = self.start
+        try:
+            if self.start:
+                self._seek()
+            while not self._stop.is_set() and (self.stop is None or idx < self.stop):
+                with metrics.stage("video_decode"):
+                    ret, frame = self.cap.read()
+                if not ret:
+                    break
+                if not self._put(self._read_q, (idx, frame)):
+                    return
+                idx += 1
+        except BaseException as e:  # thread içindeki hatayı ana thread'e taşı
+            self._error = e
+        finally:
+            self._put(self._read_q, _SENTINEL)
+
+    def _write_loop(self) -> None:
+        try:
+            while True:
+                try:
+                    item = self._write_q.get(timeout=0.1)
+                except queue.Empty:
+                    if self._stop.is_set():
+                        break
+                    continue
+                if item is _SENTINEL:
+                    break
+                self.writer.write(item)
+        except BaseException as e:
+            self._error = e
+            self._stop.set()
+
+    # ---------- ana thread API ----------
+    def frames(self) -> Iterator[Tuple[int, Any]]:
+        """Decode edilmiş (frame_idx, frame) çiftlerini sırayla döndürür."""
+        while True:
+            try:
+                item = self._read_q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    break
+                continue
+            if item is _SENTINEL:
+                break
+            yield item
+
+    def write(self, frame: Any) -> None:
+        """Frame'i encode kuyruğuna ekler (sıra korunur)."""
+        if self.writer is None:
+            return
+        if self._error is not None:
+            raise self._error
+        self._put(self._write_q, frame)
@@ -1,18 +1,29 @@
-from typing import List
+from typing import List, Optional
 from app.models.worker_model import Worker
+from app.storage import MemoryStorage, StorageBackend
 
 
 class WorkerService:
-    def __init__(self) -> None:
-        self._workers: List[Worker] = []
-        self._next_id: int = 1
+    def __init__(self, storage: Optional[StorageBackend] = None) -> None:
+        self._storage = storage if storage is not None else MemoryStorage()
+        self.version = 0   # her yazmada artar (parça cache'i için)
 
-        # örnekseed
-        self.add_worker("Ali Yılmaz", "usta", site_id=1, ppe_status="full")
-        self.add_worker("Ahmet Kaya", "işçi", site_id=1, ppe_status="partial")
+        # örnekseed (kalıcı backend'de sadece ilk açılışta)
+        if self._storage.count_workers() == 0:
+            self.add_worker("Ali Yılmaz", "usta", site_id=1, ppe_status="full")
+            self.add_worker("Ahmet Kaya", "işçi", site_id=1, ppe_status="partial")
 
-    def list_workers(self) -> List[Worker]:
-        return self._workers
+    def list_workers(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        site_id: Optional[int] = None,
+    ) -> List[Worker]:
+        return self._storage.list_workers(limit=limit, offset=offset, after_id=after_id, site_id=site_id)
+
+    def count_workers(self, site_id: Optional[int] = None) -> int:
+        return self._storage.count_workers(site_id=site_id)
 
     def add_worker(
         self,
@@ -21,13 +32,13 @@ class WorkerService:
         site_id: int,
         ppe_status: str,
     ) -> Worker:
-        worker = Worker(
-            id=self._next_id,
-            name=name,
-            role=role,
-            site_id=site_id,
-            ppe_status=ppe_status,
+        worker = self._storage.insert_worker(
+            {
+                "name": name,
+                "role": role,
+                "site_id": site_id,
+                "ppe_status": ppe_status,
+            }
         )
-        self._workers.append(worker)
-        self._next_id += 1
+        self.version += 1
         return worker
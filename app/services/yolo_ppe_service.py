@@ -1,12 +1,33 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import os
-import uuid
-from collections import Counter
+import copy
+import functools
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 
 import cv2
-from ultralytics import YOLO
+import numpy as np
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.video_pipeline import VideoPipeline
+from app.services.tracker import PersonTracker
+from app.services.frame_sampler import FixedStrideSampler, FrameSampler
+from app.services.detections import parse_result, result_arrays, result_rows
+from app.services.cascade import cascade_detect
+from app.services.result_cache import ResultCache, file_sha256, weights_identity
+from app.services.artifact_store import ArtifactStore
+from app.services.job_service import AnalysisCancelled
+from app.services.model_registry import ModelRegistry, registry as default_registry
+from app.services.inference_broker import BatchingBroker
+from app.services.inference_pool import InferencePool
+from app.services.video_output import BoxRenderer, OverlayWriter
+from app.services.video_chunks import ChunkedVideoAnalyzer, keyframe_index, plan_segments
+from app.services.tiling import sliced_detect
 
 
 class YoloPPEService:
@@ -17,7 +38,20 @@ class YoloPPEService:
     Overlay edilmis (bbox çizili) görselleri kaydeder.
     """
 
-    def __init__(self, ft_model_path: str = None, base_model_path: str = "yolov8n.pt") -> None:
+    def __init__(
+        self,
+        ft_model_path: str = None,
+        base_model_path: str = "yolov8n.pt",
+        cache: Optional[ResultCache] = None,
+        registry: Optional[ModelRegistry] = None,
+        ft_precision: Optional[str] = None,
+        batching: Optional[bool] = None,
+        pool: Optional[InferencePool] = None,
+        tiling: Optional[bool] = None,
+        cascade: Optional[bool] = None,
+        artifacts: Optional[ArtifactStore] = None,
+        chunker: Optional[ChunkedVideoAnalyzer] = None,
+    ) -> None:
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         if ft_model_path is None:
             ft_model_path = os.path.join(base_dir, "..", "model", "best.pt")
@@ -25,127 +59,519 @@ class YoloPPEService:
         self.ft_model_path = os.path.abspath(ft_model_path)
         self.base_model_path = base_model_path
 
-        print("[YoloPPEService] Fine-tuned model yükleniyor:", self.ft_model_path)
-        self.ft_model = YOLO(self.ft_model_path)
+        # Modeller ilk kullanımda yüklenir ve aynı ağırlık dosyasını kullanan
+        # servisler arasında paylaşılır (bkz. ModelRegistry)
+        self._registry = registry if registry is not None else default_registry
+        self._class_names: Dict[str, Dict[int, str]] = {}
 
-        print("[YoloPPEService] Pretrained YOLOv8n yükleniyor:", self.base_model_path)
-        self.base_model = YOLO(self.base_model_path)
-
-        try:
-            self.ft_class_names = self.ft_model.model.names
-        except AttributeError:
-            self.ft_class_names = self.ft_model.names
-
-        try:
-            self.base_class_names = self.base_model.model.names
-        except AttributeError:
-            self.base_class_names = self.base_model.names
-
-        print("[YoloPPEService] Fine-tuned sınıflar:", self.ft_class_names)
-        print("[YoloPPEService] Base sınıflar:", self.base_class_names)
+        # "int8-*" ise fine-tuned model best.pt yerine INT8 ONNX varyantından yüklenir
+        self.ft_precision = ft_precision or settings.FT_MODEL_PRECISION
+        self._ft_source_path: Optional[str] = None
+        self._ft_source_lock = threading.Lock()
 
     
         self.upload_dir = os.path.join(base_dir, "..", "uploads")
         os.makedirs(self.upload_dir, exist_ok=True)
+        # overlay / thumbnail / video çıktıları shard'lı, kotalı depoya yazılır
+        if artifacts is None:
+            artifacts = ArtifactStore(
+                self.upload_dir,
+                settings.ARTIFACT_INDEX_PATH,
+                max_bytes=settings.ARTIFACT_MAX_BYTES,
+                max_age_s=settings.ARTIFACT_MAX_AGE_DAYS * 86400,
+                sweep_interval_s=settings.ARTIFACT_SWEEP_INTERVAL_S,
+                thumb_width=settings.ARTIFACT_THUMB_WIDTH,
+            )
+        self.artifacts = artifacts
+        # video çıktıları da isimlerin göreli olduğu kökte olmalı (dışarıdan verilen depo)
+        self.upload_dir = artifacts.root
+
+        # karşılaştırmalı analizde fine-tuned model bu havuzda koşar
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="yolo-compare")
+
+        # Eşzamanlı tekil fotoğraf istekleri model başına tek batch'te toplanır
+        # (video analizi kendi batch'lerini kurduğu için doğrudan modeli çağırır)
+        self.ft_broker: Optional[BatchingBroker] = None
+        self.base_broker: Optional[BatchingBroker] = None
+        if settings.INFERENCE_BATCHING if batching is None else batching:
+            self.ft_broker = BatchingBroker(
+                lambda: self._ft_predict, settings.INFERENCE_BATCH_MAX, settings.INFERENCE_BATCH_WAIT_MS, name="ft"
+            )
+            self.base_broker = BatchingBroker(
+                lambda: self._base_predict, settings.INFERENCE_BATCH_MAX, settings.INFERENCE_BATCH_WAIT_MS, name="base"
+            )
+
+        # INFERENCE_POOL_PROCESSES > 0 ise modeller bu süreçte değil, ayrı
+        # inference süreçlerinde koşar (ilk kullanımda başlatılır, bkz. InferencePool)
+        self._pool = pool
+        self.pool_processes = pool.processes if pool is not None else settings.INFERENCE_POOL_PROCESSES
+        self._pool_lock = threading.Lock()
+
+        # Uzun videolar keyframe hizalı parçalara bölünüp ayrı süreçlerde analiz
+        # edilir (sabit stride ile; VIDEO_CHUNK_PROCESSES > 0, bkz. ChunkedVideoAnalyzer)
+        self._chunker = chunker
+        self.chunk_processes = chunker.processes if chunker is not None else settings.VIDEO_CHUNK_PROCESSES
+        self._chunker_lock = threading.Lock()
+        # son warmup()'ın süreleri (yükleme + tahmin başına ısınma)
+        self.warmup_report: Optional[Dict[str, Any]] = None
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._warmup_stop = threading.Event()
+
+        # Büyük fotoğraflarda Person bölgeleri karolara bölünüp ayrıca taranır
+        self.tiling = settings.IMAGE_TILING if tiling is None else tiling
+        # base model kişileri bulur, fine-tuned model sadece kişi kırpıntılarında koşar
+        self.cascade = settings.INFERENCE_CASCADE if cascade is None else cascade
+
+        # Aynı dosya tekrar yüklenirse inference'ı atlamak için sonuç cache'i
+        self.cache = cache
+        self.ft_weights_id = None
+        self.base_weights_id = None
+        if self.cache is not None:
+            self.ft_weights_id = weights_identity(self.ft_model_path)
+            self.base_weights_id = weights_identity(self.base_model_path)
+            # ONNX çıktıları torch'tan birkaç piksel farklı olabilir; cache'ler karışmasın
+            if settings.INFERENCE_BACKEND != "torch":
+                self.ft_weights_id += ":" + settings.INFERENCE_BACKEND
+                self.base_weights_id += ":" + settings.INFERENCE_BACKEND
+            if self.ft_precision != "fp32":
+                self.ft_weights_id += ":" + self.ft_precision
+
+    # ---------- modeller (lazy) ----------
+    @property
+    def ft_source(self) -> str:
+        """Fine-tuned modelin gerçekte yüklendiği dosya (best.pt veya INT8 .onnx)."""
+        if self._ft_source_path is None:
+            with self._ft_source_lock:
+                if self._ft_source_path is None:
+                    from app.services.quantization import precision_variant
+
+                    self._ft_source_path = precision_variant(
+                        self.ft_model_path,
+                        self.ft_precision,
+                        settings.ONNX_CACHE_DIR,
+                        settings.ONNX_IMGSZ,
+                        settings.QUANT_CALIB_DIR,
+                        settings.QUANT_CALIB_IMAGES,
+                    )
+        return self._ft_source_path
+
+    @property
+    def ft_model(self):
+        return self._registry.get(self.ft_source)
+
+    @property
+    def base_model(self):
+        return self._registry.get(self.base_model_path)
+
+    @property
+    def pool(self) -> Optional[InferencePool]:
+        if not self.pool_processes:
+            return None
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = InferencePool(
+                        {"ft": self.ft_source, "base": self.base_model_path},
+                        processes=self.pool_processes,
+                        threads=settings.INFERENCE_POOL_THREADS,
+                        slots=settings.INFERENCE_POOL_SLOTS,
+                        depth=settings.INFERENCE_POOL_DEPTH,
+                        slot_bytes=settings.INFERENCE_POOL_SLOT_BYTES,
+                    )
+        return self._pool.start()
+
+    @property
+    def chunker(self) -> Optional[ChunkedVideoAnalyzer]:
+        if not self.chunk_processes:
+            return None
+        if self._chunker is None:
+            with self._chunker_lock:
+                if self._chunker is None:
+                    self._chunker = ChunkedVideoAnalyzer(
+                        self.ft_source, processes=self.chunk_processes, threads=settings.VIDEO_CHUNK_THREADS
+                    )
+        return self._chunker
+
+    def _names(self, which: str, key: str, path: str) -> Dict[int, str]:
+        # isimler bir kez okunur; model sonradan bellekten atılsa da tekrar yüklenmez
+        names = self._class_names.get(which)
+        if names is None:
+            if self.pool is not None:
+                names = self.pool.names(key)
+            else:
+                model = self._registry.get(path)
+                try:
+                    names = model.model.names
+                except AttributeError:
+                    names = model.names
+            self._class_names[which] = names
+            print(f"[YoloPPEService] {which} sınıflar:", names)
+        return names
+
+    @property
+    def ft_class_names(self) -> Dict[int, str]:
+        return self._names("Fine-tuned", "ft", self.ft_source)
+
+    @property
+    def base_class_names(self) -> Dict[int, str]:
+        return self._names("Base", "base", self.base_model_path)
+
+    @property
+    def _ft_name_to_id(self) -> Dict[str, int]:
+        return {v: k for k, v in self.ft_class_names.items()}
+
+    @property
+    def _ft_single(self):
+        """Tekil görsel inference'ı: havuz varsa havuz, batching açıksa broker, değilse model."""
+        if self.pool is not None:
+            return self.pool.model("ft")
+        return self.ft_broker or self._ft_predict
+
+    @property
+    def _base_single(self):
+        if self.pool is not None:
+            return self.pool.model("base")
+        return self.base_broker or self._base_predict
+
+    def _predict(self, which: str, source: Any, **kwargs: Any) -> List[Any]:
+        """
+        Bu süreçteki tek model çağrı noktası. Broker, video işleri, stream
+        izleme ve cascade aynı registry modelini paylaşır; ultralytics çağrı
+        argümanlarını (`imgsz` vb.) paylaşılan predictor'a yazdığı için çağrılar
+        model başına registry kilidiyle sıralanır.
+        """
+        path = self.ft_source if which == "ft" else self.base_model_path
+        kwargs.setdefault("verbose", False)
+        with self._registry.call_lock(path):
+            return self._registry.get(path)(source, **kwargs)
+
+    @property
+    def _ft_predict(self) -> Callable[..., List[Any]]:
+        return functools.partial(self._predict, "ft")
+
+    @property
+    def _base_predict(self) -> Callable[..., List[Any]]:
+        return functools.partial(self._predict, "base")
+
+    def submit_frames(self, frames: List[np.ndarray], **kwargs: Any) -> "Future[List[Any]]":
+        """Frame batch'i fine-tuned modele; havuz varsa beklemeden gönderilir, yoksa burada koşar."""
+        future: "Future[List[Any]]" = Future()
+        if self.cascade:
+            # iki aşama birbirine bağlı; havuz olsa da burada sırayla
+            _, stage2, _ = self._cascade(frames)
+            future.set_result([self._as_result(f, r, self.ft_class_names) for f, r in zip(frames, stage2)])
+            return future
+        if self.pool is not None:
+            future = self.pool.submit("ft", frames, **kwargs)
+            if metrics.enabled:
+                def observe(f: Future) -> None:
+                    if f.exception() is None:
+                        metrics.observe_results("ft", f.result())
+
+                future.add_done_callback(observe)
+            return future
+        future.set_result(metrics.observe_results("ft", self._predict("ft", frames, **kwargs)))
+        return future
+
+    # ---------- iki aşamalı (cascade) tespit ----------
+    def _run(self, which: str, frames: List[np.ndarray], **kwargs: Any) -> List[Any]:
+        """
+        Modeli broker'sız çağırır (broker `imgsz` gibi argümanları taşımaz).
+        Broker batch'leriyle aynı kilitten geçtiği için `imgsz` koşan bir
+        batch'in predictor argümanlarını değiştirmez.
+        """
+        if self.pool is not None:
+            return metrics.observe_results(which, self.pool.submit(which, frames, **kwargs).result())
+        return metrics.observe_results(which, self._predict(which, frames, **kwargs))
+
+    @staticmethod
+    def _as_result(image: np.ndarray, rows: np.ndarray, names: Dict[int, str]):
+        from ultralytics.engine.results import Results
+
+        return Results(image, path="", names=names, boxes=rows)
+
+    def _cascade(self, images: List[np.ndarray]):
+        person_id = {v.lower(): k for k, v in self.base_class_names.items()}.get("person")
+        side = settings.CASCADE_PERSON_SIDE
+
+        def detect_ppe(frames: List[np.ndarray], imgsz: Optional[int]) -> List[np.ndarray]:
+            kwargs = {"imgsz": imgsz} if imgsz else {}
+            return [result_rows(r) for r in self._run("ft", frames, **kwargs)]
+
+        return cascade_detect(
+            images,
+            lambda small: [result_rows(r) for r in self._run("base", small, imgsz=side)],
+            detect_ppe,
+            person_id,
+            person_side=side,
+            crop_size=settings.CASCADE_CROP_IMGSZ,
+            full_size=settings.ONNX_IMGSZ,
+            pad=settings.CASCADE_CROP_PAD,
+        )
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Broker'larda ve inference havuzunda bekleyen iş (metrikler için; havuzu başlatmaz)."""
+        depths = {}
+        for broker in (self.ft_broker, self.base_broker):
+            if broker is not None:
+                depths[f"broker_{broker.name}"] = broker.pending
+        if self._pool is not None and self._pool.ring is not None:
+            depths["pool_tasks"] = self._pool.pending
+            depths["pool_free_slots"] = self._pool.ring.free
+        return depths
+
+    def close(self) -> None:
+        for broker in (self.ft_broker, self.base_broker):
+            if broker is not None:
+                broker.close()
+        if self._pool is not None:
+            self._pool.close()
+        if self._chunker is not None:
+            self._chunker.close()
+        self._executor.shutdown(wait=False)
+
+    def warmup(self, background: bool = True, inference: Optional[bool] = None):
+        """
+        İki modeli de önceden yükler (uygulama açılışında). `inference` (varsayılan
+        settings.MODEL_WARMUP_INFERENCE) açıksa ardından her model, isteklerde
+        kullanılan giriş boyutlarında boş görsellerle birer kez çalıştırılır.
+        """
+        if inference is None:
+            inference = settings.MODEL_WARMUP_INFERENCE
+
+        # INT8 varyantın ilk üretimi (export + kalibrasyon) de ısınmanın parçası
+        def run() -> None:
+            t0 = time.perf_counter()
+            try:
+                source = self.ft_source
+            except Exception as e:  # ilk gerçek istekte tekrar denenir
+                print("[YoloPPEService] Fine-tuned model hazırlanamadı:", e)
+                source = None
+            if source is not None and self.pool_processes:
+                # modeller inference süreçlerinde yüklenir, bu süreçte değil
+                while not self.pool.wait_ready(0.5):
+                    if self._warmup_stop.is_set():
+                        return
+            else:
+                self._registry.warmup([p for p in (source, self.base_model_path) if p], background=False)
+            if self._warmup_stop.is_set():
+                return
+            report: Dict[str, Any] = {"load_s": round(time.perf_counter() - t0, 3)}
+            if inference and source is not None:
+                report["inference_s"] = self._warmup_inference()
+            self.warmup_report = report
+            print("[YoloPPEService] Isınma tamamlandı:", report)
+
+        if not background:
+            run()
+            return None
+        t = threading.Thread(target=run, name="model-warmup", daemon=True)
+        self._warmup_thread = t
+        t.start()
+        return t
+
+    def stop_warmup(self, timeout: Optional[float] = None) -> None:
+        """Arka plan ısınmasını durdurur ve bitmesini bekler (kapanışta, modeller kapatılmadan önce)."""
+        self._warmup_stop.set()
+        t = self._warmup_thread
+        if t is not None:
+            t.join(timeout)
+
+    def _warmup_passes(self) -> List[Tuple[str, Optional[int]]]:
+        """İsteklerde modellerin çağrıldığı (model, imgsz) çiftleri; None = modelin kendi imgsz'i."""
+        if self.cascade:
+            return [
+                ("base", settings.CASCADE_PERSON_SIDE),
+                ("ft", settings.CASCADE_CROP_IMGSZ),
+                ("ft", settings.ONNX_IMGSZ),
+            ]
+        return [("ft", None), ("base", None)]
+
+    def _warmup_inference(self) -> Dict[str, float]:
+        """
+        İlk tahmin graf kurulumu, bellek ayırma ve conv+bn fuse'u öder; letterbox
+        sonrası tensör şekli görselin en-boy oranına bağlı olduğu için her
+        MODEL_WARMUP_SHAPES boyutunda ayrı bir geçiş yapılır. Metriklere yazılmaz.
+        """
+        shapes = []
+        for item in filter(None, (s.strip() for s in settings.MODEL_WARMUP_SHAPES.split(","))):
+            w, h = item.lower().split("x")
+            shapes.append((int(w), int(h)))
+
+        timings: Dict[str, float] = {}
+        for which, imgsz in self._warmup_passes():
+            kwargs = {"imgsz": imgsz} if imgsz else {}
+            for w, h in shapes:
+                if self._warmup_stop.is_set():
+                    return timings
+                frame = np.full((h, w, 3), 114, dtype=np.uint8)
+                t0 = time.perf_counter()
+                try:
+                    if self.pool is not None:
+                        # her süreç kendi kopyasını ısıtsın: süreç sayısı kadar eşzamanlı iş
+                        for f in [self.pool.submit(which, [frame], **kwargs) for _ in range(self.pool.processes)]:
+                            f.result()
+                    else:
+                        self._predict(which, [frame], **kwargs)
+                except Exception as e:  # ısınma isteği bloklamamalı; ilk gerçek istek yine çalışır
+                    print("[YoloPPEService] Isınma tahmini başarısız:", which, imgsz, e)
+                    return timings
+                timings[f"{which}@{imgsz or 'model'} {w}x{h}"] = round(time.perf_counter() - t0, 3)
+        return timings
+
+    def set_base_idle_timeout(self, seconds: Optional[float]) -> None:
+        """Seyrek kullanılan karşılaştırma modelini boşta kalınca bellekten at."""
+        self._registry.set_idle_timeout(self.base_model_path, seconds)
+
+    def _cache_key(self, path: str, content_hash: Optional[str], kind: str, *parts: Any) -> Optional[str]:
+        if self.cache is None:
+            return None
+        if content_hash is None:
+            content_hash = file_sha256(path)
+        return self.cache.make_key(content_hash, kind, *parts)
+
+    def _cache_get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        hit = self.cache.get(key)
+        # cache'teki nesne paylaşılıyor, çağıran değiştirebilsin diye kopya
+        return copy.deepcopy(hit) if hit is not None else None
+
+    def _cache_put(self, key: Optional[str], value: Dict[str, Any]) -> None:
+        if key is not None:
+            self.cache.put(key, copy.deepcopy(value))
 
   
    
-    def _save_overlay(self, result, prefix: str) -> str:
-        frame = result.plot()     # YOLO'nun çizdiği (H,W,3) NumPy görseli
-
-        filename = f"{prefix}_{uuid.uuid4().hex}.jpg"
-        save_path = os.path.join(self.upload_dir, filename)
-
-        cv2.imwrite(save_path, frame)
-        return filename  
+    def _save_overlay(self, result, prefix: str, thumbnail: bool = False) -> Tuple[str, Optional[str]]:
+        """(overlay ismi, thumbnail ismi); isimler upload_dir'e göre göreli (ab/cd/ft_<hash>.jpg)."""
+        with metrics.stage("overlay_plot"):
+            frame = result.plot()     # YOLO'nun çizdiği (H,W,3) NumPy görseli
+        return self.artifacts.put_image(frame, prefix, thumbnail=thumbnail)
 
     #  TEK MODEL ANALİZ (fotoğraf)
     # ================================================================
-    def analyze_image(self, image_path: str) -> Dict[str, Any]:
-        result = self.ft_model(image_path)[0]
-        overlay_name = self._save_overlay(result, "ft")
-
-        detections = []
-        for box in result.boxes:
-            cls_id = int(box.cls[0])
-            conf = float(box.conf[0])
-            x1, y1, x2, y2 = box.xyxy[0].tolist()
-
-            detections.append({
-                "class_id": cls_id,
-                "class_name": self.ft_class_names.get(cls_id, str(cls_id)),
-                "confidence": conf,
-                "bbox": [x1, y1, x2, y2]
-            })
+    def analyze_image(self, image_path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+        kind = "image_tiled" if self.tiling else "image"
+        key = self._cache_key(image_path, content_hash, kind, self.ft_weights_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
 
-        return {
+        result = self._ft_detect(image_path)
+        overlay_name, thumbnail = self._save_overlay(result, "ft", thumbnail=True)
+
+        detections, _ = parse_result(result, self.ft_class_names)
+
+        out = {
             "detections": detections,
             "overlay_image": overlay_name,
+            "thumbnail": thumbnail,
         }
+        self._cache_put(key, out)
+        return out
 
    
+    def _ft_detect(self, source: Any):
+        """
+        Fine-tuned model ile tek görsel. Tiling açıksa ve görsel büyükse tam frame
+        geçişinde bulunan Person kutularının çevresi örtüşen karolara bölünür,
+        karolar tek batch'te taranır ve sonuçlar sınıf bazlı NMS ile birleştirilir
+        (uzaktaki çalışanların küçülmede kaybolan kask / yelekleri için).
+        """
+        result = metrics.observe_results("ft", self._ft_single(source))[0]
+        if not self.tiling:
+            return result
+
+        image = result.orig_img
+        merged, n_tiles = sliced_detect(
+            image,
+            result_rows(result),
+            lambda crops: [result_rows(r) for r in metrics.observe_results("ft", self._ft_single(crops))],
+            self._ft_name_to_id.get("Person"),
+            imgsz=settings.ONNX_IMGSZ,
+            overlap=settings.IMAGE_TILING_OVERLAP,
+            min_side=settings.IMAGE_TILING_MIN_SIDE,
+        )
+        if n_tiles == 0:
+            return result
+
+        from ultralytics.engine.results import Results
+
+        return Results(image, path=result.path, names=result.names, boxes=merged)
+
     #  PRETRAINED + FINE-TUNED KARŞILAŞTIRMALI ANALİZ
     # ================================================================
-    def analyze_image_compare(self, image_path: str) -> Dict[str, Any]:
-        ft_res = self.ft_model(image_path)[0]
-        base_res = self.base_model(image_path)[0]
-
-        ft_overlay = self._save_overlay(ft_res, "ft")
-        base_overlay = self._save_overlay(base_res, "base")
-
-        def parse(result, class_names):
-            dets = []
-            for box in result.boxes:
-                cls_id = int(box.cls[0])
-                conf = float(box.conf[0])
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-
-                dets.append({
-                    "class_id": cls_id,
-                    "class_name": class_names.get(cls_id, str(cls_id)),
-                    "confidence": conf,
-                    "bbox": [x1, y1, x2, y2]
-                })
-
-            c = Counter([d["class_name"] for d in dets])
-
-            return dets, dict(c)
-
-        ft_det, ft_counts = parse(ft_res, self.ft_class_names)
-        base_det, base_counts = parse(base_res, self.base_class_names)
-
-        return {
-            "fine_tuned": {
-                "detections": ft_det,
-                "counts": ft_counts,
-                "overlay_image": ft_overlay,
-            },
-            "pretrained": {
-                "detections": base_det,
-                "counts": base_counts,
-                "overlay_image": base_overlay,
-            }
+    def _analyze_array(self, detect, class_names, image, prefix: str, thumbnail: bool = False) -> Dict[str, Any]:
+        result = detect(image)
+        overlay, thumb = self._save_overlay(result, prefix, thumbnail=thumbnail)
+        dets, counts = parse_result(result, class_names)
+        out = {
+            "detections": dets,
+            "counts": counts,
+            "overlay_image": overlay,
         }
+        if thumbnail:
+            out["thumbnail"] = thumb     # denetim listesinde gösterilir
+        return out
+
+    def analyze_image_compare(
+        self,
+        image_path: str,
+        content_hash: Optional[str] = None,
+        image: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        kind = "compare_cascade" if self.cascade else "compare_tiled" if self.tiling else "compare"
+        key = self._cache_key(image_path, content_hash, kind, self.ft_weights_id, self.base_weights_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        # Görsel bir kez decode edilir, iki model aynı diziyi paylaşır
+        if image is None:
+            with metrics.stage("decode"):
+                image = cv2.imread(image_path)
+        if image is None:
+            raise RuntimeError(f"Görsel okunamadı: {image_path}")
+
+        if self.cascade:
+            # "pretrained" sonucu kişi aşamasının (küçültülmüş frame) tespitleri
+            stage1, stage2, _ = self._cascade([image])
+            ft_res = self._as_result(image, stage2[0], self.ft_class_names)
+            base_res = self._as_result(image, stage1[0], self.base_class_names)
+            detect_ft, detect_base = (lambda img: ft_res), (lambda img: base_res)
+        else:
+            detect_ft, detect_base = self._ft_detect, (lambda img: metrics.observe_results("base", self._base_single(img))[0])
+
+        # inference + overlay encode her model için ayrı thread'de, paralel
+        ft_future = self._executor.submit(
+            self._analyze_array, detect_ft, self.ft_class_names, image, "ft", True
+        )
+        base = self._analyze_array(detect_base, self.base_class_names, image, "base")
+        ft = ft_future.result()
+
+        out = {
+            "fine_tuned": ft,
+            "pretrained": base,
+        }
+        self._cache_put(key, out)
+        return out
 
   
         #  VIDEO: bbox çizilmiş video çıktısı
     # ================================================================
-    def analyze_video(self, video_path: str, frame_stride: int = 10) -> Dict[str, Any]:
+    def _open_video(self, video_path: str):
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             raise RuntimeError(f"Video açılamadı: {video_path}")
-        
-        out_name = f"video_result_{uuid.uuid4().hex}.mp4"
-        out_path = os.path.join(self.upload_dir, out_name)
-        
+
          # FPS güven
         fps = cap.get(cv2.CAP_PROP_FPS)
         if fps is None or fps <= 0:
-            fps = 25.0  
-            
-            
+            fps = 25.0
+
         w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))    
+        h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         if w == 0 or h == 0:
             ret, frame = cap.read()
             if not ret:
@@ -155,54 +581,30 @@ class YoloPPEService:
             # başa sar
             cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
 
-        fourcc = cv2.VideoWriter_fourcc(*"mpv4")
-        writer = cv2.VideoWriter(out_path, fourcc, fps, (w, h))    
+        return cap, fps, w, h
+
+    def _open_writer(self, out_path: str, fps: float, w: int, h: int) -> cv2.VideoWriter:
+        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+        writer = cv2.VideoWriter(out_path, fourcc, fps, (w, h))
         if not writer.isOpened():
-            cap.release()
             raise RuntimeError("VideoWriter açılamadı, codec sorunu olabilir.")
-
-        
-
-        frame_idx = 0
-        frames_analyzed = 0
-
-        total_person = 0
-        total_helmet = 0
-        total_vest = 0
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            if frame_idx % frame_stride == 0:
-                results = self.ft_model(frame)[0]
-                frames_analyzed += 1
-
-                # YOLO'nun çizili frame'i
-                plotted = results.plot()
-                writer.write(plotted)
-
-                # sayaçlar
-                for box in results.boxes:
-                    cls_id = int(box.cls[0])
-                    name = self.ft_class_names.get(cls_id, "")
-                    if name == "Person":
-                        total_person += 1
-                    elif name == "helmet":
-                        total_helmet += 1
-                    elif name == "vest":
-                        total_vest += 1
-            else:
-                
-                writer.write(frame)
-
-            frame_idx += 1
-
-        cap.release()
-        writer.release()
-
-        # Risk analizi
+        return writer
+
+    def ppe_boxes(self, result) -> Dict[str, np.ndarray]:
+        """Person / helmet / vest kutularını (N,4) xyxy dizileri olarak ayırır."""
+        cls, _, xyxy = result_arrays(result)
+        return self._split_ppe(cls, xyxy, self._ft_name_to_id)
+
+    @staticmethod
+    def _split_ppe(cls: np.ndarray, xyxy: np.ndarray, name_to_id: Dict[str, int]) -> Dict[str, np.ndarray]:
+        out = {}
+        for name in ("Person", "helmet", "vest"):
+            out[name] = xyxy[cls == name_to_id.get(name, -1)]
+        return out
+
+    @staticmethod
+    def video_risk(total_person: int, total_helmet: int, total_vest: int) -> Dict[str, Any]:
+        """Benzersiz kişi / kasklı / yelekli sayılarından risk özeti (video ve canlı izleme)."""
         helmet_ratio = total_helmet / total_person if total_person > 0 else 0
         vest_ratio = total_vest / total_person if total_person > 0 else 0
 
@@ -213,12 +615,287 @@ class YoloPPEService:
             risk = "medium"
 
         return {
-            "video_overlay": out_name,
-            "frames_analyzed": frames_analyzed,
             "total_person": total_person,
             "total_with_helmet": total_helmet,
             "total_with_vest": total_vest,
             "helmet_ratio": helmet_ratio,
             "vest_ratio": vest_ratio,
             "risk_level": risk,
-        }
\ No newline at end of file
+        }
+
+    def analyze_video(
+        self,
+        video_path: str,
+        frame_stride: int = 10,
+        batch_size: int = 8,
+        queue_size: int = 64,
+        progress: Optional[Callable[[int, int], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        content_hash: Optional[str] = None,
+        sampler: Optional[FrameSampler] = None,
+        output: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Decode -> batch inference -> encode aşamalı pipeline.
+        Hangi frame'lerin analiz edileceğine `sampler` karar verir (verilmezse her
+        `frame_stride` frame'den biri, bkz. MotionSampler); analiz edilen frame'ler
+        `batch_size`'lık gruplar halinde tek `ft_model` çağrısıyla işlenir; inference
+        havuzu varsa worker sayısı kadar batch aynı anda farklı süreçlerde koşar.
+        Analiz edilmeyen frame'lere son tespitlerin kutuları çizilir.
+
+        `output` (varsayılan settings.VIDEO_OUTPUT_MODE) overlay videosunu seçer:
+        "none" (sadece metrikler), "full", "downscaled", "highlights" veya
+        "segments" (bkz. OverlayWriter). Çıktının boyutu ve çizim + encode süresi
+        `video_output` altında döner.
+
+        `progress(frames_done, frames_total)` her batch sonrası çağrılır;
+        `should_cancel()` True dönerse AnalysisCancelled fırlatılır.
+
+        Kişiler PersonTracker ile frame'ler arasında takip edilir; total_person,
+        total_with_helmet / total_with_vest ve oranlar benzersiz kişi başınadır.
+        Ham kutu-frame sayıları `box_detections` altında durur.
+        """
+        output = output or settings.VIDEO_OUTPUT_MODE
+        sampling = frame_stride if sampler is None else sampler.key
+        sampler = sampler or FixedStrideSampler(frame_stride)
+        if self.cache is not None and content_hash is None:
+            content_hash = file_sha256(video_path)
+
+        def cache_key(layout: str) -> Optional[str]:
+            # parçalı sonuç parça başına overlay ve `chunks` taşır; sıralıyla aynı anahtarı paylaşmaz.
+            # cascade'de kişileri base model bulur, onun ağırlıkları da sonucu belirler
+            cascade = self.base_weights_id if self.cascade else None
+            return self._cache_key(
+                video_path, content_hash, "video_tracked",
+                self.ft_weights_id, sampling, output, self.cascade, cascade, layout,
+            )
+
+        # Parçalı analiz sadece sabit stride'da (hareket örneklemesi frame'den frame'e
+        # durum taşır, parça sınırında farklı karar verirdi) ve cascade kapalıyken
+        if self.chunker is not None and isinstance(sampler, FixedStrideSampler) and not self.cascade:
+            key = cache_key("chunked")
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+            summary = self._analyze_video_chunked(video_path, sampler.stride, batch_size, progress, should_cancel, output)
+            if summary is not None:
+                self._cache_put(key, summary)
+                return summary
+
+        key = cache_key("sequential")
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        cap, fps, w, h = self._open_video(video_path)
+        frames_total = max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+
+        writer = None
+        if output != "none":
+            try:
+                writer = OverlayWriter(
+                    self.upload_dir,
+                    self.artifacts.reserve("video_result"),
+                    fps,
+                    (w, h),
+                    BoxRenderer(self.ft_class_names),
+                    mode=output,
+                    max_width=settings.VIDEO_OUTPUT_MAX_WIDTH,
+                    highlight_fps=settings.VIDEO_HIGHLIGHT_FPS,
+                    segment_s=settings.VIDEO_SEGMENT_S,
+                    fourcc=settings.VIDEO_OUTPUT_FOURCC,
+                )
+            except Exception:
+                cap.release()
+                raise
+
+        frames_analyzed = 0
+        frames_done = 0
+        totals = {"Person": 0, "helmet": 0, "vest": 0}   # kutu-frame sayıları
+        # aynı kişinin her frame'de tekrar sayılmaması için takip
+        tracker = PersonTracker(max_gap=3 * sampler.max_gap)
+        sampler.reset()
+        last_res = None   # atlanan frame'lerin overlay'i için son tespit
+
+        try:
+            with VideoPipeline(cap, writer, queue_size=queue_size) as pipe:
+                pending: List[List[Any]] = []   # [frame, analiz edilecek mi, frame_idx] - sırayı korur
+                batch: List[Any] = []
+                # havuzun paylaşımlı belleğine sığan kadar batch aynı anda yolda (bkz.
+                # InferencePool.depth); sonuçlar gönderim sırasıyla işlenir (tracker sırası bozulmaz)
+                in_flight: deque = deque()
+                depth = self.pool.depth if self.pool is not None else 0
+
+                def finish(items: List[List[Any]], future: Optional[Future]) -> None:
+                    nonlocal frames_analyzed, frames_done, last_res
+                    plotted = iter(future.result() if future is not None else ())
+
+                    for item in items:
+                        if item[1]:
+                            res = last_res = next(plotted)
+                            frames_analyzed += 1
+                            ppe = self.ppe_boxes(res)
+                            tracker.update(item[2], ppe["Person"], ppe["helmet"], ppe["vest"])
+                            for name, b in ppe.items():
+                                totals[name] += len(b)
+                            pipe.write((item[0], res, True))
+                        elif last_res is not None and len(last_res.boxes):
+                            pipe.write((item[0], last_res, False))
+                        else:
+                            pipe.write((item[0], None, False))
+
+                    frames_done += len(items)
+                    if progress is not None:
+                        progress(frames_done, max(frames_total, frames_done))
+
+                def flush(drain: bool = False) -> None:
+                    in_flight.append((list(pending), self.submit_frames(list(batch)) if batch else None))
+                    pending.clear()
+                    batch.clear()
+                    while len(in_flight) > (0 if drain else depth):
+                        finish(*in_flight.popleft())
+
+                for frame_idx, frame in pipe.frames():
+                    if should_cancel is not None and should_cancel():
+                        raise AnalysisCancelled(f"Video analizi iptal edildi: {video_path}")
+
+                    sampled = sampler.should_sample(frame_idx, frame)
+                    pending.append([frame, sampled, frame_idx])
+                    if sampled:
+                        batch.append(frame)
+                        if len(batch) >= batch_size:
+                            flush()
+
+                flush(drain=True)
+        except BaseException:
+            # yarım kalan çıktı videosunu bırakma
+            if writer is not None:
+                writer.discard()
+            raise
+
+        summary = writer.summary() if writer is not None else {"video_overlay": None, "video_output": {"mode": "none"}}
+        if writer is not None:
+            for name in writer.files:
+                self.artifacts.add(name, "video")
+        summary["frames_analyzed"] = frames_analyzed
+        # Oranlar benzersiz kişi başına
+        people = tracker.summary()
+        summary.update(self.video_risk(people["persons"], people["with_helmet"], people["with_vest"]))
+        summary["box_detections"] = totals
+        self._cache_put(key, summary)
+        return summary
+
+    def _analyze_video_chunked(
+        self,
+        video_path: str,
+        stride: int,
+        batch_size: int,
+        progress: Optional[Callable[[int, int], None]],
+        should_cancel: Optional[Callable[[], bool]],
+        output: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Videoyu keyframe hizalı parçalara bölüp ChunkedVideoAnalyzer süreçlerinde
+        paralel analiz eder. Süreçler sadece örneklenen frame'lerin kutularını
+        döndürür; takip ve sayaçlar burada, frame sırasıyla tek PersonTracker'da
+        hesaplanır. Bu yüzden benzersiz kişi sayıları ve risk aynı stride ile
+        sıralı analizle birebir aynıdır (parça sınırında track'ler kopmaz).
+        Overlay her parça için ayrı dosyadır ve `video_segments` altında sırayla
+        döner. Video iki parçaya bölünemeyecek kadar kısaysa None döner.
+        """
+        chunker = self.chunker
+        keyframes, n_frames = keyframe_index(video_path)
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        cap.release()
+        # süreç sayısının iki katı parça: biri uzun sürerse diğer süreçler boş kalmaz
+        segments = plan_segments(
+            keyframes, n_frames, 2 * chunker.processes, stride, min_frames=int(settings.VIDEO_CHUNK_MIN_S * fps)
+        )
+        if len(segments) < 2:
+            return None
+
+        base_name = None
+        options: Dict[str, Any] = {}
+        if output != "none":
+            base_name = self.artifacts.reserve("video_result")
+            os.makedirs(os.path.join(self.upload_dir, base_name), exist_ok=True)
+            options = {
+                "max_width": settings.VIDEO_OUTPUT_MAX_WIDTH,
+                "highlight_fps": settings.VIDEO_HIGHLIGHT_FPS,
+                "segment_s": settings.VIDEO_SEGMENT_S,
+                "fourcc": settings.VIDEO_OUTPUT_FOURCC,
+            }
+
+        futures = [
+            chunker.submit(
+                video_path,
+                start,
+                stop,
+                stride=stride,
+                batch_size=batch_size,
+                upload_dir=self.upload_dir,
+                base_name=f"{base_name}/part_{i:03d}" if base_name else None,
+                output=output,
+                output_options=options,
+            )
+            for i, (start, stop) in enumerate(segments)
+        ]
+        try:
+            pending = set(futures)
+            frames_done = 0
+            while pending:
+                if should_cancel is not None and should_cancel():
+                    raise AnalysisCancelled(f"Video analizi iptal edildi: {video_path}")
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for f in finished:
+                    frames_done += f.result()["frames"]
+                    if progress is not None:
+                        progress(frames_done, max(n_frames, frames_done))
+            parts = [f.result() for f in futures]
+        except BaseException as e:
+            for f in futures:
+                f.cancel()
+            wait(futures)     # çalışan parçalar bitmeden yazdıkları dosyalar silinemez
+            if base_name is not None:
+                shutil.rmtree(os.path.join(self.upload_dir, base_name), ignore_errors=True)
+            if isinstance(e, BrokenProcessPool):
+                chunker.reset()
+            raise
+
+        name_to_id = {v: k for k, v in parts[0]["names"].items()}
+        tracker = PersonTracker(max_gap=3 * stride)
+        totals = {"Person": 0, "helmet": 0, "vest": 0}
+        frames_analyzed = 0
+        for part in parts:
+            for frame_idx, rows in part["detections"]:
+                ppe = self._split_ppe(rows[:, 5].astype(np.int64), rows[:, :4], name_to_id)
+                tracker.update(frame_idx, ppe["Person"], ppe["helmet"], ppe["vest"])
+                for name, b in ppe.items():
+                    totals[name] += len(b)
+                frames_analyzed += 1
+
+        files = [f for part in parts for f in part["files"]]
+        for name in files:
+            self.artifacts.add(name, "video")
+        if output == "none":
+            summary: Dict[str, Any] = {"video_overlay": None, "video_output": {"mode": "none"}}
+        else:
+            outs = [part["output"]["video_output"] for part in parts]
+            summary = {
+                "video_overlay": None,
+                "video_output": {
+                    "mode": output,
+                    "bytes": sum(o["bytes"] for o in outs),
+                    "encode_seconds": round(sum(o["encode_seconds"] for o in outs), 3),
+                    "size": outs[0]["size"],
+                    "fps": outs[0]["fps"],
+                },
+                "video_segments": files,
+            }
+        summary["chunks"] = {"processes": chunker.processes, "segments": [[p["start"], p["stop"]] for p in parts]}
+        summary["frames_analyzed"] = frames_analyzed
+        people = tracker.summary()
+        summary.update(self.video_risk(people["persons"], people["with_helmet"], people["with_vest"]))
+        summary["box_detections"] = totals
+        return summary
@@ -0,0 +1,14 @@
+from app.storage.base import StorageBackend
+from app.storage.memory import MemoryStorage
+from app.storage.sqlite import SQLiteStorage
+
+
+def create_storage(backend: str, sqlite_path: str = "") -> StorageBackend:
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "sqlite":
+        return SQLiteStorage(sqlite_path)
+    raise ValueError(f"Bilinmeyen storage backend: {backend}")
+
+
+__all__ = ["StorageBackend", "MemoryStorage", "SQLiteStorage", "create_storage"]
@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.inspection_model import SafetyInspection
+from app.models.site_model import Site
+from app.models.worker_model import Worker
+
+
+class StorageBackend(ABC):
+    """
+    Servislerin kullandığı kalıcılık katmanı.
+    ID'leri backend atar; listeleme metotları `limit` / `offset` veya
+    `after_id` (keyset) ile sayfalanabilir, sonuçlar id'ye göre artan sıradadır.
+    Denetimler `descending=True` ile en yeniden eskiye, `before_id` keyset'iyle listelenebilir.
+    """
+
+    # ---------- sites ----------
+    @abstractmethod
+    def insert_site(self, data: Dict[str, Any]) -> Site: ...
+
+    @abstractmethod
+    def get_site(self, site_id: int) -> Optional[Site]: ...
+
+    @abstractmethod
+    def list_sites(
+        self, limit: Optional[int] = None, offset: int = 0, after_id: Optional[int] = None
+    ) -> List[Site]: ...
+
+    @abstractmethod
+    def count_sites(self) -> int: ...
+
+    # ---------- workers ----------
+    @abstractmethod
+    def insert_worker(self, data: Dict[str, Any]) -> Worker: ...
+
+    @abstractmethod
+    def list_workers(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        site_id: Optional[int] = None,
+    ) -> List[Worker]: ...
+
+    @abstractmethod
+    def count_workers(self, site_id: Optional[int] = None) -> int: ...
+
+    # ---------- inspections ----------
+    @abstractmethod
+    def insert_inspection(self, data: Dict[str, Any]) -> SafetyInspection: ...
+
+    @abstractmethod
+    def bulk_insert_inspections(self, rows: Iterable[Dict[str, Any]]) -> int: ...
+
+    @abstractmethod
+    def get_inspection(self, inspection_id: int) -> Optional[SafetyInspection]: ...
+
+    @abstractmethod
+    def list_inspections(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        site_id: Optional[int] = None,
+        risk_level: Optional[str] = None,
+        before_id: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[SafetyInspection]: ...
+
+    @abstractmethod
+    def count_inspections(self, site_id: Optional[int] = None, risk_level: Optional[str] = None) -> int: ...
+
+    @abstractmethod
+    def risk_counts(self) -> Dict[Tuple[int, str], int]:
+        """(site_id, risk_level) -> denetim sayısı; açılışta risk özetlerini kurmak için."""
+
+    def close(self) -> None:
+        pass
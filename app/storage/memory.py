@@ -0,0 +1,147 @@
+import bisect
+import threading
+from typing import Any, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from app.models.inspection_model import SafetyInspection
+from app.models.site_model import Site
+from app.models.worker_model import Worker
+from app.storage.base import StorageBackend
+
+T = TypeVar("T")
+
+
+class _Index(Generic[T]):
+    """id'ye göre sıralı kayıt listesi; after_id sayfalaması bisect ile O(log n)."""
+
+    def __init__(self) -> None:
+        self.items: List[T] = []
+        self.ids: List[int] = []
+
+    def add(self, item: T) -> None:
+        # id'ler artan atandığı için append sıralı kalır
+        self.items.append(item)
+        self.ids.append(item.id)
+
+    def page(self, limit: Optional[int], offset: int, after_id: Optional[int]) -> List[T]:
+        start = bisect.bisect_right(self.ids, after_id) if after_id is not None else 0
+        start += offset
+        end = None if limit is None else start + limit
+        return self.items[start:end]
+
+    def page_desc(self, limit: Optional[int], offset: int, before_id: Optional[int]) -> List[T]:
+        """En yeniden eskiye; `before_id`'den küçük id'ler."""
+        end = bisect.bisect_left(self.ids, before_id) if before_id is not None else len(self.ids)
+        end = max(end - offset, 0)
+        start = 0 if limit is None else max(end - limit, 0)
+        return self.items[start:end][::-1]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class MemoryStorage(StorageBackend):
+    """Süreç belleğinde tutulan backend (yeniden başlatınca veriler kaybolur)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+        self._sites: _Index[Site] = _Index()
+        self._sites_by_id: Dict[int, Site] = {}
+
+        self._workers: Dict[Optional[int], _Index[Worker]] = {None: _Index()}
+
+        # (site_id, risk_level) -> indeks; None = filtre yok
+        self._inspections: Dict[Tuple[Optional[int], Optional[str]], _Index[SafetyInspection]] = {
+            (None, None): _Index()
+        }
+        self._inspections_by_id: Dict[int, SafetyInspection] = {}
+
+        self._next_site_id = 1
+        self._next_worker_id = 1
+        self._next_inspection_id = 1
+
+    # ---------- sites ----------
+    def insert_site(self, data: Dict[str, Any]) -> Site:
+        with self._lock:
+            site = Site(id=self._next_site_id, **data)
+            self._next_site_id += 1
+            self._sites.add(site)
+            self._sites_by_id[site.id] = site
+            return site
+
+    def get_site(self, site_id: int) -> Optional[Site]:
+        return self._sites_by_id.get(site_id)
+
+    def list_sites(self, limit=None, offset=0, after_id=None) -> List[Site]:
+        return self._sites.page(limit, offset, after_id)
+
+    def count_sites(self) -> int:
+        return len(self._sites)
+
+    # ---------- workers ----------
+    def insert_worker(self, data: Dict[str, Any]) -> Worker:
+        with self._lock:
+            worker = Worker(id=self._next_worker_id, **data)
+            self._next_worker_id += 1
+            self._workers[None].add(worker)
+            if worker.site_id is not None:
+                self._workers.setdefault(worker.site_id, _Index()).add(worker)
+            return worker
+
+    def list_workers(self, limit=None, offset=0, after_id=None, site_id=None) -> List[Worker]:
+        index = self._workers.get(site_id)
+        return index.page(limit, offset, after_id) if index is not None else []
+
+    def count_workers(self, site_id: Optional[int] = None) -> int:
+        index = self._workers.get(site_id)
+        return len(index) if index is not None else 0
+
+    # ---------- inspections ----------
+    def _add_inspection(self, data: Dict[str, Any]) -> SafetyInspection:
+        inspection = SafetyInspection(id=self._next_inspection_id, **data)
+        self._next_inspection_id += 1
+        self._inspections_by_id[inspection.id] = inspection
+        s, r = inspection.site_id, inspection.risk_level
+        for key in ((None, None), (s, None), (None, r), (s, r)):
+            index = self._inspections.get(key)
+            if index is None:
+                index = self._inspections[key] = _Index()
+            index.add(inspection)
+        return inspection
+
+    def insert_inspection(self, data: Dict[str, Any]) -> SafetyInspection:
+        with self._lock:
+            return self._add_inspection(data)
+
+    def bulk_insert_inspections(self, rows: Iterable[Dict[str, Any]]) -> int:
+        n = 0
+        with self._lock:
+            for data in rows:
+                self._add_inspection(data)
+                n += 1
+        return n
+
+    def get_inspection(self, inspection_id: int) -> Optional[SafetyInspection]:
+        return self._inspections_by_id.get(inspection_id)
+
+    def list_inspections(
+        self, limit=None, offset=0, after_id=None, site_id=None, risk_level=None, before_id=None, descending=False
+    ) -> List[SafetyInspection]:
+        index = self._inspections.get((site_id, risk_level))
+        if index is None:
+            return []
+        if descending:
+            return index.page_desc(limit, offset, before_id)
+        return index.page(limit, offset, after_id)
+
+    def count_inspections(self, site_id: Optional[int] = None, risk_level: Optional[str] = None) -> int:
+        index = self._inspections.get((site_id, risk_level))
+        return len(index) if index is not None else 0
+
+    def risk_counts(self) -> Dict[Tuple[int, str], int]:
+        with self._lock:
+            return {
+                (s, r): len(index)
+                for (s, r), index in self._inspections.items()
+                if s is not None and r is not None
+            }
@@ -0,0 +1,205 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.inspection_model import SafetyInspection
+from app.models.site_model import Site
+from app.models.worker_model import Worker
+from app.storage.base import StorageBackend
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    name       TEXT NOT NULL,
+    location   TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    supervisor TEXT
+);
+
+CREATE TABLE IF NOT EXISTS workers (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    name       TEXT NOT NULL,
+    role       TEXT NOT NULL,
+    site_id    INTEGER,
+    ppe_status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_workers_site ON workers (site_id, id);
+
+CREATE TABLE IF NOT EXISTS inspections (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    site_id      INTEGER NOT NULL,
+    inspector    TEXT NOT NULL,
+    risk_level   TEXT NOT NULL,
+    notes        TEXT,
+    file_name    TEXT,
+    detected_ppe TEXT,
+    thumbnail    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_inspections_site ON inspections (site_id, id);
+CREATE INDEX IF NOT EXISTS idx_inspections_risk ON inspections (risk_level, id);
+CREATE INDEX IF NOT EXISTS idx_inspections_site_risk ON inspections (site_id, risk_level, id);
+"""
+
+_INSPECTION_COLS = ("site_id", "inspector", "risk_level", "notes", "file_name", "detected_ppe", "thumbnail")
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Yerel bir SQLite dosyasında kalıcı backend.
+    Tek bağlantı + kilit; WAL modu sayesinde okuma yazmayı bloklamaz.
+    """
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+            self._conn.commit()
+
+    def _migrate(self) -> None:
+        # eski veritabanlarında sonradan eklenen kolonlar
+        cols = {r[1] for r in self._conn.execute("PRAGMA table_info(inspections)")}
+        if "thumbnail" not in cols:
+            self._conn.execute("ALTER TABLE inspections ADD COLUMN thumbnail TEXT")
+
+    # ---------- yardımcılar ----------
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _scalar(self, sql: str, params: Tuple[Any, ...] = ()) -> Any:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def _insert(self, table: str, data: Dict[str, Any]) -> int:
+        cols = ", ".join(data)
+        marks = ", ".join("?" for _ in data)
+        with self._lock:
+            cur = self._conn.execute(f"INSERT INTO {table} ({cols}) VALUES ({marks})", tuple(data.values()))
+            self._conn.commit()
+            return cur.lastrowid
+
+    @staticmethod
+    def _where(
+        filters: Dict[str, Any], after_id: Optional[int], before_id: Optional[int] = None
+    ) -> Tuple[str, List[Any]]:
+        clauses = []
+        params: List[Any] = []
+        for col, value in filters.items():
+            if value is not None:
+                clauses.append(f"{col} = ?")
+                params.append(value)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @staticmethod
+    def _page(limit: Optional[int], offset: int) -> str:
+        if limit is None and not offset:
+            return ""
+        return f" LIMIT {int(limit) if limit is not None else -1} OFFSET {int(offset)}"
+
+    # ---------- sites ----------
+    def insert_site(self, data: Dict[str, Any]) -> Site:
+        site_id = self._insert("sites", data)
+        return Site(id=site_id, **data)
+
+    def get_site(self, site_id: int) -> Optional[Site]:
+        rows = self._query("SELECT * FROM sites WHERE id = ?", (site_id,))
+        return Site(**dict(rows[0])) if rows else None
+
+    def list_sites(self, limit=None, offset=0, after_id=None) -> List[Site]:
+        where, params = self._where({}, after_id)
+        rows = self._query(f"SELECT * FROM sites{where} ORDER BY id{self._page(limit, offset)}", tuple(params))
+        return [Site(**dict(r)) for r in rows]
+
+    def count_sites(self) -> int:
+        return self._scalar("SELECT COUNT(*) FROM sites")
+
+    # ---------- workers ----------
+    def insert_worker(self, data: Dict[str, Any]) -> Worker:
+        worker_id = self._insert("workers", data)
+        return Worker(id=worker_id, **data)
+
+    def list_workers(self, limit=None, offset=0, after_id=None, site_id=None) -> List[Worker]:
+        where, params = self._where({"site_id": site_id}, after_id)
+        rows = self._query(f"SELECT * FROM workers{where} ORDER BY id{self._page(limit, offset)}", tuple(params))
+        return [Worker(**dict(r)) for r in rows]
+
+    def count_workers(self, site_id: Optional[int] = None) -> int:
+        where, params = self._where({"site_id": site_id}, None)
+        return self._scalar(f"SELECT COUNT(*) FROM workers{where}", tuple(params))
+
+    # ---------- inspections ----------
+    @staticmethod
+    def _inspection_row(data: Dict[str, Any]) -> Tuple[Any, ...]:
+        row = dict(data)
+        row["detected_ppe"] = json.dumps(row.get("detected_ppe") or [], ensure_ascii=False)
+        return tuple(row.get(c) for c in _INSPECTION_COLS)
+
+    @staticmethod
+    def _to_inspection(row: sqlite3.Row) -> SafetyInspection:
+        data = dict(row)
+        data["detected_ppe"] = json.loads(data["detected_ppe"]) if data["detected_ppe"] else []
+        return SafetyInspection(**data)
+
+    def insert_inspection(self, data: Dict[str, Any]) -> SafetyInspection:
+        marks = ", ".join("?" for _ in _INSPECTION_COLS)
+        with self._lock:
+            cur = self._conn.execute(
+                f"INSERT INTO inspections ({', '.join(_INSPECTION_COLS)}) VALUES ({marks})",
+                self._inspection_row(data),
+            )
+            self._conn.commit()
+            inspection_id = cur.lastrowid
+        return SafetyInspection(id=inspection_id, **data)
+
+    def bulk_insert_inspections(self, rows: Iterable[Dict[str, Any]]) -> int:
+        marks = ", ".join("?" for _ in _INSPECTION_COLS)
+        with self._lock:
+            cur = self._conn.executemany(
+                f"INSERT INTO inspections ({', '.join(_INSPECTION_COLS)}) VALUES ({marks})",
+                (self._inspection_row(r) for r in rows),
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    def get_inspection(self, inspection_id: int) -> Optional[SafetyInspection]:
+        rows = self._query("SELECT * FROM inspections WHERE id = ?", (inspection_id,))
+        return self._to_inspection(rows[0]) if rows else None
+
+    def list_inspections(
+        self, limit=None, offset=0, after_id=None, site_id=None, risk_level=None, before_id=None, descending=False
+    ) -> List[SafetyInspection]:
+        where, params = self._where({"site_id": site_id, "risk_level": risk_level}, after_id, before_id)
+        order = " DESC" if descending else ""
+        rows = self._query(
+            f"SELECT * FROM inspections{where} ORDER BY id{order}{self._page(limit, offset)}", tuple(params)
+        )
+        return [self._to_inspection(r) for r in rows]
+
+    def count_inspections(self, site_id: Optional[int] = None, risk_level: Optional[str] = None) -> int:
+        where, params = self._where({"site_id": site_id, "risk_level": risk_level}, None)
+        return self._scalar(f"SELECT COUNT(*) FROM inspections{where}", tuple(params))
+
+    def risk_counts(self) -> Dict[Tuple[int, str], int]:
+        rows = self._query("SELECT site_id, risk_level, COUNT(*) FROM inspections GROUP BY site_id, risk_level")
+        return {(r[0], r[1]): r[2] for r in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
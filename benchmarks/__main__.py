@@ -0,0 +1,4 @@
+# python -m benchmarks  ==  python -m benchmarks.suite
+from benchmarks.suite import main
+
+main()
@@ -0,0 +1,146 @@
+"""
+ArtifactStore: yazma / dedup maliyeti, kota temizliği ve video Range istekleri.
+
+    python -m benchmarks.bench_artifact_store --files 50000
+
+1) 1080p overlay: ilk yazma (JPEG encode + hash + yazma; thumbnail arka planda)
+   ve aynı içeriğin tekrarı (dosya yazılmaz), eski cv2.imwrite ile karşılaştırma.
+2) `--files` küçük dosya: düz klasör (eski uploads/) ile shard'lı düzende
+   klasör listeleme ve tek dosya stat süresi; indeksin açılış süresi.
+3) Kota: toplam boyutun yarısına indirilen max_bytes ile tek sweep() süresi.
+4) TestClient ile video: tam indirme vs "Range: bytes=..." (ileri sarma) ve ETag 304.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from app.services.artifact_store import ArtifactStore
+from benchmarks.stats import format_row, percentiles
+from benchmarks.synthetic import make_site_photo
+
+
+def measure(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def bench_overlay(tmp: str, runs: int) -> None:
+    store = ArtifactStore(os.path.join(tmp, "overlay"), os.path.join(tmp, "overlay.db"))
+    path, _ = make_site_photo(os.path.join(tmp, "site.jpg"), (1920, 1080), 3, 6)
+    base = cv2.imread(path)
+    frames = []
+    for i in range(runs):
+        f = base.copy()
+        f[0, 0, 0] = i % 256
+        f[0, 1, 0] = i // 256     # her biri farklı içerik
+        frames.append(f)
+
+    it = iter(frames)
+    print(format_row("yeni overlay+thumb", percentiles(measure(lambda: store.put_image(next(it), "ft", thumbnail=True), runs))))
+    t0 = time.perf_counter()
+    store.flush_thumbnails()
+    print(f"  kalan thumbnail kuyruğu: {(time.perf_counter() - t0) * 1000:.0f} ms")
+    print(format_row("tekrar (dedup)", percentiles(measure(lambda: store.put_image(frames[0], "ft", thumbnail=True), runs))))
+    t0 = time.perf_counter()
+    for f in frames[:10]:
+        cv2.imwrite(os.path.join(tmp, "flat.jpg"), f)
+    print(f"karşılaştırma: eski cv2.imwrite {((time.perf_counter() - t0) / 10) * 1000:.2f} ms/görsel")
+    print("  ", store.stats())
+
+
+def bench_layout(tmp: str, n: int) -> None:
+    flat = os.path.join(tmp, "flat")
+    os.makedirs(flat)
+    payload = os.urandom(2048)
+    names = [f"ft_{os.urandom(16).hex()}.jpg" for _ in range(n)]
+    for name in names:
+        with open(os.path.join(flat, name), "wb") as f:
+            f.write(payload)
+
+    t0 = time.perf_counter()
+    sharded = ArtifactStore(flat, os.path.join(tmp, "layout.db"))   # eski düzeni indekse alır
+    adopt = time.perf_counter() - t0
+    for name in names:      # aynı dosyalar shard'lı düzende
+        sharded._write_bytes(f"{name[3:5]}/{name[5:7]}/{name}", payload)
+    t0 = time.perf_counter()
+    ArtifactStore(flat, os.path.join(tmp, "layout.db"))
+    reopen = time.perf_counter() - t0
+    print(f"{n} dosya: eski düzen indekse alma {adopt:.2f} s, indeksli açılış {reopen * 1000:.0f} ms")
+
+    print(format_row("listdir düz", percentiles(measure(lambda: os.listdir(flat), 5))))
+    shard = os.path.join(flat, names[0][3:5], names[0][5:7])
+    print(format_row("listdir shard", percentiles(measure(lambda: os.listdir(shard), 50))))
+    sample = random.Random(0).sample(names, min(1000, n))
+    print(format_row("stat x1000 düz", percentiles(measure(lambda: [os.stat(os.path.join(flat, s)) for s in sample], 5))))
+    print(format_row(
+        "stat x1000 shard",
+        percentiles(measure(lambda: [os.stat(os.path.join(flat, s[3:5], s[5:7], s)) for s in sample], 5)),
+    ))
+
+
+def bench_sweep(tmp: str, n: int) -> None:
+    root = os.path.join(tmp, "sweep")
+    store = ArtifactStore(root, os.path.join(tmp, "sweep.db"), grace_s=0)
+    payload = os.urandom(4096)
+    for i in range(n):
+        store._write_bytes(f"{i % 256:02x}/{i % 253:02x}/img_{i}.jpg", payload)
+        store._register(f"{i % 256:02x}/{i % 253:02x}/img_{i}.jpg", "image", len(payload))
+    for i in range(0, n, 2):    # çift numaralılar yakın zamanda görüntülendi
+        store.touch(f"{i % 256:02x}/{i % 253:02x}/img_{i}.jpg")
+    store.max_bytes = store.stats()["bytes"] // 2
+    t0 = time.perf_counter()
+    out = store.sweep()
+    print(f"sweep: {n} dosyadan {out['evicted']} silindi, {out['freed_bytes'] / 1024 ** 2:.1f} MB, {time.perf_counter() - t0:.2f} s")
+    survivors = sum(1 for i in range(0, n, 2) if store._present(f"{i % 256:02x}/{i % 253:02x}/img_{i}.jpg"))
+    print(f"  son erişilenlerden kalan: {survivors}/{n // 2}")
+
+
+def bench_http(runs: int, video_mb: int) -> None:
+    os.environ["MODEL_WARMUP_ON_STARTUP"] = "0"
+    from fastapi.testclient import TestClient
+
+    from app.api import routes
+    from app.main import app
+
+    store = routes.artifact_store
+    name = store.reserve("bench_video") + ".mp4"
+    store._write_bytes(name, np.random.default_rng(0).integers(0, 255, video_mb * 1024 ** 2, dtype=np.uint8).tobytes())
+    store.add(name, "video")
+    client = TestClient(app)
+    url = "/uploads/" + name
+    etag = client.get(url).headers["etag"]
+
+    size = video_mb * 1024 ** 2
+    print(format_row(f"tam indirme {video_mb} MB", percentiles(measure(lambda: client.get(url), runs))))
+    print(format_row("Range 1 MB (ortadan)", percentiles(measure(
+        lambda: client.get(url, headers={"range": f"bytes={size // 2}-{size // 2 + 1024 ** 2 - 1}"}), runs
+    ))))
+    print(format_row("If-None-Match -> 304", percentiles(measure(lambda: client.get(url, headers={"if-none-match": etag}), runs))))
+    store.remove(name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--video-mb", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_overlay(tmp, args.runs)
+        bench_layout(tmp, args.files)
+        bench_sweep(tmp, args.files)
+    bench_http(args.runs, args.video_mb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+İki aşamalı cascade (kişi -> kişi kırpıntılarında PPE) vs. iki tam frame geçişi.
+
+    python -m benchmarks.bench_cascade --ft-model model/best.pt
+    python -m benchmarks.bench_cascade --ft-model model/best.pt --labels model
+
+Kalabalık, seyrek ve boş sahnelerde analyze_image_compare gecikmesi ile
+kalabalık / boş kliplerde analyze_video hızı ölçülür.
+
+--labels color (varsayılan): modeller gerçekten çalışır (maliyet gerçek),
+ama dönen kutular renk eşiklemeli dedektörden gelir; böylece eğitilmemiş
+ağırlıklarla da kalabalık sahnede ikinci aşama tetiklenir ve iki yolun
+PPE sayıları karşılaştırılabilir. --labels model ile modellerin kendi çıktısı.
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, List, Optional
+
+from app.services.model_registry import ModelRegistry, load_model
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.color_detector import ColorPPEDetector
+from benchmarks.stats import percentiles
+from benchmarks.synthetic import make_site_clip, make_site_photo
+
+
+class ModelClock:
+    """Model çağrılarında geçen toplam süre (renk dedektörünün süresi hariç)."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+
+
+class CostedLabels:
+    """Gerçek modeli çalıştırır (süre için), kutuları renk dedektöründen döndürür."""
+
+    def __init__(self, model: Any, detector: Optional[ColorPPEDetector], clock: ModelClock) -> None:
+        self.model = model
+        self.detector = detector
+        self.clock = clock
+        self.names = detector.names if detector is not None else getattr(model, "names", None)
+
+    def __call__(self, source: Any, **kwargs: Any) -> List[Any]:
+        kwargs.setdefault("verbose", False)
+        t0 = time.perf_counter()
+        out = self.model(source, **kwargs)
+        self.clock.seconds += time.perf_counter() - t0
+        return self.detector(source) if self.detector is not None else out
+
+
+def make_loader(labels: str, clock: ModelClock):
+    detector = ColorPPEDetector() if labels == "color" else None
+
+    def loader(path: str) -> Any:
+        return CostedLabels(load_model(path), detector, clock)
+
+    return loader
+
+
+def cleanup(service: YoloPPEService, out: dict) -> None:
+    for key in ("fine_tuned", "pretrained"):
+        service.artifacts.remove(out[key]["overlay_image"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--base-model", default="yolov8n.pt")
+    parser.add_argument("--labels", choices=("color", "model"), default="color")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--stride", type=int, default=5)
+    parser.add_argument("--person-side", type=int, default=None, help="CASCADE_PERSON_SIDE")
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    if args.person_side:
+        settings.CASCADE_PERSON_SIDE = args.person_side
+
+    clock = ModelClock()
+    registry = ModelRegistry(loader=make_loader(args.labels, clock))
+    services = {
+        "iki tam geçiş": YoloPPEService(args.ft_model, args.base_model, registry=registry, batching=False, cascade=False),
+        "cascade": YoloPPEService(args.ft_model, args.base_model, registry=registry, batching=False, cascade=True),
+    }
+    size = (args.width, args.height)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scenes = {
+            "kalabalık (14 kişi)": make_site_photo(os.path.join(tmp, "crowd.jpg"), size, 2, 12, seed=1)[0],
+            "seyrek (2 kişi)": make_site_photo(os.path.join(tmp, "sparse.jpg"), size, 0, 2, seed=2)[0],
+            "boş": make_site_photo(os.path.join(tmp, "empty.jpg"), size, 0, 0, seed=3)[0],
+        }
+        for service in services.values():
+            cleanup(service, service.analyze_image_compare(scenes["boş"]))   # ısınma
+
+        print(f"analyze_image_compare, {args.width}x{args.height} (model ms: sadece model çağrıları)")
+        print(f"{'sahne':<20s} {'yol':<14s} {'model ms':>8s} {'p50 ms':>8s} {'p99 ms':>8s}  fine-tuned sayımları")
+        for scene, path in scenes.items():
+            for name, service in services.items():
+                times = []
+                clock.seconds = 0.0
+                for _ in range(args.runs):
+                    t0 = time.perf_counter()
+                    out = service.analyze_image_compare(path)
+                    times.append(time.perf_counter() - t0)
+                    cleanup(service, out)
+                st = percentiles(times)
+                model_ms = clock.seconds / args.runs * 1000.0
+                print(
+                    f"{scene:<20s} {name:<14s} {model_ms:8.1f} {st['p50_ms']:8.1f} {st['p99_ms']:8.1f}  "
+                    f"{dict(sorted(out['fine_tuned']['counts'].items()))}"
+                )
+
+        print(f"\nanalyze_video (stride {args.stride}, overlay yok)")
+        for scene in ("busy", "idle"):
+            clip = make_site_clip(os.path.join(tmp, f"{scene}.mp4"), scene, n_frames=args.frames, size=size)
+            for name, service in services.items():
+                clock.seconds = 0.0
+                t0 = time.perf_counter()
+                s = service.analyze_video(clip, frame_stride=args.stride, output="none")
+                elapsed = time.perf_counter() - t0
+                print(
+                    f"{scene:<20s} {name:<14s} {s['frames_analyzed'] / elapsed:6.1f} analiz frame/s, "
+                    f"model {clock.seconds * 1000.0 / max(s['frames_analyzed'], 1):6.1f} ms/frame  "
+                    f"kişi {s['total_person']}, kasklı {s['total_with_helmet']}, yelekli {s['total_with_vest']}, risk {s['risk_level']}"
+                )
+
+    for service in services.values():
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Gösterge paneli ve liste sayfaları: 100k denetim kaydıyla sayfa süreleri.
+
+    python -m benchmarks.bench_dashboard --inspections 100000 --sites 200 --backend sqlite
+
+"Eski" satırı önceki davranışı taklit eder: tüm denetim listesi tek seferde
+çekilip tabloya render edilir. Diğer satırlar TestClient üzerinden gerçek
+route'lardır (cache soğuk = her istekten önce temizlenir, sıcak = cache'ten).
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def measure(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inspections", type=int, default=100_000)
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="sqlite")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    # app import edilmeden önce: ayarlar modül yüklenirken okunur
+    os.environ["STORAGE_BACKEND"] = args.backend
+    os.environ["SQLITE_PATH"] = os.path.join(tmp, "bench.db")
+    os.environ["MODEL_WARMUP_ON_STARTUP"] = "0"
+
+    from fastapi.testclient import TestClient
+
+    from app.api import routes
+    from app.main import app
+    from benchmarks.bench_storage import make_rows
+    from benchmarks.stats import format_row, percentiles
+
+    for i in range(args.sites - 1):
+        routes.site_service.create_site(name=f"Şantiye {i + 2}", location="-", status="active", supervisor=None)
+    t0 = time.perf_counter()
+    routes.safety_service.bulk_create_inspections(list(make_rows(args.inspections, args.sites)))
+    print(f"{args.backend}: {args.inspections} denetim yüklendi ({time.perf_counter() - t0:.1f} s)")
+
+    client = TestClient(app)
+    cache = routes.fragment_cache
+
+    def get(url: str, cold: bool = True):
+        def run():
+            if cold:
+                cache.clear()
+            r = client.get(url)
+            assert r.status_code == 200, r.status_code
+            return r
+        return run
+
+    def old_safety_page():
+        # önceki /safety: tüm kayıtlar + şantiye listesi tek tabloda
+        inspections = routes.safety_service.list_inspections()
+        sites = {s.id: s for s in routes.site_service.list_sites()}
+        return routes.templates.get_template("fragments/inspection_rows.html").render(
+            {"inspections": inspections, "sites": sites}
+        )
+
+    old_html = old_safety_page()
+    print(format_row("eski /safety (tam liste)", percentiles(measure(old_safety_page, max(3, args.runs // 5)))))
+    print(f"    HTML: {len(old_html) / 1024:.0f} KB")
+
+    # derin sayfa için cursor: listenin ortası
+    deep = routes.safety_service.list_inspections(limit=1, offset=args.inspections // 2, descending=True)[0].id
+
+    cases = [
+        ("/ (soğuk)", get("/")),
+        ("/ (sıcak)", get("/", cold=False)),
+        ("/safety kabuk", get("/safety")),
+        ("parça ilk sayfa (soğuk)", get("/fragments/inspections")),
+        ("parça ilk sayfa (sıcak)", get("/fragments/inspections", cold=False)),
+        ("parça orta sayfa", get(f"/fragments/inspections?cursor={deep}")),
+        ("parça site_id filtresi", get("/fragments/inspections?site_id=7")),
+        ("parça şantiye riskleri", get("/fragments/site-risks")),
+        ("/api/inspections ilk", get("/api/inspections")),
+        ("/api/inspections orta", get(f"/api/inspections?cursor={deep}")),
+    ]
+    for name, fn in cases:
+        size = len(fn().content)
+        print(format_row(name, percentiles(measure(fn, args.runs))), f"  {size / 1024:6.1f} KB")
+
+    print("fragment cache:", cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Tespit ayrıştırma: kutu başına döngü vs. sütunsal (cls / conf / xyxy dizileri) dönüşüm.
+
+    python -m benchmarks.bench_detection_parsing --sizes 10,100,1000
+"""
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+from app.services.detections import parse_result
+from benchmarks.stats import format_row, percentiles
+
+NAMES = {0: "Person", 1: "helmet", 2: "vest", 3: "gloves", 4: "boots", 5: "goggles",
+         6: "none", 7: "no_helmet", 8: "no_goggle", 9: "no_gloves", 10: "no_boots"}
+
+
+def synthetic_result(n: int, seed: int = 0, w: int = 1920, h: int = 1080) -> Results:
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform([0, 0], [w - 50, h - 50], size=(n, 2))
+    wh = rng.uniform(10, 50, size=(n, 2))
+    conf = rng.uniform(0.25, 1.0, size=(n, 1))
+    cls = rng.integers(0, len(NAMES), size=(n, 1))
+    data = np.hstack([xy, xy + wh, conf, cls]).astype(np.float32)
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    return Results(img, path="synthetic.jpg", names=NAMES, boxes=torch.from_numpy(data))
+
+
+def per_box_parse(result, class_names):
+    """Vektörleştirme öncesi ayrıştırma (referans)."""
+    dets = []
+    for box in result.boxes:
+        cls_id = int(box.cls[0])
+        conf = float(box.conf[0])
+        x1, y1, x2, y2 = box.xyxy[0].tolist()
+        dets.append({
+            "class_id": cls_id,
+            "class_name": class_names.get(cls_id, str(cls_id)),
+            "confidence": conf,
+            "bbox": [x1, y1, x2, y2],
+        })
+    return dets, dict(Counter([d["class_name"] for d in dets]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    for n in [int(x) for x in args.sizes.split(",")]:
+        result = synthetic_result(n)
+        assert parse_result(result, NAMES) == per_box_parse(result, NAMES), n
+
+        for name, fn in (("per-box", per_box_parse), ("columnar", parse_result)):
+            samples = []
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                fn(result, NAMES)
+                samples.append(time.perf_counter() - t0)
+            print(format_row(f"{name} n={n}", percentiles(samples)))
+
+
+if __name__ == "__main__":
+    main()
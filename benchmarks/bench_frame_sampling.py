@@ -0,0 +1,82 @@
+"""
+Video örnekleme: sabit stride vs. hareket tabanlı (MotionSampler).
+
+    python -m benchmarks.bench_frame_sampling
+    python -m benchmarks.bench_frame_sampling --ft-model model/best.pt --clips saha1.mp4 saha2.mp4
+
+Her klip için her frame'in analiz edildiği (stride=1) çalıştırma referans
+kabul edilir; sabit stride ve hareket tabanlı örneklemenin inference sayısı,
+sabit stride'a göre tasarruf ve risk metriklerinin referanstan sapması raporlanır.
+--ft-model verilmezse sentetik sahne klipleri ve renk eşiklemeli dedektör kullanılır.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.services.frame_sampler import FixedStrideSampler, MotionSampler
+from app.services.model_registry import ModelRegistry
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.color_detector import ColorPPEDetector
+from benchmarks.synthetic import make_site_clip
+
+
+RISK_KEYS = ("total_person", "total_with_helmet", "total_with_vest", "helmet_ratio", "vest_ratio", "risk_level")
+
+
+def run(service: YoloPPEService, clip: str, sampler) -> dict:
+    t0 = time.perf_counter()
+    summary = service.analyze_video(clip, sampler=sampler)
+    summary["seconds"] = time.perf_counter() - t0
+    service.artifacts.remove(summary["video_overlay"])
+    return summary
+
+
+def describe(name: str, s: dict, ref: dict, fixed: dict) -> str:
+    saved = 1.0 - s["frames_analyzed"] / max(fixed["frames_analyzed"], 1)
+    diffs = []
+    for k in ("total_person", "helmet_ratio", "vest_ratio"):
+        d = s[k] - ref[k]
+        diffs.append(f"{k} {s[k]:.2f} ({d:+.2f})" if isinstance(s[k], float) else f"{k} {s[k]} ({d:+d})")
+    risk = s["risk_level"] + ("" if s["risk_level"] == ref["risk_level"] else f" (ref {ref['risk_level']})")
+    return (
+        f"  {name:<10s} inference {s['frames_analyzed']:5d}  sabit stride'a göre tasarruf {saved:+7.1%}"
+        f"  {s['seconds']:6.1f} s  | " + ", ".join(diffs) + f", risk {risk}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--clips", nargs="*", default=None)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--stride", type=int, default=15)
+    parser.add_argument("--threshold", type=float, default=0.01)
+    parser.add_argument("--min-gap", type=int, default=3)
+    parser.add_argument("--max-gap", type=int, default=45)
+    args = parser.parse_args()
+
+    if args.ft_model:
+        service = YoloPPEService(args.ft_model, registry=ModelRegistry())
+    else:
+        detector = ColorPPEDetector()
+        service = YoloPPEService(registry=ModelRegistry(loader=lambda path: detector))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = args.clips or [
+            make_site_clip(os.path.join(tmp, f"{scene}.mp4"), scene, n_frames=args.frames, seed=i)
+            for i, scene in enumerate(("idle", "static", "busy"))
+        ]
+        for clip in clips:
+            ref = run(service, clip, FixedStrideSampler(1))
+            fixed = run(service, clip, FixedStrideSampler(args.stride))
+            motion = run(service, clip, MotionSampler(args.threshold, args.min_gap, args.max_gap))
+
+            print(f"== {os.path.basename(clip)}")
+            print(describe("her frame", ref, ref, fixed))
+            print(describe(f"stride {args.stride}", fixed, ref, fixed))
+            print(describe("hareket", motion, ref, fixed))
+
+
+if __name__ == "__main__":
+    main()
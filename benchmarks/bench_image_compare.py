@@ -0,0 +1,79 @@
+"""
+analyze_image_compare gecikmesi: eski sıralı yol vs. tek decode + paralel modeller.
+
+    python -m benchmarks.bench_image_compare --ft-model model/best.pt --runs 30
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.services.detections import parse_result
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.stats import format_row, percentiles
+from benchmarks.synthetic import make_image
+
+
+def sequential_compare(service: YoloPPEService, image_path: str) -> dict:
+    """Değişiklik öncesi davranış: iki ayrı decode, modeller ve encode'lar arka arkaya."""
+    ft_res = service.ft_model(image_path)[0]
+    base_res = service.base_model(image_path)[0]
+    ft_overlay = service._save_overlay(ft_res, "ft")
+    base_overlay = service._save_overlay(base_res, "base")
+    ft_det, ft_counts = parse_result(ft_res, service.ft_class_names)
+    base_det, base_counts = parse_result(base_res, service.base_class_names)
+    return {
+        "fine_tuned": {"detections": ft_det, "counts": ft_counts, "overlay_image": ft_overlay},
+        "pretrained": {"detections": base_det, "counts": base_counts, "overlay_image": base_overlay},
+    }
+
+
+def timed(fn, service, image_path, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = fn(service, image_path)
+        samples.append(time.perf_counter() - t0)
+        for key in ("fine_tuned", "pretrained"):
+            service.artifacts.remove(out[key]["overlay_image"])
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--base-model", default="yolov8n.pt")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    service = YoloPPEService(args.ft_model, args.base_model)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = make_image(os.path.join(tmp, "site.jpg"), (args.width, args.height))
+
+        # ısınma
+        timed(sequential_compare, service, image_path, 2)
+
+        ft_only = []
+        base_only = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            service.ft_model(image_path)
+            ft_only.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            service.base_model(image_path)
+            base_only.append(time.perf_counter() - t0)
+
+        seq = timed(sequential_compare, service, image_path, args.runs)
+        par = timed(lambda s, p: s.analyze_image_compare(p), service, image_path, args.runs)
+
+    print(format_row("ft_model only", percentiles(ft_only)))
+    print(format_row("base_model only", percentiles(base_only)))
+    print(format_row("sequential compare", percentiles(seq)))
+    print(format_row("parallel compare", percentiles(par)))
+
+
+if __name__ == "__main__":
+    main()
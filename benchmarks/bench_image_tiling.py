@@ -0,0 +1,130 @@
+"""
+Yüksek çözünürlüklü fotoğraflarda karolu (sliced) inference: isabet ve maliyet.
+
+    python -m benchmarks.bench_image_tiling
+    python -m benchmarks.bench_image_tiling --width 7680 --height 4320 --far 30
+
+Sentetik drone fotoğrafında (uzakta küçük çalışanlar) renk eşiklemeli
+dedektör modelin giriş boyutuna (--imgsz) küçültülmüş görselde çalışır; böylece
+tam frame geçişinde küçük kasklar kaybolur. Karosuz, Person bölgelerine göre
+karolu (servisteki mod) ve tüm ızgaranın karolandığı çalıştırmalar için
+kask / yelek / kişi isabeti, yanlış kask, karo sayısı ve gecikme raporlanır;
+çalışanların sahaya dağıldığı ve tek bölgede toplandığı sahneler ayrı ayrı.
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+import cv2
+import numpy as np
+
+from app.services.detections import result_rows
+from app.services.model_registry import ModelRegistry
+from app.services.tiling import merge_detections, sliced_detect, tile_grid, tile_params
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.color_detector import ColorPPEDetector
+from benchmarks.stats import percentiles
+from benchmarks.synthetic import make_site_photo
+
+
+def score(rows: np.ndarray, truth) -> dict:
+    """Gerçek çalışan kutusunun içinde merkezi olan tespitlere göre isabet."""
+    centers = (rows[:, :2] + rows[:, 2:4]) / 2
+    cls = rows[:, 5].astype(int)
+
+    def inside(box, c):
+        x1, y1, x2, y2 = box
+        m = (cls == c) & (centers[:, 0] >= x1) & (centers[:, 0] <= x2) & (centers[:, 1] >= y1) & (centers[:, 1] <= y2)
+        return bool(m.any())
+
+    hits = {"Person": 0, "helmet": 0, "vest": 0}
+    need = {"Person": len(truth), "helmet": 0, "vest": 0}
+    false_helmet = 0
+    for box, helmet, vest in truth:
+        hits["Person"] += inside(box, 0)
+        if helmet:
+            need["helmet"] += 1
+            hits["helmet"] += inside(box, 1)
+        elif inside(box, 1):
+            false_helmet += 1
+        if vest:
+            need["vest"] += 1
+            hits["vest"] += inside(box, 2)
+    out = {k: hits[k] / max(need[k], 1) for k in hits}
+    out["false_helmet"] = false_helmet
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--near", type=int, default=3)
+    parser.add_argument("--far", type=int, default=12)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--overlap", type=float, default=0.2)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    detector = ColorPPEDetector(imgsz=args.imgsz)
+
+    def detect(images):
+        return [result_rows(r) for r in detector(images)]
+
+    def no_tiles(img):
+        return detect([img])[0], 0
+
+    def person_regions(img):
+        return sliced_detect(img, detect([img])[0], detect, 0, args.imgsz, args.overlap, min_side=0)
+
+    def all_tiles(img):
+        h, w = img.shape[:2]
+        tile, ov = tile_params(w, h, args.imgsz, args.overlap)
+        tiles = tile_grid(w, h, tile, ov)
+        tiled = detect([img[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles])
+        return merge_detections(detect([img])[0], list(zip(tiles, tiled)), w, h), len(tiles)
+
+    modes = {"karosuz": no_tiles, "Person bölgesi": person_regions, "tüm ızgara": all_tiles}
+
+    # servis yolu (YoloPPEService._ft_detect) ile doğrudan çağrının aynı olduğu kontrolü
+    from app.core.config import settings
+    settings.ONNX_IMGSZ, settings.IMAGE_TILING_OVERLAP, settings.IMAGE_TILING_MIN_SIDE = args.imgsz, args.overlap, 0
+    service = YoloPPEService(registry=ModelRegistry(loader=lambda path: detector), batching=False, tiling=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scene, cluster in (("dağınık", 1.0), ("tek ekip", 0.45)):
+            images = []
+            for s in range(args.seeds):
+                path, truth = make_site_photo(
+                    os.path.join(tmp, f"drone{s}.jpg"), (args.width, args.height), args.near, args.far, seed=s, cluster=cluster
+                )
+                images.append((cv2.imread(path), truth))
+            img = images[0][0]
+            assert np.array_equal(result_rows(service._ft_detect(img)), person_regions(img)[0])
+
+            print(f"== {scene}: {args.width}x{args.height}, {args.near} yakın + {args.far} uzak çalışan, {args.seeds} fotoğraf")
+            print(f"{'mod':<15s} {'kişi':>6s} {'kask':>6s} {'yelek':>6s} {'yanlış kask':>11s} {'karo':>5s} {'p50 ms':>8s}")
+            for name, fn in modes.items():
+                scores: List[dict] = []
+                n_tiles = []
+                for im, truth in images:
+                    rows, n = fn(im)
+                    scores.append(score(rows, truth))
+                    n_tiles.append(n)
+                times = []
+                for _ in range(args.runs):
+                    t0 = time.perf_counter()
+                    fn(img)
+                    times.append(time.perf_counter() - t0)
+                mean = {k: float(np.mean([s[k] for s in scores])) for k in scores[0]}
+                print(
+                    f"{name:<15s} {mean['Person']:6.1%} {mean['helmet']:6.1%} {mean['vest']:6.1%} "
+                    f"{mean['false_helmet']:11.1f} {np.mean(n_tiles):5.1f} {percentiles(times)['p50_ms']:8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Çapraz istek micro-batching: eşzamanlılığa göre throughput ve p50/p99 gecikme.
+
+    python -m benchmarks.bench_inference_batching --ft-model model/best.pt --concurrency 1 2 4 8 16
+
+Her eşzamanlılık seviyesinde o kadar thread aynı anda analyze_image çağırır
+(sonuç cache'i kapalı); aynı yük batching kapalı (her istek modeli tek başına
+çağırır) ve açık (BatchingBroker) servislerle ölçülür.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import List
+
+from app.services.model_registry import ModelRegistry
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.stats import percentiles
+from benchmarks.synthetic import make_image
+
+
+def load(service: YoloPPEService, images: List[str], concurrency: int, per_thread: int) -> dict:
+    latencies: List[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+
+    def client(k: int) -> None:
+        local = []
+        barrier.wait()
+        for i in range(per_thread):
+            t0 = time.perf_counter()
+            out = service.analyze_image(images[(k + i) % len(images)])
+            local.append(time.perf_counter() - t0)
+            service.artifacts.remove(out["overlay_image"])
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(k,)) for k in range(concurrency)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    stats = percentiles(latencies)
+    stats["rps"] = len(latencies) / wall
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=48, help="her seviyede toplam istek (yaklaşık)")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--wait-ms", type=float, default=4.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    settings.INFERENCE_BATCH_MAX = args.max_batch
+    settings.INFERENCE_BATCH_WAIT_MS = args.wait_ms
+
+    registry = ModelRegistry()
+    services = {
+        "tekil": YoloPPEService(args.ft_model, registry=registry, batching=False),
+        "batch": YoloPPEService(args.ft_model, registry=registry, batching=True),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # aynı çözünürlük: ultralytics aynı boyutlu batch'lerde dikdörtgen letterbox kullanır
+        images = [
+            make_image(os.path.join(tmp, f"img{i}.jpg"), (args.width, args.height), n_people=2 + i, seed=i)
+            for i in range(4)
+        ]
+        for service in services.values():
+            load(service, images, 2, 2)   # ısınma
+
+        print(f"{'eşzamanlı':>9s} {'mod':>6s} {'istek/s':>8s} {'p50 ms':>9s} {'p99 ms':>9s} {'ort. batch':>10s}")
+        for c in args.concurrency:
+            per_thread = max(args.requests // c, 2)
+            for name, service in services.items():
+                broker = service.ft_broker
+                b0, i0 = (broker.batches, broker.items) if broker else (0, 0)
+                r = load(service, images, c, per_thread)
+                avg_batch = (broker.items - i0) / max(broker.batches - b0, 1) if broker else 1.0
+                print(f"{c:9d} {name:>6s} {r['rps']:8.2f} {r['p50_ms']:9.1f} {r['p99_ms']:9.1f} {avg_batch:10.2f}")
+
+    for service in services.values():
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
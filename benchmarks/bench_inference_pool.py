@@ -0,0 +1,165 @@
+"""
+Çok süreçli inference havuzu: süreç sayısına göre ölçeklenme.
+
+    python -m benchmarks.bench_inference_pool --processes 1 2 4
+    python -m benchmarks.bench_inference_pool --ft-model model/best.pt --processes 1 2 4 8 --threads 1
+
+Önce havuzlu ve havuzsuz servislerin aynı sonucu verdiği (renk eşiklemeli
+dedektörle, tespit içeren sahnelerde) kontrol edilir. Sonra her süreç
+sayısında eşzamanlı analyze_image_compare istekleri (istek/s, p50/p99) ve
+tek videonun her frame'inin analizi (frame/s) ölçülür. "0" satırı havuzsuz,
+web sürecinde koşan eski yoldur. --ft-model verilmezse renk dedektörü
+kullanılır; o çok ucuz olduğu için süreç arası taşıma maliyetini gösterir,
+gerçek model ölçeklenmesi için --ft-model verin.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+import cv2
+
+from app.services.inference_pool import InferencePool
+from app.services.model_registry import ModelRegistry
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.color_detector import load_color_detector
+from benchmarks.stats import percentiles
+from benchmarks.synthetic import make_site_clip
+
+
+def make_service(args, processes: int, color: bool) -> YoloPPEService:
+    loader = load_color_detector if color else None
+    ft = None if color else args.ft_model
+    registry = ModelRegistry(loader=loader) if color else ModelRegistry()
+    pool = None
+    if processes:
+        service = YoloPPEService(ft, args.base_model, registry=registry, batching=False)
+        pool = InferencePool(
+            {"ft": service.ft_source, "base": args.base_model},
+            processes=processes,
+            threads=args.threads,
+            loader=loader,
+        )
+    service = YoloPPEService(ft, args.base_model, registry=registry, batching=False, pool=pool)
+    service.warmup(background=False)
+    return service
+
+
+def strip(out: dict) -> dict:
+    # overlay dosya adları her çalıştırmada farklı
+    return {k: v for k, v in out.items() if k not in ("overlay_image", "video_overlay")}
+
+
+def check_parity(args, image: str, clip: str) -> None:
+    local = make_service(args, 0, color=True)
+    pooled = make_service(args, 2, color=True)
+    try:
+        a = local.analyze_image_compare(image)
+        b = pooled.analyze_image_compare(image)
+        for key in ("fine_tuned", "pretrained"):
+            assert strip(a[key]) == strip(b[key]), key
+        va = local.analyze_video(clip, frame_stride=3)
+        vb = pooled.analyze_video(clip, frame_stride=3)
+        assert strip(va) == strip(vb), (strip(va), strip(vb))
+        print(
+            f"eşlik: fotoğraf {a['fine_tuned']['counts']} / video {va['total_person']} kişi, "
+            f"risk {va['risk_level']} - havuzlu ve havuzsuz sonuçlar aynı"
+        )
+    finally:
+        for s, out in ((local, a), (pooled, b)):
+            for key in ("fine_tuned", "pretrained"):
+                s.artifacts.remove(out[key]["overlay_image"])
+        for s, out in ((local, va), (pooled, vb)):
+            s.artifacts.remove(out["video_overlay"])
+        local.close()
+        pooled.close()
+
+
+def image_load(service: YoloPPEService, image: str, concurrency: int, per_thread: int) -> dict:
+    latencies: List[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+
+    def client() -> None:
+        local = []
+        barrier.wait()
+        for _ in range(per_thread):
+            t0 = time.perf_counter()
+            out = service.analyze_image_compare(image)
+            local.append(time.perf_counter() - t0)
+            for key in ("fine_tuned", "pretrained"):
+                service.artifacts.remove(out[key]["overlay_image"])
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    stats = percentiles(latencies)
+    stats["rps"] = len(latencies) / (time.perf_counter() - t0)
+    return stats
+
+
+def video_fps(service: YoloPPEService, clip: str) -> float:
+    t0 = time.perf_counter()
+    out = service.analyze_video(clip, frame_stride=1)
+    elapsed = time.perf_counter() - t0
+    service.artifacts.remove(out["video_overlay"])
+    return out["frames_analyzed"] / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--base-model", default="yolov8n.pt")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=1, help="süreç başına intra-op thread")
+    parser.add_argument("--concurrency", type=int, default=0, help="eşzamanlı istemci (0: 2 * süreç)")
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--frames", type=int, default=96)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--skip-parity", action="store_true")
+    args = parser.parse_args()
+
+    print(f"CPU çekirdeği: {os.cpu_count()}")
+    color = args.ft_model is None
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = make_site_clip(os.path.join(tmp, "busy.mp4"), "busy", n_frames=args.frames, size=(args.width, args.height))
+        cap = cv2.VideoCapture(clip)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, args.frames // 2)
+        _, frame = cap.read()
+        cap.release()
+        image = os.path.join(tmp, "site.jpg")
+        cv2.imwrite(image, frame)
+
+        if not args.skip_parity:
+            check_parity(args, image, clip)
+
+        print(f"{'süreç':>5s} {'istemci':>7s} {'istek/s':>8s} {'p50 ms':>9s} {'p99 ms':>9s} {'video fps':>9s} {'hızlanma':>8s}")
+        base_rps: Optional[float] = None
+        for n in [0] + [p for p in args.processes if p > 0]:
+            service = make_service(args, n, color)
+            try:
+                c = args.concurrency or 2 * max(n, 1)
+                image_load(service, image, c, 1)   # ısınma
+                r = image_load(service, image, c, max(args.requests // c, 1))
+                fps = video_fps(service, clip)
+            finally:
+                service.close()
+            base_rps = base_rps or r["rps"]
+            label = "yok" if n == 0 else str(n)
+            print(
+                f"{label:>5s} {c:7d} {r['rps']:8.2f} {r['p50_ms']:9.1f} {r['p99_ms']:9.1f} "
+                f"{fps:9.1f} {r['rps'] / base_rps:7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Metrik ölçümünün maliyeti: kapalı / açık.
+
+    python -m benchmarks.bench_metrics_overhead
+
+1) Mikro: `with metrics.stage(...)` ve `observe_results` çağrı başına ns.
+2) Uçtan uca: renk eşiklemeli dedektörle analyze_image_compare p50'si,
+   metrikler kapalıyken ve açıkken (aynı servis, sadece `metrics.enabled` değişir).
+3) /metrics çıktısının üretim süresi ve boyutu.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.core.metrics import Metrics, metrics
+from app.services.model_registry import ModelRegistry
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.color_detector import ColorPPEDetector
+from benchmarks.stats import format_row, percentiles
+from benchmarks.synthetic import make_site_photo
+
+
+class _Res:
+    speed = {"preprocess": 1.0, "inference": 20.0, "postprocess": 0.5}
+
+
+def micro(n: int) -> None:
+    results = [_Res()] * 8
+    for enabled in (False, True):
+        m = Metrics(enabled=enabled)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            with m.stage("decode"):
+                pass
+        stage_ns = (time.perf_counter() - t0) / n * 1e9
+        t0 = time.perf_counter()
+        for _ in range(n):
+            m.observe_results("ft", results)
+        obs_ns = (time.perf_counter() - t0) / n * 1e9
+        print(f"{'açık' if enabled else 'kapalı':<7s} stage(): {stage_ns:7.0f} ns   observe_results(8 görsel): {obs_ns:7.0f} ns")
+
+    t0 = time.perf_counter()
+    for _ in range(n):
+        pass
+    print(f"boş döngü: {(time.perf_counter() - t0) / n * 1e9:7.0f} ns")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--micro", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=40)
+    args = parser.parse_args()
+
+    micro(args.micro)
+
+    detector = ColorPPEDetector()
+    service = YoloPPEService(registry=ModelRegistry(loader=lambda path: detector), batching=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        path, _ = make_site_photo(os.path.join(tmp, "site.jpg"), (1920, 1080), 3, 6)
+
+        def run() -> None:
+            out = service.analyze_image_compare(path)
+            for key in ("fine_tuned", "pretrained"):
+                service.artifacts.remove(out[key]["overlay_image"])
+
+        run()   # ısınma
+        for enabled in (False, True, False, True):
+            metrics.enabled = enabled
+            times = []
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - t0)
+            print(format_row(f"compare, metrik {'açık' if enabled else 'kapalı'}", percentiles(times)))
+
+    t0 = time.perf_counter()
+    text = metrics.render()
+    print(f"/metrics: {len(text.splitlines())} satır, {len(text) / 1024:.1f} KB, {(time.perf_counter() - t0) * 1000:.2f} ms")
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
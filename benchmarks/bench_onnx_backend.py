@@ -0,0 +1,172 @@
+"""
+ONNX Runtime backend: torch (ultralytics) ile kutu eşliği ve CPU throughput.
+
+    python -m benchmarks.bench_onnx_backend --check --standin
+    python -m benchmarks.bench_onnx_backend --ft-model model/best.pt --runs 20
+
+Eşlik iki düzeyde kontrol edilir:
+  - ham çıktı: aynı letterbox'lı batch'te NMS öncesi tahminlerin en büyük
+    farkı (kutu koordinatı piksel, skor); ağırlıkların kalitesinden bağımsızdır.
+  - kutular: iki backend'in kutuları sınıf bazında IoU ile eşlenir; eşlenemeyen
+    kutu sayısı ve eşlenen kutuların en kötü IoU'su raporlanır.
+Ham fark `--raw-atol-px` / `--raw-atol-score`'u, eşlenemeyen kutu
+`--max-unmatched`'ı aşarsa ya da bir modelde hiç kutu karşılaştırılmadıysa
+süreç 1 koduyla çıkar; `--check` throughput ölçmeden sadece eşliği kontrol
+eder. Sentetik görsellerde kutu üretmeyen ağırlıklar (eğitilmemiş model,
+rastgele stand-in) eşliği sınamaz: `--standin` BatchNorm'u kalibre edilmiş
+stand-in çiftini (bkz. benchmarks.standin_model) --conf 0.01 ile kullanır.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from app.services.detections import result_arrays
+from app.services.model_registry import load_yolo
+from app.services.onnx_backend import OnnxYOLO, export_onnx
+from app.services.tracker import iou_matrix
+from benchmarks.stats import format_row, percentiles
+from benchmarks.synthetic import make_image
+
+
+def match_boxes(a: Tuple[np.ndarray, np.ndarray, np.ndarray], b: Tuple[np.ndarray, np.ndarray, np.ndarray], min_iou: float):
+    """(cls, conf, xyxy) çiftlerini sınıf bazında greedy eşler -> (eşlenen IoU'lar, eşlenmeyen a, eşlenmeyen b)."""
+    ious: List[float] = []
+    unmatched_a = unmatched_b = 0
+    for c in np.union1d(a[0], b[0]):
+        ba, bb = a[2][a[0] == c], b[2][b[0] == c]
+        if len(ba) == 0 or len(bb) == 0:
+            unmatched_a += len(ba)
+            unmatched_b += len(bb)
+            continue
+        iou = iou_matrix(ba, bb)
+        used_b = np.zeros(len(bb), dtype=bool)
+        for i in np.argsort(-iou.max(axis=1)):
+            j = int(np.argmax(np.where(used_b, -1.0, iou[i])))
+            if not used_b[j] and iou[i, j] >= min_iou:
+                used_b[j] = True
+                ious.append(float(iou[i, j]))
+            else:
+                unmatched_a += 1
+        unmatched_b += int((~used_b).sum())
+    return ious, unmatched_a, unmatched_b
+
+
+def raw_diff(torch_model, onnx_model: OnnxYOLO, images) -> Tuple[float, float]:
+    """NMS öncesi çıktıların en büyük mutlak farkı -> (kutu koordinatı px, skor)."""
+    import torch
+
+    box = score = 0.0
+    for img in images:
+        batch, _ = onnx_model.preprocess([img])
+        yo = onnx_model.session.run(None, {onnx_model.input_name: batch})[0]
+        with torch.no_grad():
+            yt = torch_model.model(torch.from_numpy(batch))
+        yt = (yt[0] if isinstance(yt, (list, tuple)) else yt).numpy()
+        box = max(box, float(np.abs(yo[:, :4] - yt[:, :4]).max()))
+        score = max(score, float(np.abs(yo[:, 4:] - yt[:, 4:]).max()))
+    return box, score
+
+
+def throughput(model, images, runs: int, batch: int) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        for i in range(0, len(images), batch):
+            model(images[i:i + batch], conf=0.25, verbose=False)
+        samples.append((time.perf_counter() - t0) / len(images))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ft-model", default="model/best.pt")
+    parser.add_argument("--base-model", default="yolov8n.pt")
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=4)
+    parser.add_argument("--conf", type=float, default=None, help="varsayılan 0.25, --standin ile 0.01")
+    parser.add_argument("--min-iou", type=float, default=0.9)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--max-unmatched", type=int, default=0, help="model başına izin verilen eşlenmeyen kutu")
+    parser.add_argument("--raw-atol-px", type=float, default=0.5)
+    parser.add_argument("--raw-atol-score", type=float, default=1e-3)
+    parser.add_argument("--check", action="store_true", help="sadece eşlik kontrolü")
+    parser.add_argument("--standin", action="store_true", help="kalibre stand-in çifti (--ft-model/--base-model yerine)")
+    args = parser.parse_args()
+    if args.conf is None:
+        args.conf = 0.01 if args.standin else 0.25
+
+    failed: List[str] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.standin:
+            from benchmarks.standin_model import make_standin_pair
+
+            pair = make_standin_pair(os.path.join(tmp, "models"), calibrate=True)
+            args.ft_model, args.base_model = pair["ft"], pair["base"]
+        sizes = [(1920, 1080), (1280, 720), (640, 480), (1080, 1920)]
+        paths = [
+            make_image(os.path.join(tmp, f"img{i}.jpg"), sizes[i % len(sizes)], n_people=3 + i % 4, seed=i)
+            for i in range(args.images)
+        ]
+        import cv2
+        images = [cv2.imread(p) for p in paths]
+
+        for weights in (args.ft_model, args.base_model):
+            print(f"== {weights}")
+            t0 = time.perf_counter()
+            onnx_path = export_onnx(weights, os.path.join(tmp, "onnx"), args.imgsz)
+            print(f"export: {time.perf_counter() - t0:.1f} s -> {os.path.basename(onnx_path)} "
+                  f"({os.path.getsize(onnx_path) / 1024 ** 2:.1f} MB)")
+
+            torch_model = load_yolo(weights)
+            onnx_model = OnnxYOLO(onnx_path, intra_op_threads=args.threads)
+
+            all_ious: List[float] = []
+            miss_t = miss_o = total_t = 0
+            for img in images:
+                rt = torch_model(img, conf=args.conf, imgsz=args.imgsz, verbose=False)[0]
+                ro = onnx_model(img, conf=args.conf)[0]
+                at, ao = result_arrays(rt), result_arrays(ro)
+                ious, ut, uo = match_boxes(at, ao, args.min_iou)
+                all_ious += ious
+                miss_t += ut
+                miss_o += uo
+                total_t += len(at[0])
+            worst = min(all_ious) if all_ious else float("nan")
+            print(f"parity: torch kutu {total_t}, eşlenen {len(all_ious)}, "
+                  f"sadece torch {miss_t}, sadece onnx {miss_o}, en kötü IoU {worst:.4f}")
+            # torch modeli ilk tahminde fuse edildi; ham karşılaştırma export'la aynı grafta
+            box_diff, score_diff = raw_diff(torch_model, onnx_model, images)
+            print(f"raw: kutu farkı en çok {box_diff:.2e} px, skor farkı en çok {score_diff:.2e}")
+            if not all_ious:
+                failed.append(f"{weights}: conf {args.conf} ile hiç kutu karşılaştırılmadı "
+                              "(--standin ya da daha düşük --conf)")
+            if miss_t + miss_o > args.max_unmatched:
+                failed.append(f"{weights}: {miss_t + miss_o} eşlenmeyen kutu (IoU >= {args.min_iou})")
+            if box_diff > args.raw_atol_px or score_diff > args.raw_atol_score:
+                failed.append(f"{weights}: ham çıktı farkı {box_diff:.2e} px / {score_diff:.2e}")
+            if args.check:
+                continue
+
+            # ısınma
+            throughput(torch_model, images, 1, args.batch)
+            throughput(onnx_model, images, 1, args.batch)
+            for name, model in (("torch", torch_model), ("onnx", onnx_model)):
+                per_img = throughput(model, images, args.runs, args.batch)
+                print(format_row(f"{name} / görsel", percentiles(per_img)))
+
+    for line in failed:
+        print("parity HATA:", line)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Dashboard risk özetleri: artımlı sayaçlar vs. tam yeniden hesap.
+
+Önce rastgele iş yüklerinde (bilinmeyen risk etiketleri, denetimsiz şantiyeler,
+kalıcı backend'den yeniden açılış dahil) iki yolun çıktısının birebir aynı
+olduğunu kontrol eder, sonra gecikmeleri ölçer. Çıktılar farklıysa ilk farklar
+yazılır ve süreç 1 koduyla çıkar; `--check` sadece bu kontrolü koşar (saniyeler).
+
+    python -m benchmarks.bench_risk_aggregates --check
+    python -m benchmarks.bench_risk_aggregates --sites 300 --inspections 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.models.site_model import Site
+from app.services.safety_service import SafetyService
+from app.services.site_service import SiteService
+from app.storage import MemoryStorage, SQLiteStorage
+from benchmarks.stats import format_row, percentiles
+
+
+def full_summarize_risk(inspections) -> dict:
+    """Artımlı sürümden önceki summarize_risk (referans)."""
+    return {
+        "total": len(inspections),
+        "low": len([i for i in inspections if i.risk_level == "low"]),
+        "medium": len([i for i in inspections if i.risk_level == "medium"]),
+        "high": len([i for i in inspections if i.risk_level == "high"]),
+    }
+
+
+def full_risk_by_site(inspections, sites) -> list:
+    """Artımlı sürümden önceki risk_by_site (referans)."""
+    weights = {"low": 1, "medium": 2, "high": 3}
+    result = []
+    for site in sites:
+        site_ins = [i for i in inspections if i.site_id == site.id]
+        if not site_ins:
+            result.append({
+                "site_id": site.id, "site_name": site.name, "total": 0, "low": 0,
+                "medium": 0, "high": 0, "score": 0.0, "label": "Denetim yok",
+            })
+            continue
+        total = len(site_ins)
+        avg = sum(weights.get(i.risk_level, 0) for i in site_ins) / float(total)
+        label = "Düşük risk" if avg < 1.5 else ("Orta risk" if avg < 2.5 else "Yüksek risk")
+        result.append({
+            "site_id": site.id,
+            "site_name": site.name,
+            "total": total,
+            "low": len([i for i in site_ins if i.risk_level == "low"]),
+            "medium": len([i for i in site_ins if i.risk_level == "medium"]),
+            "high": len([i for i in site_ins if i.risk_level == "high"]),
+            "score": round(avg, 2),
+            "label": label,
+        })
+    return result
+
+
+def check_equivalence(trials: int, seed: int = 0) -> list:
+    """Artımlı ve tam hesabın farklı çıktığı (deneme, fonksiyon, artımlı, referans) kayıtları."""
+    rng = random.Random(seed)
+    mismatches = []
+    levels = ["low", "medium", "high", "unknown", ""]
+    with tempfile.TemporaryDirectory() as tmp:
+        for trial in range(trials):
+            path = os.path.join(tmp, f"t{trial}.db")
+            storage = SQLiteStorage(path) if trial % 2 else MemoryStorage()
+            sites = SiteService(storage)
+            safety = SafetyService(storage)
+            for i in range(rng.randint(0, 8)):
+                sites.create_site(f"s{i}", "-", "active", None)
+            site_list = sites.list_sites()
+
+            for _ in range(rng.randint(0, 200)):
+                if rng.random() < 0.2:
+                    safety.bulk_create_inspections([
+                        {"site_id": rng.choice(site_list).id, "inspector": "x",
+                         "risk_level": rng.choice(levels), "notes": None,
+                         "file_name": None, "detected_ppe": []}
+                        for _ in range(rng.randint(1, 20))
+                    ])
+                else:
+                    safety.create_inspection(rng.choice(site_list), "x", rng.choice(levels), "", "f", [])
+
+            # ayrıca hiç denetimi olmayan, storage'da da bulunmayan bir şantiye
+            site_list = site_list + [Site(id=10_000, name="yok", location="-", status="active")]
+
+            services = [safety]
+            if isinstance(storage, SQLiteStorage):
+                services.append(SafetyService(SQLiteStorage(path)))   # yeniden açılış
+
+            inspections = safety.list_inspections()
+            expected = {
+                "summarize_risk": full_summarize_risk(inspections),
+                "risk_by_site": full_risk_by_site(inspections, site_list),
+            }
+            for svc in services:
+                got = {"summarize_risk": svc.summarize_risk(), "risk_by_site": svc.risk_by_site(site_list)}
+                for name, value in got.items():
+                    if value != expected[name]:
+                        mismatches.append((trial, name, value, expected[name]))
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sites", type=int, default=300)
+    parser.add_argument("--inspections", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--check", action="store_true", help="sadece eşdeğerlik kontrolü")
+    args = parser.parse_args()
+
+    mismatches = check_equivalence(args.trials)
+    if mismatches:
+        for trial, name, got, expected in mismatches[:5]:
+            print(f"FARK deneme {trial} {name}:\n  artımlı:  {got}\n  referans: {expected}")
+        print(f"equivalence: {len(mismatches)} mismatch in {args.trials} random workloads")
+        sys.exit(1)
+    print(f"equivalence: {args.trials} random workloads OK")
+    if args.check:
+        return
+
+    storage = MemoryStorage()
+    sites = SiteService(storage)
+    safety = SafetyService(storage)
+    for i in range(args.sites - 1):
+        sites.create_site(f"site {i}", "-", "active", None)
+    rng = random.Random(0)
+    safety.bulk_create_inspections(
+        {"site_id": rng.randint(1, args.sites), "inspector": "x", "risk_level": rng.choice(["low", "medium", "high"]),
+         "notes": None, "file_name": None, "detected_ppe": []}
+        for _ in range(args.inspections)
+    )
+    site_list = sites.list_sites()
+
+    def timed(fn):
+        samples = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t0)
+        return percentiles(samples)
+
+    def full():
+        inspections = safety.list_inspections()
+        full_summarize_risk(inspections)
+        full_risk_by_site(inspections, site_list)
+
+    def incremental():
+        safety.summarize_risk()
+        safety.risk_by_site(site_list)
+
+    print(f"{args.sites} sites, {args.inspections} inspections")
+    print(format_row("full recompute", timed(full)))
+    print(format_row("incremental", timed(incremental)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Uygulama açılış maliyeti: `import app.main` süresi ve worker başına bellek (RSS).
+
+Her ölçüm ayrı bir Python sürecinde yapılır:
+  - lazy  : sadece import (modeller ilk kullanımda / arka planda yüklenir)
+  - eager : import + iki modelin hemen yüklenmesi (önceki davranışın eşdeğeri)
+
+    python -m benchmarks.bench_startup --repeat 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_PROBE = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+import app.main
+from app.api.routes import yolo_service
+import_s = time.perf_counter() - t0
+if sys.argv[1] == "eager":
+    yolo_service.ft_model, yolo_service.base_model
+total_s = time.perf_counter() - t0
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+print(json.dumps({"import_s": import_s, "ready_s": total_s, "max_rss_mb": rss_mb}))
+"""
+
+
+def probe(mode: str) -> dict:
+    env = dict(os.environ, MODEL_WARMUP_ON_STARTUP="0", YOLO_VERBOSE="False")
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, mode],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for mode in ("lazy", "eager"):
+        runs = [probe(mode) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["ready_s"])
+        print(
+            f"{mode:<6s} import {best['import_s']:.2f}s  ready {best['ready_s']:.2f}s"
+            f"  max RSS {best['max_rss_mb']:.0f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Storage backend karşılaştırması: 1M denetim yükle, arama / sayfalama / sayma gecikmesi.
+
+    python -m benchmarks.bench_storage --inspections 1000000 --sites 500
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.storage import MemoryStorage, SQLiteStorage, StorageBackend
+from benchmarks.stats import format_row, percentiles
+
+RISKS = ("low", "medium", "high")
+PPE = ("helmet", "vest", "gloves", "boots", "goggles")
+
+
+def make_rows(n: int, n_sites: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "site_id": rng.randint(1, n_sites),
+            "inspector": f"denetci_{i % 97}",
+            "risk_level": rng.choice(RISKS),
+            "notes": None,
+            "file_name": f"upload_{i}.jpg",
+            "detected_ppe": rng.sample(PPE, rng.randint(0, 3)),
+        }
+
+
+def measure(fn, runs: int):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return percentiles(samples)
+
+
+def run_backend(name: str, storage: StorageBackend, args) -> None:
+    for i in range(args.sites):
+        storage.insert_site({"name": f"site {i}", "location": "-", "status": "active", "supervisor": None})
+
+    t0 = time.perf_counter()
+    storage.bulk_insert_inspections(make_rows(args.inspections, args.sites))
+    load_s = time.perf_counter() - t0
+    print(f"[{name}] bulk insert {args.inspections} inspections: {load_s:.1f}s "
+          f"({args.inspections / load_s:,.0f} rows/s)")
+
+    rng = random.Random(1)
+    n = args.inspections
+
+    print(format_row(f"{name} get_site", measure(lambda: storage.get_site(rng.randint(1, args.sites)), args.runs)))
+    print(format_row(f"{name} get_inspection", measure(lambda: storage.get_inspection(rng.randint(1, n)), args.runs)))
+    print(format_row(f"{name} page first 50", measure(lambda: storage.list_inspections(limit=50), args.runs)))
+    print(format_row(
+        f"{name} page after_id", measure(lambda: storage.list_inspections(limit=50, after_id=rng.randint(1, n)), args.runs)
+    ))
+    print(format_row(
+        f"{name} page site", measure(lambda: storage.list_inspections(limit=50, site_id=rng.randint(1, args.sites)), args.runs)
+    ))
+    print(format_row(
+        f"{name} page site+risk",
+        measure(lambda: storage.list_inspections(limit=50, site_id=rng.randint(1, args.sites), risk_level="high"), args.runs),
+    ))
+    print(format_row(
+        f"{name} count site", measure(lambda: storage.count_inspections(site_id=rng.randint(1, args.sites)), args.runs)
+    ))
+    print(format_row(f"{name} count risk", measure(lambda: storage.count_inspections(risk_level="high"), args.runs)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--inspections", type=int, default=1_000_000)
+    parser.add_argument("--sites", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    run_backend("memory", MemoryStorage(), args)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "bench.db"))
+        run_backend("sqlite", storage, args)
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Canlı izleme: akış sayısı arttıkça uçtan uca gecikme sınırlı kalıyor mu?
+
+    python -m benchmarks.bench_stream_monitor --streams 1 2 4 8 --seconds 10
+    python -m benchmarks.bench_stream_monitor --ft-model model/best.pt --streams 1 2 4
+
+Kameralar yerine yerel klipler gerçek zaman hızında (döngüde) oynatılır.
+Gecikme: frame'in kaynaktan okunduğu an -> analiz sonucunun işlendiği an.
+Sınırlılık kontrolü: çalışmanın son çeyreğindeki p99 gecikme ilk çeyreğe göre
+belirgin biçimde artıyorsa frame'ler kuyrukta birikiyor demektir. Herhangi bir
+akış sayısında gecikme birikiyorsa (ya da hiç frame analiz edilmediyse) süreç
+1 koduyla çıkar.
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.model_registry import ModelRegistry
+from app.services.safety_service import SafetyService
+from app.services.site_service import SiteService
+from app.services.stream_monitor import StreamMonitor
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.color_detector import ColorPPEDetector
+from benchmarks.synthetic import make_site_clip
+
+
+def run(service, clips, n_streams: int, seconds: float, args) -> dict:
+    sites = SiteService()
+    safety = SafetyService()
+    before = safety.count_inspections()
+    monitor = StreamMonitor(
+        service,
+        sites,
+        safety,
+        workers=args.workers,
+        batch_size=args.batch,
+        max_fps=args.max_fps,
+        window_s=5.0,
+        min_persons=3,
+        cooldown_s=seconds,
+    )
+
+    # her akışın gecikmelerini zaman damgasıyla topla (StreamMonitor son 512'yi tutar)
+    samples = {}
+    site_ids = [s.id for s in sites.list_sites()]
+    streams = [
+        monitor.add_stream(site_ids[i % len(site_ids)], clips[i % len(clips)], name=f"cam{i}", loop=True)
+        for i in range(n_streams)
+    ]
+    start = time.monotonic()
+    seen = {s.id: 0 for s in streams}
+    while time.monotonic() - start < seconds:
+        time.sleep(0.05)
+        for sid, st in monitor._streams.items():
+            lat = list(st.latencies)
+            new = st.frames_analyzed - seen[sid]
+            if new > 0:
+                t = time.monotonic() - start
+                samples.setdefault(sid, []).extend((t, x) for x in lat[-new:])
+                seen[sid] = st.frames_analyzed
+    snapshot = monitor.list_streams()
+    monitor.stop()
+
+    all_samples = sorted(x for v in samples.values() for x in v)
+    lat = np.array([x for _, x in all_samples]) * 1000.0
+    times = np.array([t for t, _ in all_samples])
+    q = seconds / 4
+    early, late = lat[times < q], lat[times > 3 * q]
+    return {
+        "analyzed_fps": sum(s.frames_analyzed for s in snapshot) / seconds,
+        "per_stream_fps": [s.frames_analyzed / seconds for s in snapshot],
+        "per_stream_read_fps": [s.frames_read / seconds for s in snapshot],
+        "dropped_ratio": sum(s.frames_dropped for s in snapshot) / max(sum(s.frames_read for s in snapshot), 1),
+        "p50_ms": float(np.percentile(lat, 50)) if len(lat) else float("nan"),
+        "p99_ms": float(np.percentile(lat, 99)) if len(lat) else float("nan"),
+        "early_p99_ms": float(np.percentile(early, 99)) if len(early) else float("nan"),
+        "late_p99_ms": float(np.percentile(late, 99)) if len(late) else float("nan"),
+        "alerts": safety.count_inspections() - before,
+    }
+
+
+def is_bounded(r: dict) -> bool:
+    """Son çeyrek p99, ilk çeyreğin 2 katını ve +100 ms'yi birlikte aşmıyorsa sınırlı."""
+    early, late = r["early_p99_ms"], r["late_p99_ms"]
+    if math.isnan(early) or math.isnan(late):
+        return False    # ölçüm yok: sınırlı olduğu gösterilemedi
+    return late <= max(2.0 * early, early + 100.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch", type=int, default=4)
+    parser.add_argument("--max-fps", type=float, default=0.0, help="kamera başına analiz sınırı (0: sınırsız)")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    args = parser.parse_args()
+
+    if args.ft_model:
+        service = YoloPPEService(args.ft_model, registry=ModelRegistry())
+    else:
+        detector = ColorPPEDetector()
+        service = YoloPPEService(registry=ModelRegistry(loader=lambda path: detector))
+    # model yükleme / ilk çağrı maliyeti ölçüme girmesin
+    service.ft_model([np.zeros((args.height, args.width, 3), dtype=np.uint8)], verbose=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = [
+            make_site_clip(os.path.join(tmp, f"{scene}.mp4"), scene, n_frames=150, size=(args.width, args.height), seed=i)
+            for i, scene in enumerate(("busy", "static"))
+        ]
+        unbounded = []
+        for n in args.streams:
+            r = run(service, clips, n, args.seconds, args)
+            bounded = is_bounded(r)
+            if not bounded:
+                unbounded.append(n)
+            print(
+                f"{n:2d} akış: okunan akış başına min {min(r['per_stream_read_fps']):5.1f} fps, "
+                f"analiz {r['analyzed_fps']:6.1f} fps (akış başına min {min(r['per_stream_fps']):5.1f} / max {max(r['per_stream_fps']):5.1f}), "
+                f"atılan %{r['dropped_ratio'] * 100:5.1f}, gecikme p50 {r['p50_ms']:7.1f} / p99 {r['p99_ms']:7.1f} ms, "
+                f"ilk/son çeyrek p99 {r['early_p99_ms']:7.1f} / {r['late_p99_ms']:7.1f} ms "
+                f"[{'sınırlı' if bounded else 'BİRİKİYOR'}], uyarı {r['alerts']}"
+            )
+    if unbounded:
+        print("gecikme sınırlı değil:", ", ".join(f"{n} akış" for n in unbounded))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
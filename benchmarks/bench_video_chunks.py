@@ -0,0 +1,117 @@
+"""
+Parçalı (keyframe hizalı, çok süreçli) video analizi: süreç sayısına göre hızlanma.
+
+    python -m benchmarks.bench_video_chunks --frames 3600 --processes 1 2 4
+    python -m benchmarks.bench_video_chunks --ft-model model/best.pt --clip saha.mp4 --processes 2 4 8
+
+Aynı klip önce sıralı (FixedStrideSampler, ChunkedVideoAnalyzer yok), sonra
+her süreç sayısında parçalı analiz edilir. Her satırda toplam süre, sıralıya
+göre hızlanma ve risk metriklerinin (benzersiz kişi, baret / yelek, risk
+seviyesi, kutu-frame sayıları) sıralı sonuçla birebir aynı olup olmadığı
+yazılır. Süreç havuzunun açılışı (spawn + model yükleme) ilk çağrıda olduğu
+için ısınma turundan sonra ölçülür. Hızlanma çekirdek sayısıyla sınırlıdır
+(os.cpu_count() başta yazılır). --ft-model verilmezse sentetik sahne ve renk
+eşiklemeli dedektör kullanılır; o çok ucuz olduğu için ölçülen asıl iş
+decode + overlay encode'dur.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.services.frame_sampler import FixedStrideSampler
+from app.services.model_registry import ModelRegistry
+from app.services.video_chunks import ChunkedVideoAnalyzer, keyframe_index
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.color_detector import load_color_detector
+from benchmarks.synthetic import make_site_clip
+
+
+PARITY_KEYS = ("total_person", "total_with_helmet", "total_with_vest", "risk_level", "frames_analyzed", "box_detections")
+
+
+def cleanup(service: YoloPPEService, summary: dict) -> None:
+    for name in [summary.get("video_overlay")] + list(summary.get("video_segments") or []):
+        if name:
+            service.artifacts.remove(name)
+
+
+def make_service(args, processes: int) -> YoloPPEService:
+    loader = None if args.ft_model else load_color_detector
+    registry = ModelRegistry(loader=loader) if loader else ModelRegistry()
+    service = YoloPPEService(args.ft_model, registry=registry, batching=False)
+    if processes:
+        service = YoloPPEService(
+            args.ft_model,
+            registry=registry,
+            batching=False,
+            chunker=ChunkedVideoAnalyzer(service.ft_source, processes=processes, threads=args.threads, loader=loader),
+        )
+    return service
+
+
+def run(service: YoloPPEService, clip: str, args) -> tuple:
+    t0 = time.perf_counter()
+    summary = service.analyze_video(
+        clip, sampler=FixedStrideSampler(args.stride), batch_size=args.batch, output=args.output
+    )
+    return time.perf_counter() - t0, summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--clip", default=None)
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--stride", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--output", default="full")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--min-s", type=float, default=5.0, help="VIDEO_CHUNK_MIN_S")
+    args = parser.parse_args()
+
+    # ayar servis oluşturulmadan önce değil, analiz sırasında okunur
+    from app.core.config import settings
+    settings.VIDEO_CHUNK_MIN_S = args.min_s
+
+    print(f"os.cpu_count() = {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = args.clip or make_site_clip(
+            os.path.join(tmp, "long.mp4"), "busy", n_frames=args.frames, size=(args.width, args.height)
+        )
+        t0 = time.perf_counter()
+        keyframes, n_frames = keyframe_index(clip)
+        print(f"klip: {n_frames} frame, {len(keyframes)} keyframe, indeks {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+        service = make_service(args, 0)
+        base_s, base = run(service, clip, args)
+        cleanup(service, base)
+        print(f"{'sıralı':>10}: {base_s:6.2f} s  ({n_frames / base_s:6.1f} frame/s)")
+
+        for p in args.processes:
+            service = make_service(args, p)
+            try:
+                warm_s, warm = run(service, clip, args)      # süreç açılışı + model yükleme
+                cleanup(service, warm)
+                elapsed, summary = run(service, clip, args)
+                cleanup(service, summary)
+            finally:
+                service.close()
+            same = all(summary.get(k) == base.get(k) for k in PARITY_KEYS)
+            segments = summary.get("chunks", {}).get("segments", [])
+            print(
+                f"{p:>4} süreç: {elapsed:6.2f} s  ({n_frames / elapsed:6.1f} frame/s)  "
+                f"hızlanma x{base_s / elapsed:4.2f}  ilk tur {warm_s:5.2f} s  "
+                f"{len(segments)} parça  risk aynı: {'evet' if same else 'HAYIR'}"
+            )
+            if not same:
+                for k in PARITY_KEYS:
+                    if summary.get(k) != base.get(k):
+                        print(f"      {k}: sıralı={base.get(k)} parçalı={summary.get(k)}")
+
+
+if __name__ == "__main__":
+    main()
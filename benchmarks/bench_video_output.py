@@ -0,0 +1,103 @@
+"""
+Video overlay çıktı modları: çizim + encode süresi ve dosya boyutu.
+
+    python -m benchmarks.bench_video_output
+    python -m benchmarks.bench_video_output --ft-model model/best.pt --clip saha.mp4
+
+Her mod (none / full / downscaled / highlights / segments) aynı klip üzerinde
+çalıştırılır; toplam süre, encode thread'inde harcanan süre (çizim + küçültme +
+encode), çıktı boyutu ve risk metriklerinin modlar arasında aynı kaldığı
+raporlanır. Ayrıca tek frame'de results.plot() ile BoxRenderer karşılaştırılır.
+--ft-model verilmezse sentetik sahne ve renk eşiklemeli dedektör kullanılır.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+
+from app.services.model_registry import ModelRegistry
+from app.services.video_output import OUTPUT_MODES, BoxRenderer
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.color_detector import ColorPPEDetector
+from benchmarks.stats import format_row, percentiles
+from benchmarks.synthetic import make_site_clip
+
+
+RISK_KEYS = ("total_person", "total_with_helmet", "total_with_vest", "risk_level")
+
+
+def cleanup(service: YoloPPEService, summary: dict) -> None:
+    for name in [summary.get("video_overlay")] + list(summary.get("video_segments") or []):
+        if name:
+            service.artifacts.remove(name)   # segment klasörü boşalınca o da silinir
+
+
+def draw_compare(service: YoloPPEService, clip: str, runs: int) -> None:
+    cap = cv2.VideoCapture(clip)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 60)
+    _, frame = cap.read()
+    cap.release()
+    res = service.ft_model([frame])[0]
+    renderer = BoxRenderer(service.ft_class_names)
+
+    plot, light = [], []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        res.plot()
+        plot.append(time.perf_counter() - t0)
+        img = frame.copy()
+        t0 = time.perf_counter()
+        renderer.draw_result(img, res)
+        light.append(time.perf_counter() - t0)
+    print(f"çizim ({len(res.boxes)} kutu, {frame.shape[1]}x{frame.shape[0]}):")
+    print("  " + format_row("results.plot()", percentiles(plot)))
+    print("  " + format_row("BoxRenderer", percentiles(light)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--clip", default=None)
+    parser.add_argument("--frames", type=int, default=450)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--stride", type=int, default=10)
+    parser.add_argument("--modes", nargs="+", default=list(OUTPUT_MODES))
+    parser.add_argument("--draw-runs", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.ft_model:
+        service = YoloPPEService(args.ft_model, registry=ModelRegistry(), batching=False)
+    else:
+        detector = ColorPPEDetector()
+        service = YoloPPEService(registry=ModelRegistry(loader=lambda path: detector), batching=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = args.clip or make_site_clip(
+            os.path.join(tmp, "busy.mp4"), "busy", n_frames=args.frames, size=(args.width, args.height)
+        )
+        draw_compare(service, clip, args.draw_runs)
+
+        print(f"{'mod':<11s} {'toplam s':>8s} {'encode s':>8s} {'boyut MB':>9s} {'dosya':>5s} {'çözünürlük':>11s}  risk")
+        ref = None
+        for mode in args.modes:
+            t0 = time.perf_counter()
+            s = service.analyze_video(clip, frame_stride=args.stride, output=mode)
+            total = time.perf_counter() - t0
+            out = s["video_output"]
+            risk = {k: s[k] for k in RISK_KEYS}
+            ref = ref or risk
+            files = 0 if mode == "none" else len(s.get("video_segments") or [s["video_overlay"]])
+            size = "x".join(map(str, out.get("size", ["-"])))
+            print(
+                f"{mode:<11s} {total:8.2f} {out.get('encode_seconds', 0.0):8.2f} "
+                f"{out.get('bytes', 0) / 1024 ** 2:9.2f} {files:5d} {size:>11s}  "
+                f"{risk['risk_level']}{'' if risk == ref else ' (FARKLI)'}"
+            )
+            cleanup(service, s)
+
+
+if __name__ == "__main__":
+    main()
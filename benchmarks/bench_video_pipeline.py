@@ -0,0 +1,89 @@
+"""
+analyze_video: eski tek-thread döngü vs. aşamalı (decode / batch / encode) pipeline.
+
+    python -m benchmarks.bench_video_pipeline --ft-model model/best.pt --frames 300
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from app.services.tracker import PersonTracker
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.synthetic import make_video
+
+
+def sequential_loop(service: YoloPPEService, video_path: str, frame_stride: int) -> dict:
+    """Pipeline öncesindeki analyze_video döngüsünün birebir kopyası (referans)."""
+    cap, fps, w, h = service._open_video(video_path)
+    out_path = os.path.join(service.upload_dir, f"video_result_{uuid.uuid4().hex}.mp4")
+    writer = service._open_writer(out_path, fps, w, h)
+
+    frame_idx = 0
+    frames_analyzed = 0
+    tracker = PersonTracker(max_gap=3 * frame_stride)
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_idx % frame_stride == 0:
+            results = service.ft_model(frame)[0]
+            frames_analyzed += 1
+            writer.write(results.plot())
+            ppe = service.ppe_boxes(results)
+            tracker.update(frame_idx, ppe["Person"], ppe["helmet"], ppe["vest"])
+        else:
+            writer.write(frame)
+        frame_idx += 1
+
+    cap.release()
+    writer.release()
+    os.remove(out_path)
+
+    people = tracker.summary()
+    summary = {"frames_analyzed": frames_analyzed}
+    summary.update(service.video_risk(people["persons"], people["with_helmet"], people["with_vest"]))
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ft-model", default=None)
+    parser.add_argument("--base-model", default="yolov8n.pt")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--stride", type=int, default=5)
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    args = parser.parse_args()
+
+    service = YoloPPEService(args.ft_model, args.base_model)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = make_video(os.path.join(tmp, "clip.mp4"), args.frames, (args.width, args.height))
+        # ilk çağrının kurulum maliyeti ölçüme girmesin
+        service.ft_model(np.zeros((args.height, args.width, 3), dtype=np.uint8))
+
+        t0 = time.perf_counter()
+        ref = sequential_loop(service, clip, args.stride)
+        seq_s = time.perf_counter() - t0
+        print(f"sequential          : {args.frames / seq_s:8.1f} fps  ({seq_s:.2f}s)")
+
+        for bs in [int(x) for x in args.batch_sizes.split(",")]:
+            t0 = time.perf_counter()
+            summary = service.analyze_video(clip, frame_stride=args.stride, batch_size=bs)
+            dt = time.perf_counter() - t0
+            service.artifacts.remove(summary["video_overlay"])
+
+            same = all(summary[k] == ref[k] for k in ref)
+            print(
+                f"pipeline batch={bs:<3d}: {args.frames / dt:8.1f} fps  ({dt:.2f}s)"
+                f"  speedup x{seq_s / dt:.2f}  summary_match={same}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Açılış ısınması ve thread ayarı: ilk istek (soğuk) ve sonraki istekler (kararlı) gecikmesi.
+
+    python -m benchmarks.bench_warmup --requests 20 --workers 1 2
+
+Her ölçüm ayrı Python süreçlerinde, gerçek modellerle (model/best.pt +
+yolov8n.pt) yapılır; süreç `import app.main` ile açılır, warmup çağrılır ve
+sentetik 1080p saha fotoğraflarıyla analyze_image_compare istekleri atılır
+(sonuç cache'i kapalı, her istek farklı görsel):
+
+  - lazy     : warmup yok, ilk istek modeli de yükler
+  - eski     : sadece ağırlık yükleme (önceki warmup), thread ayarı yok
+  - yeni     : yükleme + MODEL_WARMUP_SHAPES boyutlarında boş tahminler, THREAD_AUTOTUNE
+
+`--workers N` satırlarında aynı anda N süreç (WEB_CONCURRENCY=N ile N uvicorn
+worker'ı gibi) istek atar; thread ayarı olmadan her süreç tüm çekirdeklerde
+thread açar. Çekirdek sayısı başta yazılır; tek çekirdekte thread farkı görünmez.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.stats import percentiles
+
+_PROBE = r"""
+import json, os, sys, time
+from benchmarks.synthetic import make_site_photo
+mode, n, tmp = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+paths = [make_site_photo(os.path.join(tmp, f"{os.getpid()}_{i}.jpg"), (1920, 1080), 3, 6, seed=i)[0] for i in range(n + 1)]
+
+t0 = time.perf_counter()
+import app.main
+from app.api.routes import yolo_service, artifact_store
+if mode != "lazy":
+    yolo_service.warmup(background=False, inference=(mode == "yeni"))
+ready_s = time.perf_counter() - t0
+
+samples = []
+for p in paths:
+    t = time.perf_counter()
+    out = yolo_service.analyze_image_compare(p)
+    samples.append(time.perf_counter() - t)
+    artifact_store.flush_thumbnails()
+    for side in out.values():
+        for key in ("overlay_image", "thumbnail"):
+            if side.get(key):
+                artifact_store.remove(side[key])
+import torch
+print(json.dumps({"ready_s": ready_s, "first_s": samples[0], "steady": samples[1:],
+                  "threads": torch.get_num_threads(), "interop": torch.get_num_interop_threads()}))
+"""
+
+MODES = {
+    "lazy": {"THREAD_AUTOTUNE": "0"},
+    "eski": {"THREAD_AUTOTUNE": "0"},
+    "yeni": {"THREAD_AUTOTUNE": "1"},
+}
+
+
+def probe(mode: str, n: int, workers: int, tmp: str) -> list:
+    env = dict(
+        os.environ,
+        MODEL_WARMUP_ON_STARTUP="0",
+        RESULT_CACHE_ENABLED="0",
+        YOLO_VERBOSE="False",
+        WEB_CONCURRENCY=str(workers),
+        ARTIFACT_INDEX_PATH=os.path.join(tmp, "artifacts.db"),
+        **MODES[mode],
+    )
+    procs = [
+        subprocess.Popen([sys.executable, "-c", _PROBE, mode, str(n), tmp], stdout=subprocess.PIPE, text=True, env=env)
+        for _ in range(workers)
+    ]
+    out = []
+    for p in procs:
+        stdout, _ = p.communicate()
+        if p.returncode != 0:
+            raise RuntimeError(f"probe başarısız ({mode}, {workers} worker)")
+        out.append(json.loads(stdout.strip().splitlines()[-1]))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args()
+
+    from app.core.tuning import cpu_topology
+
+    print("CPU:", cpu_topology())
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            for mode in MODES:
+                runs = probe(mode, args.requests, workers, tmp)
+                steady = percentiles([s for r in runs for s in r["steady"]])
+                first = max(r["first_s"] for r in runs)
+                ready = max(r["ready_s"] for r in runs)
+                print(
+                    f"{workers} worker {mode:<5s} hazır {ready:5.2f} s  ilk istek {first * 1000:7.0f} ms  "
+                    f"kararlı p50 {steady['p50_ms']:6.0f} ms  p99 {steady['p99_ms']:6.0f} ms  "
+                    f"(torch {runs[0]['threads']} / inter-op {runs[0]['interop']} thread)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+synthetic.make_site_clip sahneleri için renk eşiklemeli PPE "dedektörü".
+
+Eğitilmiş ağırlık olmadan video örnekleme / takip / risk karşılaştırmalarını
+anlamlı kılmak için; ultralytics.YOLO gibi çağrılır ve Results döner.
+"""
+from typing import Any, List, Optional
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import BACKGROUND
+
+
+class ColorPPEDetector:
+    names = {0: "Person", 1: "helmet", 2: "vest"}
+
+    def __init__(self, min_area: int = 300, imgsz: Optional[int] = None) -> None:
+        self.min_area = min_area
+        # verilirse frame önce uzun kenarı imgsz olacak şekilde küçültülür
+        # (modelin giriş boyutundaki ayrıntı kaybını taklit eder)
+        self.imgsz = imgsz
+
+    def _components(self, mask: np.ndarray, min_area: int) -> np.ndarray:
+        n, _, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+        boxes = [
+            (x, y, x + bw, y + bh)
+            for x, y, bw, bh, area in stats[1:]
+            if area >= min_area
+        ]
+        return np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+    def detect(self, frame: np.ndarray) -> np.ndarray:
+        scale = 1.0
+        if self.imgsz and max(frame.shape[:2]) > self.imgsz:
+            scale = self.imgsz / max(frame.shape[:2])
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        f = frame.astype(np.int16)
+        b, g, r = f[..., 0], f[..., 1], f[..., 2]
+        # zemin şeridi ve arka plan dışında kalan her şey çalışan
+        person = (np.abs(f - BACKGROUND).max(axis=2) > 30) & ~((np.abs(b - 70) < 15) & (np.abs(g - 80) < 15) & (np.abs(r - 85) < 15))
+        person = cv2.morphologyEx(person.astype(np.uint8), cv2.MORPH_OPEN, np.ones((5, 5), np.uint8))
+        helmet = (b < 80) & (g > 170) & (r > 200)
+        vest = (g > 150) & (b < 100) & (r < 100)
+
+        rows = []
+        for cls, mask, area in ((0, person, self.min_area), (1, helmet, self.min_area // 10), (2, vest, self.min_area // 5)):
+            for box in self._components(mask, area):
+                rows.append([*(box / scale), 0.9, cls])
+        return np.asarray(rows, dtype=np.float32).reshape(-1, 6)
+
+    def __call__(self, source: Any, **_: Any) -> List[Any]:
+        from ultralytics.engine.results import Results
+
+        frames = source if isinstance(source, (list, tuple)) else [source]
+        frames = [cv2.imread(f) if isinstance(f, str) else f for f in frames]
+        return [Results(f, path="frame.jpg", names=self.names, boxes=self.detect(f)) for f in frames]
+
+
+def load_color_detector(path: str) -> ColorPPEDetector:
+    """ModelRegistry / InferencePool loader'ı (ağırlık yolu yok sayılır)."""
+    return ColorPPEDetector()
@@ -0,0 +1,198 @@
+"""
+Fine-tuned modelin INT8 varyantlarını üretir ve FP32 ile karşılaştıran rapor yazar.
+
+    python -m benchmarks.quantize_report --ft-model model/best.pt \\
+        --calib-dir calibration/ --eval-dir saha_fotograflari/ --report quantization_report.json
+
+Etiketli veri gerekmez: FP32 modelin tespitleri referans kabul edilir.
+- mAP50 (FP32'ye göre): INT8 tespitleri güvenlerine göre sıralanıp sınıf bazında
+  FP32 kutularıyla IoU >= 0.5 eşlenir, AP sınıflar üzerinden ortalanır.
+- precision / recall: aynı eşleme, sabit --conf eşiğinde.
+- risk uyumu: her görselde Person/helmet/vest sayılarından video ile aynı
+  kurala göre hesaplanan risk seviyesi FP32 ile aynı mı.
+- gecikme (görsel başına) ve model dosya boyutu.
+
+--calib-dir / --eval-dir verilmezse sentetik görseller üretilir (sadece akışı
+denemek için; anlamlı doğruluk için sahadan görseller kullanın).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from app.services.detections import result_arrays
+from app.services.onnx_backend import OnnxYOLO, export_onnx
+from app.services.quantization import list_images, quantize_onnx
+from app.services.tracker import iou_matrix
+from app.services.yolo_ppe_service import YoloPPEService
+from benchmarks.stats import format_row, percentiles
+from benchmarks.synthetic import make_image
+
+
+Dets = Tuple[np.ndarray, np.ndarray, np.ndarray]  # (cls, conf, xyxy)
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    """COCO tarzı 101 noktalı AP: her recall eşiğinde, o recall'a ulaşan en yüksek precision."""
+    if len(recall) == 0:
+        return 0.0
+    envelope = np.flip(np.maximum.accumulate(np.flip(precision)))
+    idx = np.searchsorted(recall, np.linspace(0, 1, 101), side="left")
+    return float(np.where(idx < len(recall), envelope[np.minimum(idx, len(recall) - 1)], 0.0).mean())
+
+
+def match_flags(ref: Dets, pred: Dets, iou_thr: float) -> np.ndarray:
+    """Her tahmin için TP bayrağı: sınıf bazında, güven sırasına göre greedy IoU eşleme."""
+    tp = np.zeros(len(pred[0]), dtype=bool)
+    for c in np.unique(pred[0]):
+        p_idx = np.where(pred[0] == c)[0]
+        r_box = ref[2][ref[0] == c]
+        if len(r_box) == 0:
+            continue
+        p_idx = p_idx[np.argsort(-pred[1][p_idx])]
+        iou = iou_matrix(pred[2][p_idx], r_box)
+        used = np.zeros(len(r_box), dtype=bool)
+        for k, i in enumerate(p_idx):
+            cand = np.where(used, -1.0, iou[k])
+            j = int(np.argmax(cand))
+            if cand[j] >= iou_thr:
+                used[j] = True
+                tp[i] = True
+    return tp
+
+
+def agreement(refs: List[Dets], preds: List[Dets], conf: float, iou_thr: float) -> Dict[str, float]:
+    classes = np.unique(np.concatenate([r[0] for r in refs] + [p[0] for p in preds] + [np.zeros(0, np.int64)]))
+    flags = [match_flags(ref, pred, iou_thr) for ref, pred in zip(refs, preds)]
+    aps = []
+    tp_total = fp_total = fn_total = 0
+    for c in classes:
+        confs, tps, n_ref = [], [], 0
+        for ref, pred, tp in zip(refs, preds, flags):
+            mask = pred[0] == c
+            confs.append(pred[1][mask])
+            tps.append(tp[mask])
+            n_ref += int((ref[0] == c).sum())
+        confs, tps = np.concatenate(confs), np.concatenate(tps)
+        if n_ref == 0:
+            fp_total += int((confs >= conf).sum())
+            continue
+        order = np.argsort(-confs)
+        tpc = np.cumsum(tps[order])
+        fpc = np.cumsum(~tps[order])
+        aps.append(average_precision(tpc / n_ref, tpc / np.maximum(tpc + fpc, 1)))
+
+        at = confs >= conf
+        tp_total += int(tps[at].sum())
+        fp_total += int((~tps[at]).sum())
+        fn_total += n_ref - int(tps[at].sum())
+    return {
+        "map50_vs_fp32": float(np.mean(aps)) if aps else float("nan"),
+        "precision": tp_total / max(tp_total + fp_total, 1),
+        "recall": tp_total / max(tp_total + fn_total, 1),
+    }
+
+
+def image_risk(dets: Dets, names: Dict[int, str], conf: float) -> str:
+    keep = dets[1] >= conf
+    counts = {n: 0 for n in ("Person", "helmet", "vest")}
+    for c in dets[0][keep]:
+        name = names.get(int(c))
+        if name in counts:
+            counts[name] += 1
+    return YoloPPEService.video_risk(counts["Person"], counts["helmet"], counts["vest"])["risk_level"]
+
+
+def run_model(model, images: List[np.ndarray], conf: float) -> Tuple[List[Dets], List[float]]:
+    model(images[0], conf=conf)  # ısınma
+    dets, times = [], []
+    for img in images:
+        t0 = time.perf_counter()
+        res = model(img, conf=conf)[0]
+        times.append(time.perf_counter() - t0)
+        dets.append(result_arrays(res))
+    return dets, times
+
+
+def synthetic_folder(folder: str, n: int, seed: int) -> str:
+    os.makedirs(folder, exist_ok=True)
+    sizes = [(1920, 1080), (1280, 720), (1080, 1920), (800, 600)]
+    for i in range(n):
+        make_image(os.path.join(folder, f"img{i:03d}.jpg"), sizes[i % len(sizes)], n_people=1 + i % 6, seed=seed + i)
+    return folder
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ft-model", default="model/best.pt")
+    parser.add_argument("--calib-dir", default=None)
+    parser.add_argument("--eval-dir", default=None)
+    parser.add_argument("--calib-images", type=int, default=100)
+    parser.add_argument("--eval-images", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", default=["dynamic", "static"], choices=["dynamic", "static"])
+    parser.add_argument("--cache-dir", default=None, help="ONNX/INT8 çıktıları (varsayılan: geçici klasör)")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--ap-conf", type=float, default=0.001, help="mAP için tahmin güven tabanı")
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--report", default="quantization_report.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        calib_dir = args.calib_dir or synthetic_folder(os.path.join(tmp, "calib"), 16, seed=1000)
+        eval_dir = args.eval_dir or synthetic_folder(os.path.join(tmp, "eval"), 12, seed=2000)
+        cache_dir = args.cache_dir or os.path.join(tmp, "onnx")
+
+        images = [cv2.imread(p) for p in list_images(eval_dir, args.eval_images)]
+        images = [img for img in images if img is not None]
+
+        fp32_path = export_onnx(args.ft_model, cache_dir, args.imgsz)
+        variants = {"fp32": fp32_path}
+        for mode in args.modes:
+            variants[f"int8-{mode}"] = quantize_onnx(fp32_path, mode, calib_dir, args.calib_images, args.imgsz)
+
+        fp32 = OnnxYOLO(fp32_path)
+        names = fp32.names
+        ref_dets, _ = run_model(fp32, images, args.conf)
+
+        report = {
+            "ft_model": os.path.abspath(args.ft_model),
+            "eval_images": len(images),
+            "calib_dir": args.calib_dir or "synthetic",
+            "conf": args.conf,
+            "iou": args.iou,
+            "variants": {},
+        }
+        for name, path in variants.items():
+            model = fp32 if name == "fp32" else OnnxYOLO(path)
+            ap_dets, _ = run_model(model, images, args.ap_conf)
+            dets, times = run_model(model, images, args.conf)
+            risk_same = sum(
+                image_risk(r, names, args.conf) == image_risk(d, names, args.conf)
+                for r, d in zip(ref_dets, dets)
+            )
+            entry = {
+                "path": path,
+                "size_mb": os.path.getsize(path) / 1024 ** 2,
+                "latency": percentiles(times),
+                "risk_agreement": risk_same / max(len(images), 1),
+            }
+            entry.update(agreement(ref_dets, ap_dets, args.conf, args.iou))
+            report["variants"][name] = entry
+
+            print(f"== {name}: {entry['size_mb']:.1f} MB, mAP50(FP32'ye göre) {entry['map50_vs_fp32']:.3f}, "
+                  f"P {entry['precision']:.3f}, R {entry['recall']:.3f}, risk uyumu {entry['risk_agreement']:.1%}")
+            print(format_row(f"{name} / görsel", entry["latency"]))
+
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print("Rapor:", args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+İnternetsiz koşan, yerelde üretilen küçük YOLO modeli (benchmark suite'i için).
+
+Ağırlıklar sabit seed'le rastgele başlatılır: tespit kalitesi yoktur (boş
+sahnede kutu çıkmaz) ama graf, letterbox, NMS ve Results maliyeti gerçek
+yolov8 ile aynıdır. Dosya bir kez üretilir; aynı seed aynı ağırlıkları verir.
+
+calibrate=True ile BatchNorm istatistikleri sentetik sahnelerden hesaplanır:
+rastgele ağda özellikler sıfıra söndüğü için skorlar her yerde aynıdır, kalibre
+edilmiş ağda ise dağılır ve düşük eşikte gerçek, birbirinden ayrık kutular
+çıkar (backend eşlik kontrolleri için).
+"""
+import os
+import tempfile
+from typing import Dict, Sequence
+
+PPE_NAMES = ("Person", "helmet", "vest")
+
+
+def make_standin_yolo(
+    path: str,
+    names: Sequence[str] = PPE_NAMES,
+    scale: str = "n",
+    seed: int = 0,
+    calibrate: bool = False,
+) -> str:
+    """ultralytics'in paketle gelen yolov8{scale}.yaml tanımından `path`'e .pt checkpoint yazar."""
+    if os.path.exists(path):
+        return path
+    import torch
+    from ultralytics.nn.tasks import DetectionModel
+
+    torch.manual_seed(seed)
+    model = DetectionModel(f"yolov8{scale}.yaml", nc=len(names), verbose=False)
+    model.names = dict(enumerate(names))
+    if calibrate:
+        _calibrate_batchnorm(model, seed=seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # ultralytics.YOLO(path) checkpoint'ten "model" anahtarını okur
+    torch.save({"model": model, "train_args": {}, "date": None, "version": None}, path)
+    return path
+
+
+def _calibrate_batchnorm(model, frames: int = 6, imgsz: int = 640, seed: int = 0) -> None:
+    """BatchNorm running mean/var'ı sentetik şantiye karelerinin ortalamasına çeker."""
+    import cv2
+    import torch
+
+    from benchmarks.synthetic import make_image
+
+    for m in model.modules():
+        if isinstance(m, torch.nn.BatchNorm2d):
+            m.reset_running_stats()
+            m.momentum = None      # kümülatif ortalama
+    model.train()
+    with tempfile.TemporaryDirectory() as tmp, torch.no_grad():
+        for i in range(frames):
+            img = cv2.imread(make_image(os.path.join(tmp, f"calib{i}.jpg"), (1280, 720), n_people=4, seed=1000 + seed + i))
+            img = cv2.cvtColor(cv2.resize(img, (imgsz, imgsz)), cv2.COLOR_BGR2RGB)
+            model(torch.from_numpy(img).permute(2, 0, 1)[None].float() / 255.0)
+    model.eval()
+
+
+def make_standin_pair(directory: str, scale: str = "n", calibrate: bool = False) -> Dict[str, str]:
+    """Fine-tuned (3 PPE sınıfı) ve pretrained (COCO gibi 80 sınıf, 0 = person) stand-in'ler."""
+    coco = ["person"] + [f"class_{i}" for i in range(1, 80)]
+    suffix = "_bn" if calibrate else ""
+    return {
+        "ft": make_standin_yolo(
+            os.path.join(directory, f"standin_ppe_{scale}{suffix}.pt"), PPE_NAMES, scale, calibrate=calibrate
+        ),
+        "base": make_standin_yolo(
+            os.path.join(directory, f"standin_coco_{scale}{suffix}.pt"), coco, scale, calibrate=calibrate
+        ),
+    }
@@ -0,0 +1,21 @@
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+def percentiles(samples_s: Sequence[float]) -> Dict[str, float]:
+    """Saniye cinsinden örneklerden ms cinsinden p50/p90/p99/ortalama."""
+    a = np.asarray(samples_s, dtype=np.float64) * 1000.0
+    return {
+        "mean_ms": float(a.mean()),
+        "p50_ms": float(np.percentile(a, 50)),
+        "p90_ms": float(np.percentile(a, 90)),
+        "p99_ms": float(np.percentile(a, 99)),
+    }
+
+
+def format_row(name: str, stats: Dict[str, float]) -> str:
+    return (
+        f"{name:<22s} mean {stats['mean_ms']:9.3f}  p50 {stats['p50_ms']:9.3f}"
+        f"  p90 {stats['p90_ms']:9.3f}  p99 {stats['p99_ms']:9.3f} ms"
+    )
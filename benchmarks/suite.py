@@ -0,0 +1,382 @@
+"""
+Uçtan uca benchmark paketi: sentetik PPE iş yükleri, JSON çıktı, baseline karşılaştırması.
+
+    python -m benchmarks.suite --out main.json
+    python -m benchmarks.suite --quick --out pr.json --baseline main.json --threshold 0.15
+    python -m benchmarks.suite --model standin --only image compare
+
+Her şey yerelde üretilir, internet gerekmez:
+  - görseller: benchmarks.synthetic.make_site_photo, --sizes çözünürlüklerinde,
+    "seyrek" (2 yakın + 2 uzak) ve "yoğun" (4 yakın + 24 uzak çalışan) sahneler
+  - videolar: make_site_clip("busy"), --video-size ve --video-frames
+  - model (--model):
+      color   : renk eşiklemeli dedektör (benchmarks.color_detector); kutular
+                sahnedeki çalışanlarla birebir, ölçülen iş servis + overlay + HTTP yolu
+      standin : yolov8n.yaml'dan sabit seed'le kurulan küçük YOLO
+                (benchmarks.standin_model); gerçek graf maliyeti, tespit yok
+      diğer   : fine-tuned ağırlık yolu (ör. model/best.pt), pretrained --base-model
+
+Senaryolar (--only ile grup seçilir):
+  image    analyze_image, boyut x yoğunluk
+  compare  analyze_image_compare, boyut x yoğunluk
+  video    analyze_video (sabit stride), toplam süre ve frame/s
+  http     TestClient üzerinden POST /safety/image (--concurrency seviyelerinde),
+           GET / ve /api/inspections, POST /safety/video + iş tamamlanana kadar
+
+Her senaryo gecikme yüzdelikleri (ms), uygun olanlarda throughput (istek/s,
+frame/s) ve bir "check" (kişi / PPE sayıları, risk) üretir. --baseline verilirse
+p50 ve throughput `--threshold` oranından fazla kötüleşen senaryolar REGRESYON,
+check'i değişenler DAVRANIŞ olarak işaretlenir ve çıkış kodu 1 olur.
+Tekil özellik ölçümleri için diğer bench_*.py script'leri duruyor; hepsi aynı
+sentetik üreticileri (synthetic.py), renk dedektörünü ve stats.py'yi kullanır.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.stats import percentiles
+
+
+DENSITIES = {"seyrek": (2, 2), "yoğun": (4, 24)}
+GROUPS = ("image", "compare", "video", "http")
+# (metrik, büyük olan mı iyi)
+COMPARED = (("p50_ms", False), ("rps", True), ("fps", True))
+
+
+# ---------- yardımcılar ----------
+def parse_size(text: str) -> Tuple[int, int]:
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def run_concurrent(fn: Callable[[int], Any], concurrency: int, total: int) -> Tuple[Dict[str, float], List[Any]]:
+    """`fn(i)`'yi `concurrency` thread'le toplam `total` kez çağırır; gecikmeler, istek/s ve dönüşler."""
+    latencies: List[float] = []
+    outputs: List[Any] = []
+    lock = threading.Lock()
+    counter = iter(range(total))
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            t0 = time.perf_counter()
+            out = fn(i)
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                outputs.append(out)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    stats = percentiles(latencies)
+    stats["rps"] = len(latencies) / wall
+    return stats, outputs
+
+
+def summarize_counts(outputs: List[Dict[str, Any]]) -> Dict[str, int]:
+    """analyze_image / compare çıktılarından model ve sınıf başına toplam kutu (davranış kontrolü)."""
+    totals: Dict[str, int] = {}
+    for out in outputs:
+        for side, result in (out.items() if "fine_tuned" in out else [("fine_tuned", out)]):
+            for det in result["detections"]:
+                key = f"{side}.{det['class_name']}"
+                totals[key] = totals.get(key, 0) + 1
+    return dict(sorted(totals.items()))
+
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.core.tuning import cpu_topology
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": cpu_topology(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+    }
+
+
+# ---------- servis ----------
+def make_service(args: argparse.Namespace, tmp: str, artifacts):
+    from app.services.model_registry import ModelRegistry
+    from app.services.yolo_ppe_service import YoloPPEService
+
+    if args.model == "color":
+        from benchmarks.color_detector import load_color_detector
+
+        registry = ModelRegistry(loader=load_color_detector)
+        ft, base = "color-ppe", "color-base"      # loader yolu yok sayar
+    elif args.model == "standin":
+        from benchmarks.standin_model import make_standin_pair
+
+        paths = make_standin_pair(os.path.join(tmp, "models"))
+        registry, ft, base = ModelRegistry(), paths["ft"], paths["base"]
+    else:
+        registry, ft, base = ModelRegistry(), args.model, args.base_model
+    return YoloPPEService(ft, base, registry=registry, artifacts=artifacts)
+
+
+# ---------- senaryolar ----------
+def bench_images(service, tmp: str, args: argparse.Namespace, compare: bool) -> Dict[str, Dict[str, Any]]:
+    from benchmarks.synthetic import make_site_photo
+
+    fn = service.analyze_image_compare if compare else service.analyze_image
+    group = "compare" if compare else "image"
+    results = {}
+    for size in args.sizes:
+        w, h = parse_size(size)
+        for density, (near, far) in DENSITIES.items():
+            images = [
+                make_site_photo(os.path.join(tmp, "img", f"{size}_{density}_{i}.jpg"), (w, h), near, far, seed=i)[0]
+                for i in range(args.images)
+            ]
+            for p in images[:2]:    # ısınma (model yükleme, ilk graf)
+                fn(p)
+            stats, outputs = run_concurrent(lambda i: fn(images[i % len(images)]), 1, args.runs)
+            stats["check"] = summarize_counts(outputs[: len(images)])
+            results[f"{group}/{size}/{density}"] = stats
+    return results
+
+
+def bench_video(service, tmp: str, args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    from app.services.frame_sampler import FixedStrideSampler
+    from benchmarks.synthetic import make_site_clip
+
+    w, h = parse_size(args.video_size)
+    clip = make_site_clip(os.path.join(tmp, "clip.mp4"), "busy", n_frames=args.video_frames, size=(w, h))
+    results = {}
+    for output in ("none", "full"):
+        samples, summary = [], {}
+        for _ in range(args.video_runs):
+            t0 = time.perf_counter()
+            summary = service.analyze_video(
+                clip, sampler=FixedStrideSampler(args.stride), batch_size=8, output=output
+            )
+            samples.append(time.perf_counter() - t0)
+        stats = percentiles(samples)
+        stats["fps"] = args.video_frames / (stats["p50_ms"] / 1000.0)
+        stats["check"] = {
+            k: summary.get(k)
+            for k in ("frames_analyzed", "total_person", "total_with_helmet", "total_with_vest", "risk_level", "box_detections")
+        }
+        results[f"video/{args.video_size}/{output}"] = stats
+    return results
+
+
+def bench_http(service, tmp: str, args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    from fastapi.testclient import TestClient
+
+    from app.api import routes
+    from app.main import app
+    from benchmarks.synthetic import make_site_clip, make_site_photo
+
+    # route'lar modül global'ini çağrı anında okur; aynı stand-in model HTTP'de de
+    routes.yolo_service = service
+    client = TestClient(app)
+    w, h = parse_size(args.sizes[0])
+    photos = []
+    for i in range(args.images):
+        path = make_site_photo(os.path.join(tmp, "http", f"{i}.jpg"), (w, h), 3, 6, seed=100 + i)[0]
+        with open(path, "rb") as f:
+            photos.append(f.read())
+
+    def post_image(i: int) -> int:
+        r = client.post(
+            "/safety/image",
+            data={"site_id": "1", "inspector": "bench", "risk_level": "low", "notes": ""},
+            files={"file": (f"site_{i}.jpg", photos[i % len(photos)], "image/jpeg")},
+        )
+        return r.status_code
+
+    results = {}
+    post_image(0)   # ısınma
+    for c in args.concurrency:
+        stats, codes = run_concurrent(post_image, c, max(args.runs, 2 * c))
+        stats["check"] = {"status": sorted(set(codes))}
+        results[f"http/POST /safety/image c{c}"] = stats
+
+    for url in ("/", "/api/inspections"):
+        client.get(url)
+        c = max(args.concurrency)
+        stats, codes = run_concurrent(lambda i: client.get(url).status_code, c, max(args.runs, 2 * c))
+        stats["check"] = {"status": sorted(set(codes))}
+        results[f"http/GET {url} c{c}"] = stats
+
+    vw, vh = parse_size(args.video_size)
+    clip = make_site_clip(os.path.join(tmp, "http_clip.mp4"), "busy", n_frames=args.video_frames, size=(vw, vh))
+    with open(clip, "rb") as f:
+        video = f.read()
+    samples, job = [], {}
+    for i in range(args.video_runs):
+        t0 = time.perf_counter()
+        # farklı içerik: sonuç cache'i açık kurulumlarda da gerçek analiz ölçülsün
+        payload = video + i.to_bytes(4, "little")
+        r = client.post(
+            "/safety/video",
+            data={"site_id": "1", "inspector": "bench", "notes": ""},
+            files={"file": ("clip.mp4", payload, "video/mp4")},
+        )
+        # iş kimliği sayfadaki data-job-id'den (tarayıcıdaki polling ile aynı)
+        match = re.search(r'data-job-id="([^"]+)"', r.text)
+        job_id = match.group(1) if match else None
+        while job_id is not None:
+            job = client.get(f"/safety/video/jobs/{job_id}").json()
+            if job["status"] in ("done", "failed", "cancelled"):
+                break
+            time.sleep(0.05)
+        samples.append(time.perf_counter() - t0)
+    stats = percentiles(samples)
+    stats["fps"] = args.video_frames / (stats["p50_ms"] / 1000.0)
+    stats["check"] = {"status": job.get("status"), "risk_level": (job.get("summary") or {}).get("risk_level")}
+    results[f"http/POST /safety/video {args.video_size}"] = stats
+    return results
+
+
+# ---------- baseline ----------
+def compare_baseline(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Baseline'a göre kötüleşen / davranışı değişen senaryoların satırları."""
+    problems = []
+    base_results = baseline.get("results", {})
+    for name, cur in current["results"].items():
+        base = base_results.get(name)
+        if base is None:
+            continue
+        for metric, higher_better in COMPARED:
+            if metric not in cur or not base.get(metric):
+                continue
+            change = (cur[metric] - base[metric]) / base[metric]
+            worse = -change if higher_better else change
+            if worse > threshold:
+                problems.append(
+                    f"REGRESYON {name} {metric}: {base[metric]:.2f} -> {cur[metric]:.2f} ({change * 100:+.1f}%)"
+                )
+        if cur.get("check") != base.get("check"):
+            problems.append(f"DAVRANIŞ {name}: {base.get('check')} -> {cur.get('check')}")
+    return problems
+
+
+def print_table(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]]) -> None:
+    base_results = (baseline or {}).get("results", {})
+    print(f"{'senaryo':<34s} {'p50 ms':>9s} {'p99 ms':>9s} {'istek/s':>8s} {'frame/s':>8s} {'p50 Δ':>8s}")
+    for name, r in results.items():
+        base = base_results.get(name)
+        delta = f"{(r['p50_ms'] / base['p50_ms'] - 1) * 100:+7.1f}%" if base else ""
+        rps = f"{r['rps']:8.2f}" if "rps" in r else " " * 8
+        fps = f"{r['fps']:8.1f}" if "fps" in r else " " * 8
+        print(f"{name:<34s} {r['p50_ms']:9.1f} {r['p99_ms']:9.1f} {rps} {fps} {delta:>8s}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="color", help="color | standin | fine-tuned ağırlık yolu")
+    parser.add_argument("--base-model", default="yolov8n.pt")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--sizes", nargs="+", default=["1280x720", "1920x1080", "3840x2160"])
+    parser.add_argument("--images", type=int, default=4, help="senaryo başına farklı görsel")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--video-size", default="1280x720")
+    parser.add_argument("--video-frames", type=int, default=300)
+    parser.add_argument("--video-runs", type=int, default=3)
+    parser.add_argument("--stride", type=int, default=10)
+    parser.add_argument("--quick", action="store_true", help="CI için: tek boyut, az tekrar")
+    parser.add_argument("--out", default=None, help="sonuç JSON dosyası")
+    parser.add_argument("--baseline", default=None, help="karşılaştırılacak önceki JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="regresyon eşiği (0.15 = %%15)")
+    args = parser.parse_args()
+    if args.quick:
+        args.sizes, args.runs, args.concurrency = args.sizes[:1], 8, [1, 4]
+        args.video_frames, args.video_runs = 120, 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app import edilmeden önce: ayarlar modül yüklenirken okunur. Sonuç cache'i
+        # kapalı (her istek gerçek analiz), kalıcı dosyalar geçici klasörde.
+        os.environ.update(
+            STORAGE_BACKEND="sqlite",
+            SQLITE_PATH=os.path.join(tmp, "bench.db"),
+            ARTIFACT_INDEX_PATH=os.path.join(tmp, "artifacts.db"),
+            RESULT_CACHE_ENABLED="0",
+            MODEL_WARMUP_ON_STARTUP="0",
+            STREAM_SOURCES="",
+            YOLO_OFFLINE="1",
+            YOLO_VERBOSE="False",
+        )
+        from app.core.config import settings
+
+        settings.UPLOAD_DIR = os.path.join(tmp, "uploads")
+
+        from app.services.artifact_store import ArtifactStore
+
+        artifacts = ArtifactStore(os.path.join(tmp, "artifacts"), os.path.join(tmp, "service_artifacts.db"))
+        service = make_service(args, tmp, artifacts)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        t0 = time.perf_counter()
+        try:
+            if "image" in args.only:
+                results.update(bench_images(service, tmp, args, compare=False))
+            if "compare" in args.only:
+                results.update(bench_images(service, tmp, args, compare=True))
+            if "video" in args.only:
+                results.update(bench_video(service, tmp, args))
+            if "http" in args.only:
+                results.update(bench_http(service, tmp, args))
+        finally:
+            service.close()
+            artifacts.close()
+
+    report = {"meta": environment(args), "results": results}
+    report["meta"]["seconds"] = round(time.perf_counter() - t0, 1)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print("sonuçlar:", args.out)
+
+    if baseline is not None:
+        if baseline.get("meta", {}).get("cpu") != report["meta"]["cpu"] or baseline["meta"]["args"].get("model") != args.model:
+            print("uyarı: baseline farklı makinede / modelle alınmış, farklar buna bağlı olabilir")
+        problems = compare_baseline(report, baseline, args.threshold)
+        for line in problems:
+            print(line)
+        if problems:
+            sys.exit(1)
+        print(f"baseline'a göre %{args.threshold * 100:.0f} eşiğini aşan fark yok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import os
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+
+def make_video(
+    path: str,
+    n_frames: int = 300,
+    size: Tuple[int, int] = (1280, 720),
+    fps: float = 25.0,
+    n_people: int = 4,
+    seed: int = 0,
+) -> str:
+    """
+    Hareket eden dikdörtgenlerden oluşan sentetik bir klip üretir.
+    Model çıktısı önemli değil; decode / inference / encode maliyetini ölçmek için.
+    """
+    w, h = size
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform([0, 0], [w - 80, h - 200], size=(n_people, 2))
+    vel = rng.uniform(-6, 6, size=(n_people, 2))
+    colors = rng.integers(0, 255, size=(n_people, 3))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+    if not writer.isOpened():
+        raise RuntimeError(f"Sentetik video yazılamadı: {path}")
+
+    background = np.full((h, w, 3), 90, dtype=np.uint8)
+    for _ in range(n_frames):
+        frame = background.copy()
+        pos += vel
+        bounce = (pos < 0) | (pos > [w - 80, h - 200])
+        vel[bounce] *= -1
+        pos = np.clip(pos, 0, [w - 80, h - 200])
+        for (x, y), c in zip(pos.astype(int), colors):
+            cv2.rectangle(frame, (x, y), (x + 80, y + 200), tuple(int(v) for v in c), -1)
+            cv2.circle(frame, (x + 40, y + 20), 18, (0, 200, 255), -1)
+        writer.write(frame)
+
+    writer.release()
+    return path
+
+
+def make_image(
+    path: str,
+    size: Tuple[int, int] = (1280, 720),
+    n_people: int = 6,
+    seed: int = 0,
+) -> str:
+    """Rastgele yerleştirilmiş "kişi" dikdörtgenleri içeren sentetik fotoğraf."""
+    w, h = size
+    rng = np.random.default_rng(seed)
+    img = rng.integers(60, 140, size=(h, w, 3), dtype=np.uint8)
+    bw, bh = max(w // 16, 8), max(h // 4, 16)
+    for _ in range(n_people):
+        x = int(rng.integers(0, max(w - bw, 1)))
+        y = int(rng.integers(0, max(h - bh, 1)))
+        color = tuple(int(v) for v in rng.integers(0, 255, size=3))
+        cv2.rectangle(img, (x, y), (x + bw, y + bh), color, -1)
+        cv2.circle(img, (x + bw // 2, y + bw // 4), max(bw // 4, 2), (0, 200, 255), -1)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    cv2.imwrite(path, img)
+    return path
+
+
+# Çalışan gövde renkleri: sarı (kask) ve yeşil (yelek) ile karışmayan, gri tonda
+# arka plandan ayrışan tonlar (BGR)
+BODY_COLORS = [(60, 20, 20), (200, 200, 230), (30, 30, 30), (20, 40, 80), (230, 200, 160)]
+HELMET_COLOR = (0, 220, 255)
+VEST_COLOR = (40, 200, 40)
+BACKGROUND = 90
+
+
+def draw_worker(frame: np.ndarray, x: int, y: int, helmet: bool, vest: bool, color, size=(60, 160)) -> None:
+    bw, bh = size
+    cv2.rectangle(frame, (x, y + bh // 8), (x + bw, y + bh), color, -1)
+    head = (x + bw // 2, y + bh // 8)
+    cv2.circle(frame, head, bw // 4, HELMET_COLOR if helmet else (90, 140, 200), -1)
+    if vest:
+        cv2.rectangle(frame, (x + 4, y + bh // 4), (x + bw - 4, y + bh // 2), VEST_COLOR, -1)
+
+
+def make_site_photo(
+    path: str,
+    size: Tuple[int, int] = (3840, 2160),
+    n_near: int = 3,
+    n_far: int = 12,
+    seed: int = 0,
+    cluster: float = 1.0,
+) -> Tuple[str, List[Tuple[Tuple[int, int, int, int], bool, bool]]]:
+    """
+    Drone / geniş açı fotoğrafı: önde birkaç büyük, uzakta çok sayıda küçük
+    çalışan (renk kodlu, bkz. benchmarks.color_detector). `cluster` < 1 ise
+    çalışanlar görselin o oranındaki bir bölgede toplanır (tek ekip).
+    Dönen: (yol, gerçek değerler) - her çalışan için ((x1, y1, x2, y2), kask
+    var mı, yelek var mı).
+    """
+    w, h = size
+    rng = np.random.default_rng(seed)
+    area_w, area_h = int(w * cluster), int(h * cluster)
+    ox, oy = int(rng.integers(0, w - area_w + 1)), int(rng.integers(0, h - area_h + 1))
+    img = np.clip(rng.normal(BACKGROUND, 2.0, size=(h, w, 3)), 0, 255).astype(np.uint8)
+    truth = []
+    placed: List[Tuple[int, int, int, int]] = []
+    scale = w / 3840
+    for k in range(n_near + n_far):
+        bw, bh = (int(180 * scale), int(480 * scale)) if k < n_near else (int(72 * scale), int(192 * scale))
+        for _ in range(100):   # çakışmayan bir yer bul
+            x = ox + int(rng.integers(0, area_w - bw))
+            y = oy + int(rng.integers(0, area_h - bh))
+            if all(x + bw < a or x > c or y + bh < b or y > d for a, b, c, d in placed):
+                break
+        helmet, vest = bool(rng.random() < 0.6), bool(rng.random() < 0.7)
+        draw_worker(img, x, y, helmet, vest, BODY_COLORS[k % len(BODY_COLORS)], size=(bw, bh))
+        placed.append((x - 8, y - 8, x + bw + 8, y + bh + 8))
+        truth.append(((x, y, x + bw, y + bh), helmet, vest))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    cv2.imwrite(path, img)
+    return path, truth
+
+
+def make_site_clip(
+    path: str,
+    scene: str = "static",
+    n_frames: int = 600,
+    size: Tuple[int, int] = (960, 540),
+    fps: float = 30.0,
+    seed: int = 0,
+    noise: float = 2.0,
+) -> str:
+    """
+    Renk kodlu çalışanlar içeren sahne klibi (bkz. benchmarks.color_detector):
+
+    - "static": sabit kamera, yerinde duran 2 çalışan; klibin ortasında kısa bir
+      aralıkta kasksız bir çalışan hızla kadrajdan geçer.
+    - "busy": sürekli hareket eden 6 çalışan, yarısı eksik PPE ile.
+    - "idle": kimsenin olmadığı boş sahne.
+    `noise`: sensör gürültüsü (std), hareket skorunun gürültüye dayanıklılığı için.
+    """
+    w, h = size
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+    if not writer.isOpened():
+        raise RuntimeError(f"Sentetik video yazılamadı: {path}")
+
+    background = np.full((h, w, 3), BACKGROUND, dtype=np.uint8)
+    cv2.rectangle(background, (0, int(h * 0.8)), (w, h), (70, 80, 85), -1)
+
+    n_busy = 6
+    pos = rng.uniform([0, 0], [w - 60, h - 160], size=(n_busy, 2))
+    vel = rng.uniform(-5, 5, size=(n_busy, 2))
+    walk_start, walk_len = n_frames // 2, max(int(fps * 2.5), 8)
+
+    for i in range(n_frames):
+        frame = background.copy()
+        if scene == "static":
+            draw_worker(frame, int(w * 0.2), int(h * 0.45), True, True, BODY_COLORS[0])
+            draw_worker(frame, int(w * 0.6), int(h * 0.40), True, False, BODY_COLORS[1])
+            if walk_start <= i < walk_start + walk_len:
+                x = int((i - walk_start) / walk_len * (w - 60))
+                draw_worker(frame, x, int(h * 0.25), False, False, BODY_COLORS[2])
+        elif scene == "busy":
+            pos += vel
+            bounce = (pos < 0) | (pos > [w - 60, h - 160])
+            vel[bounce] *= -1
+            pos = np.clip(pos, 0, [w - 60, h - 160])
+            for k, (x, y) in enumerate(pos.astype(int)):
+                draw_worker(frame, x, y, k % 2 == 0, k % 3 != 0, BODY_COLORS[k % len(BODY_COLORS)])
+        elif scene != "idle":
+            raise ValueError(f"Bilinmeyen sahne: {scene}")
+        if noise:
+            frame = np.clip(frame + rng.normal(0, noise, frame.shape), 0, 255).astype(np.uint8)
+        writer.write(frame)
+
+    writer.release()
+    return path
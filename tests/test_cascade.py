@@ -0,0 +1,51 @@
+import numpy as np
+
+from app.services.cascade import cascade_detect, crop_regions
+from app.services.tiling import merge_detections, offset_and_nms
+
+W, H = 1000, 800
+PERSON = [400.0, 300.0, 500.0, 600.0]
+
+
+def _detect_persons(images):
+    # küçültülmüş frame koordinatında tek kişi (sınıf 0)
+    s = images[0].shape[1] / W
+    return [np.array([[c * s for c in PERSON] + [0.9, 0]], dtype=np.float32) for _ in images]
+
+
+def test_ppe_on_crop_edge_is_kept():
+    image = np.zeros((H, W, 3), dtype=np.uint8)
+    (x1, y1, x2, y2), = crop_regions(np.array([PERSON]), W, H)
+    assert y1 > 0   # kırpıntının üst kenarı görselin içinde
+
+    # kask kırpıntının üst kenarına değiyor (baş kırpıntıdan taşıyor)
+    helmet = np.array([[10, 0, 60, 30, 0.8, 1]], dtype=np.float32)
+    calls = []
+
+    def detect_ppe(crops, imgsz):
+        calls.append(imgsz)
+        return [helmet.copy() for _ in crops]
+
+    _, stage2, n_crops = cascade_detect([image], _detect_persons, detect_ppe, person_cls=0)
+
+    assert n_crops == 1 and calls == [320]
+    np.testing.assert_allclose(stage2[0][:, :4], [[x1 + 10, y1, x1 + 60, y1 + 30]])
+    assert stage2[0][0, 5] == 1
+
+
+def test_offset_and_nms_keeps_edge_boxes_that_tiling_drops():
+    tile = (100, 100, 300, 300)
+    data = np.array([[0, 50, 40, 90, 0.7, 2]], dtype=np.float32)   # sol kenarda
+    assert len(merge_detections(np.zeros((0, 6)), [(tile, data)], W, H)) == 0
+    out = offset_and_nms([(tile, data)], W, H)
+    np.testing.assert_allclose(out[:, :4], [[100, 150, 140, 190]])
+
+
+def test_offset_and_nms_is_classwise():
+    tile_a, tile_b = (0, 0, 200, 200), (150, 0, 350, 200)
+    a = np.array([[100, 10, 180, 60, 0.9, 1]], dtype=np.float32)
+    same = np.array([[-50, 10, 30, 60, 0.6, 1]], dtype=np.float32)    # aynı kutu, diğer kırpıntıda
+    other = np.array([[-50, 10, 30, 60, 0.5, 2]], dtype=np.float32)   # aynı yerde başka sınıf
+    out = offset_and_nms([(tile_a, a), (tile_b, np.concatenate([same, other]))], W, H)
+    assert sorted(out[:, 5].tolist()) == [1, 2]
+    assert out[out[:, 5] == 1][0, 4] == np.float32(0.9)
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from app.services.job_service import AnalysisCancelled, JobService
+
+
+def _upload(tmp_path, name="video.mp4"):
+    path = tmp_path / name
+    path.write_bytes(b"\x00" * 16)
+    return str(path)
+
+
+def _submit(jobs, fn, upload=None):
+    return jobs.submit(fn, site_id=1, inspector="test", notes=None,
+                       file_name="video.mp4", upload_path=upload)
+
+
+def _wait(jobs, job_id):
+    deadline = time.time() + 5
+    while jobs.get_job(job_id).status in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.01)
+    return jobs.get_job(job_id).status
+
+
+def test_done_job_deletes_upload(tmp_path):
+    jobs = JobService(max_workers=1)
+    upload = _upload(tmp_path)
+    job = _submit(jobs, lambda progress, should_cancel: {"ok": True}, upload)
+    assert _wait(jobs, job.id) == "done"
+    jobs.shutdown()
+    assert not (tmp_path / "video.mp4").exists()
+
+
+def test_cancel_after_fn_returns_is_cancelled(tmp_path):
+    jobs = JobService(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn(progress, should_cancel):
+        started.set()
+        release.wait(5)
+        return {"ok": True}      # iptali kontrol etmeden döner
+
+    upload = _upload(tmp_path)
+    job = _submit(jobs, fn, upload)
+    assert started.wait(5)
+    assert jobs.cancel_job(job.id)
+    release.set()
+    assert _wait(jobs, job.id) == "cancelled"
+    jobs.shutdown()
+    assert not (tmp_path / "video.mp4").exists()
+
+
+def test_failed_and_cancelled_jobs_delete_upload(tmp_path):
+    jobs = JobService(max_workers=1)
+
+    def fail(progress, should_cancel):
+        raise RuntimeError("bozuk video")
+
+    def cancelled(progress, should_cancel):
+        raise AnalysisCancelled("iptal")
+
+    a = _submit(jobs, fail, _upload(tmp_path, "a.mp4"))
+    b = _submit(jobs, cancelled, _upload(tmp_path, "b.mp4"))
+    assert _wait(jobs, a.id) == "failed"
+    assert _wait(jobs, b.id) == "cancelled"
+    jobs.shutdown()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+
+from app.services.artifact_store import ArtifactStore
+from app.services.result_cache import ResultCache
+
+
+def _store(tmp_path):
+    return ArtifactStore(str(tmp_path / "uploads"), ":memory:", grace_s=0)
+
+
+def _overlay(store, seed=0):
+    image = np.full((64, 64, 3), seed, dtype=np.uint8)
+    name, _ = store.put_image(image, "ft")
+    return name
+
+
+def test_shared_overlay_survives_until_last_entry_goes(tmp_path):
+    store = _store(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"), store.root, max_memory_entries=1, store=store)
+    shared = _overlay(store)
+    cache.put("a" * 64, {"overlay_image": shared})
+    cache.put("b" * 64, {"overlay_image": shared})
+
+    cache._remove_disk("a" * 64)
+    assert os.path.exists(store.path(shared))
+    assert cache.get("b" * 64) == {"overlay_image": shared}
+
+    cache._remove_disk("b" * 64)
+    assert not os.path.exists(store.path(shared))
+
+
+def test_eviction_keeps_other_entries_files(tmp_path):
+    store = _store(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"), store.root, max_bytes=1, store=store)
+    shared = _overlay(store)
+    cache.put("a" * 64, {"overlay_image": shared})
+    cache.put("b" * 64, {"overlay_image": shared})   # kota "a"yı tahliye eder
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("b" * 64) is not None
+
+
+def test_pinned_artifact_is_not_deleted(tmp_path):
+    store = _store(tmp_path)
+    cache = ResultCache(str(tmp_path / "cache"), store.root, store=store)
+    thumb = _overlay(store, seed=7)
+    cache.put("a" * 64, {"thumbnail": thumb})
+    store.pin("inspection:1", [thumb])
+
+    cache._remove_disk("a" * 64)
+    assert os.path.exists(store.path(thumb))
+
+    store.max_age_s = 1
+    store.sweep(now=1e12)
+    assert os.path.exists(store.path(thumb))
+
+
+def test_pins_persist(tmp_path):
+    index = str(tmp_path / "artifacts.db")
+    store = ArtifactStore(str(tmp_path / "uploads"), index)
+    store.pin("inspection:1", ["ab/cd/x.webp", None])
+    store.close()
+    reopened = ArtifactStore(str(tmp_path / "uploads"), index)
+    assert reopened.is_pinned("ab/cd/x.webp") and reopened.has_pins
+    reopened.close()
+
+
+def test_without_store_shared_files_are_refcounted(tmp_path):
+    overlay_dir = tmp_path / "uploads"
+    overlay_dir.mkdir()
+    (overlay_dir / "x.jpg").write_bytes(b"jpg")
+    cache = ResultCache(str(tmp_path / "cache"), str(overlay_dir))
+    cache.put("a" * 64, {"overlay_image": "x.jpg"})
+    cache.put("b" * 64, {"overlay_image": "x.jpg"})
+
+    # yeniden açılışta referanslar diskten kurulur
+    cache = ResultCache(str(tmp_path / "cache"), str(overlay_dir))
+    cache._remove_disk("a" * 64)
+    assert (overlay_dir / "x.jpg").exists()
+    cache._remove_disk("b" * 64)
+    assert not (overlay_dir / "x.jpg").exists()
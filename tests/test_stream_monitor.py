@@ -0,0 +1,33 @@
+import pytest
+
+from app.services.stream_monitor import StreamMonitor, check_stream_url
+
+SCHEMES = ["rtsp", "rtsps", "http", "https"]
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/etc/passwd", "0", "file:///etc/passwd", "video.mp4", "ftp://kamera/stream", "rtsp:///stream", "gopher://x"],
+)
+def test_local_and_unknown_sources_are_rejected(url):
+    with pytest.raises(ValueError):
+        check_stream_url(url, SCHEMES)
+
+
+def test_network_sources_pass():
+    assert check_stream_url(" rtsp://user:pw@10.0.0.5:554/live ", SCHEMES) == "rtsp://user:pw@10.0.0.5:554/live"
+    assert check_stream_url("https://kamera.example/mjpeg", SCHEMES)
+
+
+def test_host_allowlist():
+    hosts = ["10.0.0.5", "Kamera.Example"]
+    assert check_stream_url("rtsp://10.0.0.5/live", SCHEMES, hosts)
+    assert check_stream_url("http://kamera.example/x", SCHEMES, hosts)
+    with pytest.raises(ValueError):
+        check_stream_url("rtsp://169.254.169.254/latest", SCHEMES, hosts)
+
+
+def test_invalid_risk_threshold_fails_at_construction():
+    with pytest.raises(ValueError):
+        StreamMonitor(None, None, None, risk_threshold="critical")
+    assert StreamMonitor(None, None, None, risk_threshold="medium").risk_threshold == "medium"